@@ -0,0 +1,80 @@
+"""Microbenchmark: ApprovalStore grant / is_approved throughput under multi-process contention.
+
+Each worker process opens its own store on a shared file and performs `--grants` grants
+(half of them revoked again) followed by `--lookups` lookups. Afterwards the log is checked
+for torn or interleaved lines and the final state is compared with what the workers wrote.
+
+Usage: python -m benchmarks.bench_approvals --procs 4 --grants 500 --lookups 20000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+from permissions.approvals import ApprovalStore
+
+
+def _worker(path: str, worker: int, grants: int, lookups: int, start, out) -> None:
+    store = ApprovalStore(path=path)
+    start.wait()
+    t0 = time.perf_counter()
+    for i in range(grants):
+        store.grant(f"agent{worker}", f"action{i}", ttl_seconds=3600)
+        if i % 2:
+            store.revoke(f"agent{worker}", f"action{i}")
+    t1 = time.perf_counter()
+    hits = 0
+    for i in range(lookups):
+        hits += store.is_approved(f"agent{worker}", f"action{i % grants}")
+    t2 = time.perf_counter()
+    out.put((worker, t1 - t0, t2 - t1, hits))
+
+
+def run(procs: int, grants: int, lookups: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "approvals.jsonl")
+        ctx = multiprocessing.get_context("spawn")
+        start, out = ctx.Event(), ctx.Queue()
+        workers = [ctx.Process(target=_worker, args=(path, w, grants, lookups, start, out)) for w in range(procs)]
+        for p in workers:
+            p.start()
+        time.sleep(0.5)
+        start.set()
+        results = [out.get() for _ in workers]
+        for p in workers:
+            p.join()
+
+        torn = 0
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        json.loads(line)
+                    except json.JSONDecodeError:
+                        torn += 1
+        active = ApprovalStore(path=path).list_active()
+        expected = procs * ((grants + 1) // 2)
+
+    write_ops = procs * (grants + grants // 2)
+    write_time = max(r[1] for r in results)
+    read_time = max(r[2] for r in results)
+    return {
+        "procs": procs,
+        "write_ops_per_s": round(write_ops / write_time) if write_time else None,
+        "lookups_per_s": round(procs * lookups / read_time) if read_time else None,
+        "torn_lines": torn,
+        "active": len(active),
+        "expected_active": expected,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="bench-approvals", description=__doc__.splitlines()[0])
+    parser.add_argument("--procs", type=int, default=4)
+    parser.add_argument("--grants", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.procs, args.grants, args.lookups)))
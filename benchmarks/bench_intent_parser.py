@@ -0,0 +1,88 @@
+"""Throughput benchmark: per-event `IntentParser.parse` vs `parse_batch` (in-process and pooled).
+
+Also parses the same corpus with a grammar whose vocabulary is 100x larger, to show that the
+single-pass matcher's cost does not grow with the number of keywords, and reports per-utterance
+latency percentiles of the semantic fallback (`SemanticIntentClassifier`) on uncached paraphrases.
+
+Usage: python -m benchmarks.bench_intent_parser --n 200000 --processes 4
+"""
+
+import argparse
+import json
+import random
+import time
+
+from orchestrator import intent_grammar
+from orchestrator.intent_parser import IntentParser
+from orchestrator.keyword_matcher import CompiledGrammar
+from orchestrator.semantic_intent import SemanticIntentClassifier
+
+_TEMPLATES = [
+    "Hi Jarvis, play {word} by {word}",
+    "open {word} and search for {word}",
+    "turn the wifi off",
+    "set volume to {num}",
+    "please reboot the machine in {num} minutes",
+    "what is the weather like in {word}",
+    "shutdown now",
+    "remind me about {word} at {num}",
+]
+_WORDS = ["chrome", "bohemian", "rhapsody", "queen", "paris", "groceries", "terminal", "jazz", "berlin"]
+
+
+def corpus(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    return [
+        {"type": "VOICE_COMMAND", "text": rnd.choice(_TEMPLATES).format(word=rnd.choice(_WORDS), num=rnd.randint(1, 100)), "confidence": 0.9}
+        for _ in range(n)
+    ]
+
+
+def _rate(n: int, fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return round(n / (time.perf_counter() - t0))
+
+
+def _latency_ms(texts, fn) -> dict:
+    lat = []
+    for text in texts:
+        t0 = time.perf_counter()
+        fn(text)
+        lat.append(time.perf_counter() - t0)
+    lat.sort()
+    return {p: round(lat[min(len(lat) - 1, int(len(lat) * q))] * 1000, 3) for p, q in (("p50", 0.5), ("p99", 0.99))}
+
+
+def run(n: int, processes: int) -> dict:
+    events = corpus(n)
+    parser = IntentParser()
+    out = {
+        "n": n,
+        "parse_per_event_per_s": _rate(n, lambda: [parser.parse(e) for e in events]),
+        "parse_batch_per_s": _rate(n, lambda: parser.parse_batch(events)),
+    }
+    if processes:
+        out[f"parse_batch_{processes}proc_per_s"] = _rate(n, lambda: parser.parse_batch(events, processes=processes))
+
+    intents = list(intent_grammar.INTENTS)
+    big_vocab = intents + [(f"kw{i}", f"intent_{i}") for i in range(len(intents) * 100)]
+    big = IntentParser(grammar=CompiledGrammar(big_vocab, intent_grammar.ENTITIES))
+    out["vocab"] = len(intents)
+    out["vocab_100x"] = len(big_vocab)
+    out["parse_batch_100x_vocab_per_s"] = _rate(n, lambda: big.parse_batch(events))
+
+    # distinct texts so every call misses the classifier's cache
+    paraphrases = [f"{e['text']} {i}" for i, e in enumerate(events[:20000])]
+    out["semantic_uncached_ms"] = _latency_ms(paraphrases, SemanticIntentClassifier(cache_size=0).classify)
+    semantic = SemanticIntentClassifier()
+    out["semantic_cached_ms"] = _latency_ms([e["text"] for e in events[:20000]], semantic.classify)
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="bench-intent-parser", description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+    print(json.dumps(run(args.n, args.processes)))
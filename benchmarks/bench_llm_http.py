@@ -0,0 +1,102 @@
+"""Per-call latency of LLM HTTP adapters against a local stub server: fresh connections vs the pooled session.
+
+The stub answers like a local text-generation server (`{"generated_text": ...}`) over HTTP/1.1
+keep-alive and counts the TCP connections it accepts. "before" posts with module-level
+`requests.post` (a new connection per call, as the adapters used to); "after" goes through
+`LocalHTTPAdapter`, whose `PooledHTTP` session reuses connections. Add `--threads` to share
+one adapter between threads.
+
+Usage: python -m benchmarks.bench_llm_http --calls 500 --threads 4
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from llm_runtime.manager import LocalHTTPAdapter
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes; without this Nagle stalls keep-alive replies
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"generated_text": "ok"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def stub_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _measure(server, calls: int, threads: int, call) -> dict:
+    server.connections = 0
+    lat = []
+
+    def one(_):
+        t0 = time.perf_counter()
+        call()
+        lat.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(one, range(calls)))
+    wall = time.perf_counter() - t0
+    lat.sort()
+    return {
+        "p50_ms": round(statistics.median(lat) * 1000, 3),
+        "p99_ms": round(lat[min(len(lat) - 1, int(len(lat) * 0.99))] * 1000, 3),
+        "calls_per_s": round(calls / wall),
+        "connections": server.connections,
+    }
+
+
+def run(calls: int, threads: int) -> dict:
+    server = stub_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/generate"
+    payload = {"inputs": "hello", "parameters": {"max_new_tokens": 8, "temperature": 0.0}}
+    adapter = LocalHTTPAdapter(url=url, pool_size=max(4, threads))
+    try:
+        return {
+            "calls": calls,
+            "threads": threads,
+            "before_requests_post": _measure(server, calls, threads, lambda: requests.post(url, json=payload, timeout=30).json()),
+            "after_pooled_adapter": _measure(server, calls, threads, lambda: adapter.generate("hello", max_tokens=8)),
+        }
+    finally:
+        adapter.http.close()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="bench-llm-http", description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+    print(json.dumps(run(args.calls, args.threads), indent=1))
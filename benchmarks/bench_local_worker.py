@@ -0,0 +1,66 @@
+"""Per-prompt latency of `LocalSubprocessAdapter`: a process per prompt vs resident workers.
+
+Uses the stub runner (`llm_runtime/local/stub_worker.py`) with a simulated model load of
+`--load-seconds`. "before" starts the runner for every prompt (the load is paid each time);
+"after" keeps `--workers` runners resident in a `WorkerPool`, so the load is paid once at start.
+
+Usage: python -m benchmarks.bench_local_worker --calls 20 --load-seconds 0.2 --workers 2
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import llm_runtime.local.stub_worker as stub_worker
+from llm_runtime.manager import LocalSubprocessAdapter
+
+
+def _measure(calls: int, threads: int, call) -> dict:
+    lat = []
+
+    def one(i):
+        t0 = time.perf_counter()
+        call(f"prompt {i}")
+        lat.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(one, range(calls)))
+    wall = time.perf_counter() - t0
+    lat.sort()
+    return {
+        "p50_ms": round(statistics.median(lat) * 1000, 3),
+        "p99_ms": round(lat[min(len(lat) - 1, int(len(lat) * 0.99))] * 1000, 3),
+        "calls_per_s": round(calls / wall, 1),
+    }
+
+
+def run(calls: int, load_seconds: float, workers: int) -> dict:
+    cmd = [sys.executable, stub_worker.__file__, "--load-seconds", str(load_seconds)]
+    per_call = LocalSubprocessAdapter(cmd=[sys.executable, "-c", f"import sys, time; time.sleep({load_seconds}); print('echo:', sys.stdin.read())"])
+    resident = LocalSubprocessAdapter(cmd=cmd, workers=workers, health_interval=None)
+    try:
+        t0 = time.perf_counter()
+        resident.pool
+        start_ms = (time.perf_counter() - t0) * 1000
+        return {
+            "calls": calls,
+            "load_seconds": load_seconds,
+            "workers": workers,
+            "before_process_per_prompt": _measure(calls, workers, per_call.generate),
+            "after_resident_workers": dict(_measure(calls, workers, resident.generate), pool_start_ms=round(start_ms, 3)),
+        }
+    finally:
+        resident.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="bench-local-worker", description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--load-seconds", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    print(json.dumps(run(args.calls, args.load_seconds, args.workers), indent=1))
@@ -0,0 +1,81 @@
+"""Cold-start profile of the CLI demo: time from interpreter start to the first prompt.
+
+Each run is a fresh interpreter that imports `main` and calls `main.setup()` (everything
+`main_loop` does before printing the prompt). Reports the median wall time, how many modules
+were loaded and which agent or backend modules were imported, then the slowest imports from `-X importtime`.
+
+Usage: python -m benchmarks.bench_startup --runs 5 --top 15
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import main
+handle = main.setup()
+t1 = time.perf_counter()
+heavy = [m for m in ("llm_runtime.manager", "integrations.streaming.youtube_provider", "edge_tts", "pyttsx3") if m in sys.modules]
+agents = [m for m in sys.modules if m.startswith("core.agents.safe.") or m.startswith("core.agents.privileged.")]
+print(json.dumps({"setup_s": t1 - t0, "modules": len(sys.modules), "heavy": heavy, "agents": sorted(agents)}))
+"""
+
+
+def _env() -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = root + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def _cold_start(cwd: str) -> dict:
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", _PROBE], cwd=cwd, env=_env(), capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - t0
+    stats = json.loads(out.stdout.strip().splitlines()[-1])
+    stats["wall_s"] = wall
+    return stats
+
+
+def import_times(cwd: str, top: int) -> list:
+    """(cumulative microseconds, module) of the slowest imports of `main`."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=cwd, env=_env(), capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative.isdigit():
+            rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def run(runs: int, top: int) -> dict:
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        samples = [_cold_start(tmp) for _ in range(runs)]
+        slowest = import_times(tmp, top)
+    return {
+        "runs": runs,
+        "setup_s_median": round(statistics.median(s["setup_s"] for s in samples), 4),
+        "wall_s_median": round(statistics.median(s["wall_s"] for s in samples), 4),
+        "modules": samples[-1]["modules"],
+        "agent_modules": samples[-1]["agents"],
+        "heavy_modules": samples[-1]["heavy"],
+        "slowest_imports_us": slowest,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="bench-startup", description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, args.top), indent=1))
@@ -1,13 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 
 class BaseAgent(ABC):
     """Base agent class for all agents.
 
     Agents should be single-responsibility and implement `execute`.
+    `timeout` (seconds) is the default execution budget `ExecutionManager` gives this agent.
+    `capabilities` lists the intent actions the agent handles; `AgentRegistry` indexes them so
+    `find_agent_for_intent` need not call `can_handle`. Leave it None for agents that decide dynamically.
     """
 
+    timeout: Optional[float] = None
+    capabilities: Optional[Tuple[str, ...]] = None
+
     def __init__(self, name: str, risk: str = "low", permissions: Dict[str, Any] = None):
         self.name = name
         self.risk = risk
@@ -1,4 +1,33 @@
-from typing import Dict, Optional
+import importlib
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+
+class _LazyAgent:
+    """Placeholder for an agent registered by factory; holds the metadata declared up front."""
+
+    __slots__ = ("factory", "capabilities", "priority")
+
+    def __init__(self, factory: Union[str, Callable[[], object]], capabilities: Optional[Sequence[str]], priority: int):
+        self.factory = factory
+        self.capabilities = tuple(capabilities) if capabilities is not None else None
+        self.priority = priority
+
+    def metadata(self) -> tuple:
+        return self.capabilities, self.priority
+
+    def create(self) -> object:
+        factory = self.factory
+        if isinstance(factory, str):
+            module, _, attr = factory.partition(":")
+            factory = getattr(importlib.import_module(module), attr)
+        return factory()
+
+
+def _metadata(agent: object) -> tuple:
+    """(capabilities, priority) of a loaded agent, comparable to `_LazyAgent.metadata()`."""
+    caps = getattr(agent, "capabilities", None)
+    return (tuple(caps) if caps is not None else None), int(getattr(agent, "priority", 0))
 
 
 class AgentRegistry:
@@ -6,22 +35,67 @@ class AgentRegistry:
 
     Agents may expose optional metadata like `priority` which will be used by the Router to
     prioritize execution order when multiple tasks are present.
+
+    `version` increases on every registration so routing results derived from the registry can
+    be cached; re-register an agent after changing its metadata.
+
+    Capability index: agents declaring `capabilities` (intent actions they handle) are indexed
+    by action, highest `priority` first (registration order among equals). Agents without
+    `capabilities` but with a `can_handle` method are dynamic and only consulted when the index
+    has no match. The index is rebuilt lazily after registrations.
+
+    Lazy agents: `register_factory(name, factory, ...)` takes a zero-argument callable or a
+    `"module:attr"` path; the agent is imported and built on the first `get(name)`. Until then
+    routing and indexing use the `capabilities` and `priority` declared at registration; an agent
+    without declared capabilities is loaded when the `can_handle` fallback reaches it. Once
+    loaded, the agent's own attributes apply: if they differ from the declared ones, `version`
+    is bumped so the index and cached routes are rebuilt.
     """
 
     def __init__(self):
         self._agents: Dict[str, object] = {}
+        self.version = 0
+        # action -> agent names by priority; agents resolved through `can_handle`
+        self._index: Dict[str, List[str]] = {}
+        self._dynamic: List[str] = []
+        self._rank: Dict[str, int] = {}
+        self._index_version = -1
+        self._load_lock = threading.Lock()
 
     def register(self, name: str, agent: object) -> None:
         self._agents[name] = agent
+        self.version += 1
+
+    def register_factory(
+        self,
+        name: str,
+        factory: Union[str, Callable[[], object]],
+        capabilities: Optional[Sequence[str]] = None,
+        priority: int = 0,
+    ) -> None:
+        """Register an agent to be created on first use (see class docstring)."""
+        self.register(name, _LazyAgent(factory, capabilities, priority))
 
     def get(self, name: str):
-        return self._agents.get(name)
+        a = self._agents.get(name)
+        if isinstance(a, _LazyAgent):
+            with self._load_lock:
+                a = self._agents.get(name)
+                if isinstance(a, _LazyAgent):
+                    declared = a.metadata()
+                    a = self._agents[name] = a.create()
+                    if _metadata(a) != declared:
+                        self.version += 1
+        return a
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._agents and not isinstance(self._agents[name], _LazyAgent)
 
     def list_agents(self):
         return list(self._agents.keys())
 
     def agent_priority(self, name: str) -> int:
-        a = self.get(name)
+        a = self._agents.get(name)
         if a is None:
             return 0
         return int(getattr(a, "priority", 0))
@@ -29,16 +103,58 @@ class AgentRegistry:
     def has_agent(self, name: str) -> bool:
         return name in self._agents
 
+    def _build_index(self) -> None:
+        order = {name: i for i, name in enumerate(self._agents)}
+        by_priority = sorted(self._agents, key=lambda n: (-self.agent_priority(n), order[n]))
+        index: Dict[str, List[str]] = {}
+        dynamic: List[str] = []
+        for name in by_priority:
+            agent = self._agents[name]
+            caps = getattr(agent, "capabilities", None)
+            if caps is not None:
+                for action in caps:
+                    index.setdefault(action, []).append(name)
+            elif isinstance(agent, _LazyAgent) or callable(getattr(agent, "can_handle", None)):
+                dynamic.append(name)
+        self._index, self._dynamic = index, dynamic
+        self._rank = {name: i for i, name in enumerate(by_priority)}
+        self._index_version = self.version
+
+    def agents_for(self, action: str) -> List[str]:
+        """Names of agents declaring `action` among their capabilities, highest priority first."""
+        if self._index_version != self.version:
+            self._build_index()
+        return list(self._index.get(action, ()))
+
     def find_agent_for_intent(self, intent: dict):
-        """Return the first registered agent object whose `can_handle` method returns True for the intent.
+        """Return the highest-priority agent that handles the intent.
 
-        Agents that do not implement `can_handle` are ignored. Returns None if not found.
+        The capability index narrows the search to agents declaring the intent's `action` or
+        `intent`; each candidate then decides through its own `can_handle` (agents differ in which
+        field they read), or, without one, matches on `action` (falling back to `intent`). Without
+        an indexed match, dynamic agents' `can_handle` methods are tried by priority.
+        Returns None if not found.
         """
-        for a in self._agents.values():
+        if self._index_version != self.version:
+            self._build_index()
+        # a snapshot: loading an agent may bump `version` and rebuild the index
+        index, rank = self._index, self._rank
+        keys = {intent.get("action"), intent.get("intent")}
+        names = sorted({n for key in keys if key is not None for n in index.get(key, ())}, key=rank.__getitem__)
+        declared = index.get(intent.get("action") or intent.get("intent"), ())
+        for name in names:
             try:
+                a = self.get(name)
                 can = getattr(a, "can_handle", None)
-                if callable(can) and can(intent):
+                if can(intent) if callable(can) else name in declared:
+                    return a
+            except Exception:
+                continue
+        for name in self._dynamic:
+            try:
+                a = self.get(name)
+                if a.can_handle(intent):
                     return a
             except Exception:
                 continue
-        return None
\ No newline at end of file
+        return None
@@ -1,20 +1,44 @@
-from typing import Any, Dict
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
 
 from core.agents.base.agent import BaseAgent
-from llm_runtime.manager import LocalAdapter, RemoteAdapter, LLMSelector
+from llm_runtime.manager import CoalescingAdapter, LocalAdapter, RemoteAdapter, LLMSelector
+from llm_runtime.response_cache import CachingAdapter
 
 
 class LLMAgent(BaseAgent):
     """Agent that queries an LLM and returns a textual answer.
 
     Usage: agent.execute('ask', {'prompt': '...','prefer': 'remote'|'local', 'complexity_hint': 0})
+
+    With an `on_chunk` callback the answer is read from the adapter's `generate_stream`: the
+    callback sees each chunk as it arrives and the result reports `ttft_ms`, the time to the first
+    chunk. `stream(prompt, ...)` yields the chunks directly, e.g. for `Speaker.speak_stream`.
+    The default adapters are wrapped in `CoalescingAdapter`, so identical questions asked
+    concurrently (parallel plan steps, retries) share one generation, and in a `CachingAdapter`
+    that answers a repeated question from memory for `cache_ttl` seconds. Answers to questions
+    like "what time is it" go stale, so the TTL is short and the cache only persists across
+    restarts when a `cache_path` is given.
     """
 
-    def __init__(self, name: str = "llm-agent", risk: str = "low", permissions: Dict[str, Any] = None, selector: LLMSelector | None = None):
+    # generation is slow; allow more than the manager's default budget
+    timeout = 60.0
+
+    def __init__(
+        self,
+        name: str = "llm-agent",
+        risk: str = "low",
+        permissions: Dict[str, Any] = None,
+        selector: LLMSelector | None = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        cache_path: Optional[str] = None,
+        cache_ttl: Optional[float] = 300.0,
+    ):
         super().__init__(name=name, risk=risk, permissions=permissions or {})
+        self.on_chunk = on_chunk
         if selector is None:
-            local = LocalAdapter()
-            remote = RemoteAdapter()
+            local = CachingAdapter(CoalescingAdapter(LocalAdapter()), path=cache_path, ttl=cache_ttl)
+            remote = CachingAdapter(CoalescingAdapter(RemoteAdapter()), path=cache_path, ttl=cache_ttl)
             selector = LLMSelector(local=local, remote=remote)
         self.selector = selector
 
@@ -24,9 +48,33 @@ class LLMAgent(BaseAgent):
         prompt = args.get("prompt", "")
         prefer = args.get("prefer")
         complexity_hint = args.get("complexity_hint", 0)
-        adapter = self.selector.select(text=prompt, complexity_hint=complexity_hint, prefer=prefer)
+        if self.on_chunk is None:
+            adapter = self.selector.select(text=prompt, complexity_hint=complexity_hint, prefer=prefer)
+            try:
+                return {"status": "ok", "response": adapter.generate(prompt)}
+            except Exception as e:
+                return {"status": "error", "reason": str(e)}
+
+        t0 = time.perf_counter()
+        ttft = None
+        parts = []
         try:
-            out = adapter.generate(prompt)
-            return {"status": "ok", "response": out}
+            for chunk in self.stream(prompt, prefer=prefer, complexity_hint=complexity_hint):
+                if ttft is None:
+                    ttft = time.perf_counter() - t0
+                parts.append(chunk)
+                self.on_chunk(chunk)
         except Exception as e:
             return {"status": "error", "reason": str(e)}
+        out = {"status": "ok", "response": "".join(parts)}
+        if ttft is not None:
+            out["ttft_ms"] = round(ttft * 1000, 3)
+        return out
+
+    def stream(self, prompt: str, prefer: Optional[str] = None, complexity_hint: int = 0) -> Iterator[str]:
+        adapter = self.selector.select(text=prompt, complexity_hint=complexity_hint, prefer=prefer)
+        generate_stream = getattr(adapter, "generate_stream", None)
+        if generate_stream is None:
+            yield adapter.generate(prompt)
+            return
+        yield from generate_stream(prompt)
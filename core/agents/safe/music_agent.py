@@ -32,6 +32,8 @@ class MusicAgent(BaseAgent):
       - In test mode we don't actually start players; calls should be mocked.
     """
 
+    capabilities = ("play", "play_music")
+
     def __init__(self, name: str = "music_agent", risk: str = "low", permissions: Dict[str, Any] = None, music_dir: Optional[str] = None, streaming_providers: Optional[List] = None):
         super().__init__(name=name, risk=risk, permissions=permissions or {})
         self._players: List[subprocess.Popen] = []
@@ -49,7 +51,7 @@ class MusicAgent(BaseAgent):
 
     def can_handle(self, intent: Dict[str, Any]) -> bool:
         action = intent.get("action") or intent.get("intent")
-        return action in ("play", "play_music")
+        return action in self.capabilities
 
     def perform(self, intent: Dict[str, Any]) -> Dict[str, Any]:
         # Normalize intent keys
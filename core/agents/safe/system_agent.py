@@ -11,6 +11,8 @@ class SystemAgent(BaseAgent):
     Uses an injected `ApprovalStore` for user confirmations and a `sys_runner` for executing OS commands (injectable for tests).
     """
 
+    capabilities = ("enable_wifi", "disable_wifi", "shutdown", "reboot")
+
     def __init__(self, approval_store: ApprovalStore, sys_runner: Optional[callable] = None, name: str = "system_agent", risk: str = "high"):
         super().__init__(name=name, risk=risk)
         self.approval_store = approval_store
@@ -18,7 +20,7 @@ class SystemAgent(BaseAgent):
 
     def can_handle(self, intent: Dict[str, Any]) -> bool:
         action = intent.get("action")
-        return action in ("enable_wifi", "disable_wifi", "shutdown", "reboot")
+        return action in self.capabilities
 
     def check_precondition(self, intent: Dict[str, Any]) -> Dict[str, Any]:
         action = intent.get("action")
@@ -64,7 +66,7 @@ class SystemAgent(BaseAgent):
 
     def _is_wifi_on(self) -> bool:
         try:
-            res = subprocess.run(["nmcli", "-t", "-f", "WIFI", "g"], capture_output=True, text=True)
+            res = subprocess.run(["nmcli", "-t", "-f", "WIFI", "g"], capture_output=True, text=True, timeout=5)
             return res.stdout.strip().lower() == "enabled"
         except Exception:
             return False
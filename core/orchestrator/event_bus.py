@@ -1,21 +1,96 @@
-import json
 import os
+import random
+import threading
 import time
 import uuid
-from typing import Dict, Generator, Optional, List
+from typing import Any, Callable, Dict, Generator, Optional, List, Union
+
+from core.orchestrator.event_codec import Codec, get_codec
+from core.orchestrator.event_query import QueryIndex
+from core.orchestrator.event_segments import SegmentedLog
+from core.orchestrator.group_commit import CommitHandle, GroupCommitWriter
+from core.orchestrator.subscriptions import BLOCK, DEFAULT_PUT_TIMEOUT, SubscriberRegistry, Subscription, follow_file
+
+DURABLE = "durable"
+BUFFERED = "buffered"
+
+_id_lock = threading.Lock()
+_id_last_ms = 0
+_id_seq = 0
+
+
+def new_event_id() -> str:
+    """Return a time-ordered UUID (version 7 layout).
+
+    Ids sort in append order within a process, which lets the segment index seek by id.
+    """
+    global _id_last_ms, _id_seq
+    with _id_lock:
+        ms = time.time_ns() // 1_000_000
+        if ms <= _id_last_ms:
+            ms = _id_last_ms
+            _id_seq += 1
+            if _id_seq > 0xFFF:
+                ms += 1
+                _id_seq = 0
+        else:
+            _id_seq = 0
+        _id_last_ms = ms
+        seq = _id_seq
+    value = (ms & 0xFFFFFFFFFFFF) << 80 | 0x7 << 76 | seq << 64 | 0b10 << 62 | random.getrandbits(62)
+    return str(uuid.UUID(int=value))
 
 
 class EventBus:
-    """Append-only event bus backed by a JSONL file.
+    """Append-only event bus backed by a JSONL file (or a compact binary encoding, `codec="binary"`).
 
     - Validates basic event schema (must be a dict containing `type`).
     - Uses fsync after appends to minimize data loss.
     - Exposes helpers to read events and fetch recent entries.
+
+    Group commit (opt-in, `group_commit=True`): appends are buffered and a background
+    flusher writes them with a single fsync per batch (every `flush_interval` seconds or
+    `max_batch` events). With `durability="durable"` (default) `append_event` still blocks
+    until its batch is on disk; with `"buffered"` it returns immediately. `submit_event`
+    never blocks and returns a `CommitHandle` callers can `wait()` on.
+
+    Segments (opt-in, `segment_max_bytes` / `segment_max_age`): the log rolls into sealed
+    segments listed in a manifest, each with a sparse offset index, so `tail`, `read_events(since=...)`
+    and `read_events(from_id=...)` seek instead of scanning the whole history. See `SegmentedLog`.
+
+    Live consumers: `subscribe()` delivers envelopes in-process right after they are written,
+    through bounded per-subscriber queues; `follow()` tails the file for other processes.
+
+    Queries: `query()` answers type/agent/action/success/time filters from sidecar indexes
+    (see `QueryIndex`); with `query_index=True` they are also updated on every append.
     """
 
-    def __init__(self, path: str = "logs/events.jsonl"):
+    def __init__(
+        self,
+        path: str = "logs/events.jsonl",
+        group_commit: bool = False,
+        durability: str = DURABLE,
+        flush_interval: float = 0.005,
+        max_batch: int = 256,
+        segment_max_bytes: Optional[int] = None,
+        segment_max_age: Optional[float] = None,
+        index_interval: int = 64 * 1024,
+        codec: Union[str, Codec] = "jsonl",
+        query_index: bool = False,
+    ):
+        if durability not in (DURABLE, BUFFERED):
+            raise ValueError(f"unknown durability mode: {durability}")
         self.path = path
-        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.durability = durability
+        self.codec = get_codec(codec)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._write_lock = threading.Lock()
+        self.log = SegmentedLog(path, max_bytes=segment_max_bytes, max_age=segment_max_age, index_interval=index_interval, codec=self.codec)
+        self._subscribers = SubscriberRegistry()
+        self._query_index: Optional[QueryIndex] = QueryIndex(path, log=self.log) if query_index else None
+        self._writer: Optional[GroupCommitWriter] = None
+        if group_commit:
+            self._writer = GroupCommitWriter(self._write_records, flush_interval=flush_interval, max_batch=max_batch)
 
     def _validate_event(self, event: Dict) -> None:
         if not isinstance(event, dict):
@@ -23,45 +98,129 @@ class EventBus:
         if "type" not in event:
             raise ValueError("event must include a 'type' field")
 
-    def append_event(self, event: Dict, version: Optional[str] = "v1") -> Dict:
+    def _make_envelope(self, event: Dict, version: Optional[str]) -> Dict:
         self._validate_event(event)
-        envelope = {
-            "id": str(uuid.uuid4()),
+        return {
+            "id": new_event_id(),
             "timestamp": time.time(),
             "version": version,
             "event": event,
         }
-        # Append and fsync to reduce risk of loss on crash.
-        with open(self.path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(envelope) + "\n")
-            fh.flush()
-            try:
-                os.fsync(fh.fileno())
-            except OSError:
-                # Best-effort: not all environments support fsync on every fs
-                pass
-        return envelope
-
-    def read_events(self) -> Generator[Dict, None, None]:
-        if not os.path.exists(self.path):
-            return
-        with open(self.path, "r", encoding="utf-8") as fh:
-            for line in fh:
-                try:
-                    yield json.loads(line)
-                except json.JSONDecodeError:
-                    continue
+
+    def _write_records(self, records: List[bytes], envelopes: List[Dict]) -> None:
+        """Write a batch of encoded records and fsync once (rolling the segment if due)."""
+        with self._write_lock:
+            seq, offsets = self.log.append(records, envelopes)
+            if self._query_index is not None:
+                self._query_index.on_append(seq, offsets, envelopes, self.log._size)
+        if len(self._subscribers):
+            self._subscribers.publish(envelopes)
+
+    def submit_event(self, event: Dict, version: Optional[str] = "v1") -> CommitHandle:
+        """Append without waiting for durability; returns a handle to wait on."""
+        envelope = self._make_envelope(event, version)
+        handle = CommitHandle(envelope)
+        if self._writer is None:
+            self._write_records([self.codec.encode(envelope)], [envelope])
+            handle._resolve()
+            return handle
+        return self._writer.submit(self.codec.encode(envelope), handle)
+
+    def append_event(self, event: Dict, version: Optional[str] = "v1", durability: Optional[str] = None) -> Dict:
+        handle = self.submit_event(event, version=version)
+        if (durability or self.durability) == DURABLE:
+            handle.wait()
+        return handle.envelope
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until all buffered appends are on disk (no-op without group commit)."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """Flush pending appends and stop the background flusher."""
+        if self._writer is not None:
+            self._writer.close()
+        if self._query_index is not None:
+            self._query_index.flush()
+
+    def subscribe(
+        self,
+        filter: Any = None,
+        callback: Optional[Callable[[Dict], Any]] = None,
+        maxsize: int = 1000,
+        overflow: str = BLOCK,
+        put_timeout: Optional[float] = DEFAULT_PUT_TIMEOUT,
+    ) -> Subscription:
+        """Register an in-process consumer for events appended from now on.
+
+        `filter` accepts an event type (globs allowed), a list of types, a dict of field values
+        or a predicate over the envelope. Without `callback`, iterate or `get()` the returned
+        subscription; `callback` may be a plain function or a coroutine function. Call `close()`
+        on the subscription to unregister it. A full queue holds up appends for at most
+        `put_timeout` seconds (see `Subscription`).
+        """
+        sub = Subscription(
+            filter=filter,
+            maxsize=maxsize,
+            overflow=overflow,
+            put_timeout=put_timeout,
+            callback=callback,
+            on_close=self._subscribers.remove,
+        )
+        return self._subscribers.add(sub)
+
+    def follow(
+        self,
+        filter: Any = None,
+        from_start: bool = False,
+        poll_interval: float = 0.25,
+        stop: Optional[threading.Event] = None,
+    ) -> Generator[Dict, None, None]:
+        """Yield events as they are appended to the log file, from any process (like `tail -f`)."""
+        return follow_file(self.path, filter=filter, from_start=from_start, poll_interval=poll_interval, stop=stop)
+
+    def roll(self) -> None:
+        """Seal the active segment now, regardless of the size/age limits."""
+        self.flush()
+        with self._write_lock:
+            self.log.seal()
+
+    def compact(
+        self,
+        retention: Optional[Dict[str, Optional[float]]] = None,
+        summarize_after: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> Dict[str, int]:
+        """Apply retention rules and task summaries to the log; see `event_compaction.compact_log`."""
+        from core.orchestrator.event_compaction import compact_log
+
+        self.flush()
+        with self._write_lock:
+            stats = compact_log(self.path, retention=retention, summarize_after=summarize_after, now=now, log=self.log)
+            if stats["segments"] and self._query_index is not None:
+                self._query_index.invalidate()
+        return stats
+
+    def read_events(self, since: Optional[float] = None, from_id: Optional[str] = None) -> Generator[Dict, None, None]:
+        """Yield events oldest first.
+
+        `since` starts at the first event with timestamp >= since; `from_id` starts at (and includes)
+        the event with that id. Both seek via the segment manifest and sparse index.
+        """
+        self.flush()
+        yield from self.log.read(since=since, from_id=from_id)
+
+    def query(self, limit: Optional[int] = None, **filters: Any) -> List[Dict]:
+        """Events matching `type`, `agent`, `action`, `success`, `since` and `until`, oldest first."""
+        self.flush()
+        if self._query_index is None:
+            self._query_index = QueryIndex(self.path, log=self.log)
+        with self._write_lock:
+            return self._query_index.query(limit=limit, **filters)
 
     def tail(self, n: int = 10) -> List[Dict]:
         """Return the last `n` events."""
-        if not os.path.exists(self.path):
-            return []
-        with open(self.path, "r", encoding="utf-8") as fh:
-            lines = fh.readlines()[-n:]
-        out = []
-        for l in lines:
-            try:
-                out.append(json.loads(l))
-            except json.JSONDecodeError:
-                continue
-        return out
+        self.flush()
+        return self.log.tail(n)
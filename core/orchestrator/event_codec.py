@@ -0,0 +1,285 @@
+"""Pluggable encodings for event log files.
+
+- `JsonlCodec` (default): one `json.dumps(envelope)` per line.
+- `BinaryCodec`: a file header followed by length-prefixed records. Each record carries the
+  event id as 16 raw bytes, the timestamp as a float64, the version (under 255 bytes) and the
+  event type as short strings, and the rest of the event as compact JSON. Records end with a
+  copy of their length so files can be read backward for `tail`. Every record stores its type
+  name in full: records must decode on their own (readers seek to indexed offsets and read
+  backward), so there is no per-file type table. Decoded type names are interned, which only
+  saves memory in the reading process.
+
+Readers sniff each file's header, so a log may mix JSONL and binary segments. Convert existing
+logs with `python -m core.orchestrator.event_codec <src> <dst> --to binary`.
+"""
+
+import json
+import os
+import struct
+import sys
+import uuid
+from typing import Dict, Generator, List, Optional, Tuple, Union
+
+
+def read_last_lines(path: str, n: int, block_size: int = 8192) -> List[bytes]:
+    """Return the last `n` lines of `path` by reading fixed-size blocks backward from the end.
+
+    Cost depends on `n` and the line length, not on the file size. An unterminated final
+    line counts as a line, like `readlines()`.
+    """
+    if n <= 0:
+        return []
+    try:
+        fh = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with fh:
+        pos = fh.seek(0, os.SEEK_END)
+        chunks: List[bytes] = []
+        newlines = 0
+        trailing = None
+        while pos > 0:
+            size = min(block_size, pos)
+            pos -= size
+            fh.seek(pos)
+            chunk = fh.read(size)
+            if trailing is None:
+                trailing = chunk.endswith(b"\n")
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+            # a trailing newline terminates the last line rather than starting a new one
+            if newlines - (1 if trailing else 0) >= n:
+                break
+    lines = b"".join(reversed(chunks)).splitlines(keepends=True)
+    if pos > 0:
+        # the first line was cut by the block boundary
+        lines = lines[1:]
+    return lines[-n:]
+
+
+class JsonlCodec:
+    name = "jsonl"
+    header = b""
+
+    def encode(self, envelope: Dict) -> bytes:
+        return (json.dumps(envelope) + "\n").encode("utf-8")
+
+    def decode(self, record: bytes) -> Optional[Dict]:
+        try:
+            return json.loads(record)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+
+    def split(self, buf: bytes) -> Tuple[List[bytes], bytes]:
+        """Split a byte stream into complete records and the unterminated remainder."""
+        *lines, rest = buf.split(b"\n")
+        return [line + b"\n" for line in lines], rest
+
+    def iter_records(self, fh, offset: int) -> Generator[Tuple[int, bytes], None, None]:
+        fh.seek(offset)
+        pos = offset
+        for line in fh:
+            yield pos, line
+            pos += len(line)
+
+    def read_last(self, path: str, n: int, block_size: int = 8192) -> List[bytes]:
+        return read_last_lines(path, n, block_size)
+
+
+class BinaryCodec:
+    name = "binary"
+    header = b"JEVB\x00\x01"
+    _len = struct.Struct("<I")
+    # id (16 raw bytes), timestamp, version length (255 = None), type length
+    _head = struct.Struct("<16sdBH")
+    _NO_VERSION = 255
+
+    def __init__(self):
+        self._type_bytes: Dict[str, bytes] = {}
+        self._type_names: Dict[bytes, str] = {}
+
+    def _encode_type(self, etype: str) -> bytes:
+        b = self._type_bytes.get(etype)
+        if b is None:
+            b = self._type_bytes[etype] = etype.encode("utf-8")
+        return b
+
+    def _decode_type(self, b: bytes) -> str:
+        name = self._type_names.get(b)
+        if name is None:
+            name = self._type_names[b] = sys.intern(b.decode("utf-8"))
+        return name
+
+    def encode(self, envelope: Dict) -> bytes:
+        event = envelope["event"]
+        tbytes = self._encode_type(str(event["type"]))
+        version = envelope.get("version")
+        vbytes = b"" if version is None else str(version).encode("utf-8")
+        if len(vbytes) >= self._NO_VERSION:
+            raise ValueError(f"event version must be shorter than {self._NO_VERSION} bytes")
+        rest = {k: v for k, v in event.items() if k != "type"}
+        payload = json.dumps(rest, separators=(",", ":")).encode("utf-8")
+        body = b"".join(
+            (
+                self._head.pack(uuid.UUID(envelope["id"]).bytes, float(envelope["timestamp"]), self._NO_VERSION if version is None else len(vbytes), len(tbytes)),
+                vbytes,
+                tbytes,
+                payload,
+            )
+        )
+        size = self._len.pack(len(body))
+        return size + body + size
+
+    def decode(self, record: bytes) -> Optional[Dict]:
+        try:
+            (size,) = self._len.unpack_from(record, 0)
+            if len(record) != size + 8 or self._len.unpack_from(record, size + 4)[0] != size:
+                return None
+            raw_id, ts, vlen, tlen = self._head.unpack_from(record, 4)
+            pos = 4 + self._head.size
+            version = None
+            if vlen != self._NO_VERSION:
+                version = record[pos:pos + vlen].decode("utf-8")
+                pos += vlen
+            etype = self._decode_type(record[pos:pos + tlen])
+            pos += tlen
+            event = {"type": etype}
+            event.update(json.loads(record[pos:size + 4]))
+        except (struct.error, ValueError, TypeError, UnicodeDecodeError):
+            return None
+        return {"id": str(uuid.UUID(bytes=raw_id)), "timestamp": ts, "version": version, "event": event}
+
+    def split(self, buf: bytes) -> Tuple[List[bytes], bytes]:
+        records = []
+        pos = 0
+        while len(buf) - pos >= 4:
+            (size,) = self._len.unpack_from(buf, pos)
+            end = pos + size + 8
+            if end > len(buf):
+                break
+            records.append(buf[pos:end])
+            pos = end
+        return records, buf[pos:]
+
+    def iter_records(self, fh, offset: int) -> Generator[Tuple[int, bytes], None, None]:
+        fh.seek(offset)
+        pos = offset
+        while True:
+            prefix = fh.read(4)
+            if len(prefix) < 4:
+                return
+            (size,) = self._len.unpack(prefix)
+            rest = fh.read(size + 4)
+            if len(rest) < size + 4:
+                # partially written record at the end of the file
+                return
+            yield pos, prefix + rest
+            pos += size + 8
+
+    def read_last(self, path: str, n: int, block_size: int = 8192) -> List[bytes]:
+        if n <= 0:
+            return []
+        try:
+            fh = open(path, "rb")
+        except FileNotFoundError:
+            return []
+        out: List[bytes] = []
+        with fh:
+            pos = fh.seek(0, os.SEEK_END)
+            start = len(self.header)
+            while pos > start and len(out) < n:
+                record = None
+                if pos - start >= 8:
+                    fh.seek(pos - 4)
+                    (size,) = self._len.unpack(fh.read(4))
+                    begin = pos - size - 8
+                    if begin >= start:
+                        fh.seek(begin)
+                        record = fh.read(size + 8)
+                        if self._len.unpack_from(record, 0)[0] != size:
+                            record = None
+                if record is None:
+                    # torn tail write: fall back to a forward scan
+                    records = [r for _, r in self.iter_records(fh, start)]
+                    return records[-n:]
+                out.append(record)
+                pos = begin
+        out.reverse()
+        return out
+
+
+JSONL = JsonlCodec()
+BINARY = BinaryCodec()
+CODECS = {JSONL.name: JSONL, BINARY.name: BINARY}
+
+Codec = Union[JsonlCodec, BinaryCodec]
+
+
+def get_codec(codec: Union[str, Codec, None]) -> Codec:
+    if codec is None:
+        return JSONL
+    if isinstance(codec, str):
+        try:
+            return CODECS[codec]
+        except KeyError:
+            raise ValueError(f"unknown event codec: {codec}")
+    return codec
+
+
+def detect_codec(path: str) -> Optional[Codec]:
+    """Codec of an existing log file from its header; None if the file is missing or empty."""
+    try:
+        with open(path, "rb") as fh:
+            head = fh.read(len(BinaryCodec.header))
+    except FileNotFoundError:
+        return None
+    if not head:
+        return None
+    return BINARY if head == BinaryCodec.header else JSONL
+
+
+def iter_file(path: str, offset: Optional[int] = None, end: Optional[int] = None) -> Generator[Tuple[int, Dict], None, None]:
+    """Yield (offset, envelope) from a single log file in either format, skipping undecodable records."""
+    codec = detect_codec(path)
+    if codec is None:
+        return
+    with open(path, "rb") as fh:
+        start = len(codec.header) if offset is None else offset
+        for off, record in codec.iter_records(fh, start):
+            if end is not None and off >= end:
+                return
+            env = codec.decode(record)
+            if env is not None:
+                yield off, env
+
+
+def convert_log(src: str, dst: str, codec: Union[str, Codec] = "binary") -> int:
+    """Re-encode the log file `src` into `dst` with `codec`. Written atomically; returns the event count."""
+    target = get_codec(codec)
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    tmp = f"{dst}.tmp"
+    count = 0
+    with open(tmp, "wb") as out:
+        out.write(target.header)
+        for _, env in iter_file(src):
+            out.write(target.encode(env))
+            count += 1
+        out.flush()
+        try:
+            os.fsync(out.fileno())
+        except OSError:
+            pass
+    os.replace(tmp, dst)
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="event-codec", description="Convert an event log file between encodings")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--to", choices=sorted(CODECS), default="binary")
+    args = parser.parse_args()
+    n = convert_log(args.src, args.dst, args.to)
+    print(f"Converted {n} events to {args.to}")
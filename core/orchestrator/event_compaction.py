@@ -0,0 +1,293 @@
+"""Retention and compaction for the event log.
+
+- Retention: per event type maximum age (glob patterns allowed); types without a rule are kept forever.
+- Summaries: once a task's `task.end` is older than `summarize_after`, its `task.start` /
+  `task.policy` / `task.timeout` / `task.end` records are collapsed into a single `task.summary` record that
+  takes the place (id and timestamp) of the `task.end`.
+
+Files are rewritten atomically. Sealed segments are written under a new generation name and
+swapped in through the manifest, so readers that already hold the old manifest keep reading a
+consistent file/index pair; the replaced files are retired and only deleted `grace` seconds
+later (see `SegmentedLog.purge_retired`). The active segment is only compacted for unsegmented logs.
+
+CLI: `python -m core.orchestrator.event_compaction logs/events.jsonl --keep task.policy=7d --summarize-after 1d`
+"""
+
+import fnmatch
+import json
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from core.orchestrator.event_codec import JSONL, detect_codec, iter_file
+from core.orchestrator.event_segments import RETIRE_GRACE, SegmentedLog
+
+TASK_TYPES = ("task.start", "task.policy", "task.timeout", "task.end")
+SUMMARY_TYPE = "task.summary"
+
+DAY = 86400
+DEFAULT_RETENTION: Dict[str, Optional[float]] = {"task.policy": 7 * DAY}
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": DAY, "w": 7 * DAY}
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parse "90", "30m", "12h", "7d", "2w" into seconds; "forever"/"none" gives None."""
+    v = str(value).strip().lower()
+    if v in ("forever", "none", "inf"):
+        return None
+    if v and v[-1] in _UNITS:
+        return float(v[:-1]) * _UNITS[v[-1]]
+    return float(v)
+
+
+def retention_for(event_type: str, rules: Dict[str, Optional[float]]) -> Optional[float]:
+    """Max age for `event_type`: exact rule first, then glob rules in order; None keeps forever."""
+    if event_type in rules:
+        return rules[event_type]
+    for pattern, age in rules.items():
+        if fnmatch.fnmatchcase(event_type, pattern):
+            return age
+    return None
+
+
+def _task_groups(envelopes: Iterable[Tuple[int, Dict]]) -> Tuple[Dict[str, Dict[str, int]], Dict[int, str]]:
+    """Group task events by execution: {group key: {event type: position}} and position -> key.
+
+    `envelopes` yields (position, envelope) pairs in log order.
+    """
+    groups: Dict[str, Dict[str, int]] = {}
+    membership: Dict[int, str] = {}
+    # events written before task ids existed are paired by their task payload, oldest start first
+    open_legacy: Dict[str, List[str]] = {}
+    for i, env in envelopes:
+        ev = env.get("event") or {}
+        etype = ev.get("type")
+        if etype not in TASK_TYPES:
+            continue
+        key = ev.get("task_id")
+        if key is None:
+            task_key = json.dumps(ev.get("task"), sort_keys=True, default=str)
+            if etype == "task.start":
+                key = f"legacy:{i}"
+                open_legacy.setdefault(task_key, []).append(key)
+            else:
+                pending = open_legacy.get(task_key)
+                if not pending:
+                    continue
+                key = pending[0]
+                if etype == "task.end":
+                    pending.pop(0)
+        group = groups.setdefault(key, {})
+        if etype in group:
+            continue
+        group[etype] = i
+        membership[i] = key
+    return groups, membership
+
+
+def _due(groups: Dict[str, Dict[str, int]], end_times: Dict[int, float], cutoff: float) -> Set[str]:
+    """Keys of the groups whose `task.end` is at or before `cutoff`."""
+    return {key for key, group in groups.items() if "task.end" in group and float(end_times[group["task.end"]]) <= cutoff}
+
+
+def _summary(parts: Dict[str, Dict], key: str) -> Dict:
+    """The `task.summary` replacing a task's records, given them by event type."""
+    end = parts["task.end"]
+    end_ev = end["event"]
+    summary = {"type": SUMMARY_TYPE, "task_id": None if key.startswith("legacy:") else key, "task": end_ev.get("task")}
+    if "task.start" in parts:
+        start = parts["task.start"]
+        summary["context"] = start["event"].get("context")
+        summary["started_at"] = start.get("timestamp")
+    if "task.policy" in parts:
+        policy = parts["task.policy"]["event"]
+        summary["allowed"] = policy.get("allowed")
+        summary["reason"] = policy.get("reason")
+    summary["ended_at"] = end.get("timestamp")
+    summary["result"] = end_ev.get("result")
+    return {"id": end["id"], "timestamp": end["timestamp"], "version": end.get("version"), "event": summary}
+
+
+def _summarize(
+    envelopes: Iterable[Tuple[int, Dict]],
+    membership: Dict[int, str],
+    groups: Dict[str, Dict[str, int]],
+    due: Set[str],
+    carried: Dict[str, Dict[str, Dict]],
+    stats: Dict[str, int],
+) -> Iterator[Dict]:
+    """Replace the records of `due` groups by one summary at the position of their `task.end`.
+
+    Records seen before their `task.end` wait in `carried` (by group key), which lets the caller
+    feed the log in pieces, e.g. one segment at a time.
+    """
+    for i, env in envelopes:
+        key = membership.get(i)
+        if key not in due:
+            yield env
+            continue
+        if i == groups[key]["task.end"]:
+            parts = carried.pop(key, {})
+            parts["task.end"] = env
+            stats["summarized"] += 1
+            yield _summary(parts, key)
+        elif i < groups[key]["task.end"]:
+            carried.setdefault(key, {})[env["event"]["type"]] = env
+
+
+def _retain(envelopes: Iterable[Dict], rules: Dict[str, Optional[float]], now: float, stats: Dict[str, int]) -> List[Dict]:
+    kept = []
+    for env in envelopes:
+        age = retention_for(str((env.get("event") or {}).get("type", "")), rules)
+        if age is not None and now - float(env.get("timestamp", now)) > age:
+            stats["dropped"] += 1
+            continue
+        kept.append(env)
+    return kept
+
+
+def compact_events(
+    envelopes: List[Dict],
+    retention: Optional[Dict[str, Optional[float]]] = None,
+    summarize_after: Optional[float] = None,
+    now: Optional[float] = None,
+) -> Tuple[List[Dict], Dict[str, int]]:
+    """Apply summaries then retention to an ordered list of envelopes. Returns (kept, stats)."""
+    now = time.time() if now is None else now
+    rules = DEFAULT_RETENTION if retention is None else retention
+    stats = {"dropped": 0, "summarized": 0}
+
+    out: Iterable[Dict] = envelopes
+    if summarize_after is not None:
+        groups, membership = _task_groups(enumerate(envelopes))
+        end_times = {group["task.end"]: envelopes[group["task.end"]].get("timestamp", now) for group in groups.values() if "task.end" in group}
+        due = _due(groups, end_times, now - summarize_after)
+        out = _summarize(enumerate(envelopes), membership, groups, due, {}, stats)
+    return _retain(out, rules, now, stats), stats
+
+
+def _write_atomic(path: str, envelopes: List[Dict], codec) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        if envelopes:
+            fh.write(codec.header)
+            fh.writelines(codec.encode(env) for env in envelopes)
+        fh.flush()
+        try:
+            os.fsync(fh.fileno())
+        except OSError:
+            pass
+    os.replace(tmp, path)
+
+
+def compact_log(
+    path: str,
+    retention: Optional[Dict[str, Optional[float]]] = None,
+    summarize_after: Optional[float] = None,
+    now: Optional[float] = None,
+    log: Optional[SegmentedLog] = None,
+    grace: float = RETIRE_GRACE,
+) -> Dict[str, int]:
+    """Compact the log at `path` in place and return counts of what changed.
+
+    Pass the writer's `log` (and hold its write lock, as `EventBus.compact` does) when the log is live.
+    Replaced segment files are deleted `grace` seconds later, by a later compaction.
+    """
+    log = log or SegmentedLog(path)
+    now = time.time() if now is None else now
+    rules = DEFAULT_RETENTION if retention is None else retention
+    stats = {"segments": 0, "kept": 0, "dropped": 0, "summarized": 0}
+    log.purge_retired(grace, now=time.time())
+    manifest = log.manifest()
+    dirname = os.path.dirname(path)
+
+    # Tasks often span a roll (start in one segment, end in the next), so they are paired across
+    # all sealed segments first; the rewrite below then carries their records forward.
+    groups: Dict[str, Dict[str, int]] = {}
+    membership: Dict[int, str] = {}
+    due: Set[str] = set()
+    if summarize_after is not None:
+        end_times: Dict[int, float] = {}
+
+        def positioned() -> Iterator[Tuple[int, Dict]]:
+            pos = 0
+            for meta in manifest["segments"]:
+                for _, env in iter_file(os.path.join(dirname, meta["file"])):
+                    if (env.get("event") or {}).get("type") == "task.end":
+                        end_times[pos] = env.get("timestamp", now)
+                    yield pos, env
+                    pos += 1
+
+        groups, membership = _task_groups(positioned())
+        due = _due(groups, end_times, now - summarize_after)
+
+    obsolete: List[str] = []
+    changed = False
+    segments = []
+    carried: Dict[str, Dict[str, Dict]] = {}
+    pos = 0
+    for meta in manifest["segments"]:
+        seg_path = os.path.join(dirname, meta["file"])
+        envelopes = [env for _, env in iter_file(seg_path)]
+        s = {"dropped": 0, "summarized": 0}
+        out = _summarize(enumerate(envelopes, pos), membership, groups, due, carried, s) if due else envelopes
+        kept = _retain(out, rules, now, s)
+        pos += len(envelopes)
+        stats["kept"] += len(kept)
+        stats["dropped"] += s["dropped"]
+        stats["summarized"] += s["summarized"]
+        if len(kept) == len(envelopes) and not s["summarized"]:
+            segments.append(meta)
+            continue
+        changed = True
+        stats["segments"] += 1
+        obsolete += [seg_path, os.path.join(dirname, meta["index"])]
+        if not kept:
+            continue
+        gen = int(meta.get("generation", 0)) + 1
+        seq = meta["seq"]
+        base, ext = os.path.splitext(log.segment_path(seq))
+        new_path = f"{base}.c{gen}{ext}"
+        new_index = f"{os.path.splitext(log.index_path(seq))[0]}.c{gen}.idx"
+        _write_atomic(new_path, kept, detect_codec(seg_path) or log.codec)
+        new_meta = log.index_segment(seq, new_path, new_index)
+        new_meta["generation"] = gen
+        segments.append(new_meta)
+
+    if changed:
+        log.replace_segments(segments, obsolete, grace=grace, now=time.time())
+
+    if not log.rolling and os.path.exists(path):
+        envelopes = [env for _, env in iter_file(path)]
+        kept, s = compact_events(envelopes, retention, summarize_after, now)
+        stats["kept"] += len(kept)
+        if s["dropped"] or s["summarized"]:
+            stats["dropped"] += s["dropped"]
+            stats["summarized"] += s["summarized"]
+            stats["segments"] += 1
+            _write_atomic(path, kept, detect_codec(path) or JSONL)
+            changed = True
+
+    if changed:
+        # make the writer re-read the manifest and active segment state on its next append
+        log.reset()
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="event-compaction", description="Apply retention rules and summarize old task events")
+    parser.add_argument("path", help="event log path, e.g. logs/events.jsonl")
+    parser.add_argument("--keep", action="append", default=[], metavar="TYPE=AGE", help="retention rule, e.g. task.policy=7d or task.end=forever")
+    parser.add_argument("--summarize-after", default=None, help="collapse task start/policy/end older than this age, e.g. 1d")
+    parser.add_argument("--grace", default=str(RETIRE_GRACE), help="keep replaced segment files this long for running readers, e.g. 5m")
+    args = parser.parse_args()
+    rules = dict(DEFAULT_RETENTION)
+    for item in args.keep:
+        etype, _, age = item.partition("=")
+        rules[etype] = parse_duration(age)
+    after = parse_duration(args.summarize_after) if args.summarize_after else None
+    result = compact_log(args.path, retention=rules, summarize_after=after, grace=parse_duration(args.grace) or 0.0)
+    print(json.dumps(result))
@@ -0,0 +1,295 @@
+"""Secondary indexes and queries over the event log.
+
+Each event is indexed under a few keys: `type=`, `agent=`, `action=`, `success=` and a UTC day
+`bucket=`. Postings are `(segment seq, byte offset)` pairs stored in one append-only sidecar
+file per key under `<log base>.qidx/`, next to a `meta.json` that records how far each segment
+has been indexed. A query reads only the smallest candidate posting list and decodes just
+those records, so its cost follows the number of matches rather than the log size.
+
+Indexes are updated incrementally, from `EventBus` appends (`EventBus(query_index=True)`) and by
+catching up on bytes written since the last refresh (e.g. by another process). If a segment was
+rewritten underneath (compaction), the whole index is rebuilt.
+
+CLI: `python -m core.orchestrator.event_query logs/events.jsonl --type task.end --agent power_agent --success false --since 7d`
+"""
+
+import json
+import os
+import shutil
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from core.orchestrator.event_codec import JSONL, detect_codec
+from core.orchestrator.event_segments import SegmentedLog, write_json_atomic
+
+DAY = 86400
+_POSTING = struct.Struct("<IQ")
+Posting = Tuple[int, int]
+
+
+def _bucket(ts: float) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(ts))
+
+
+def index_keys(envelope: Dict) -> List[str]:
+    """Index keys for an envelope; task events take agent/action from their `task`."""
+    ev = envelope.get("event") or {}
+    keys = [f"type={ev.get('type')}"]
+    task = ev.get("task") if isinstance(ev.get("task"), dict) else {}
+    agent = task.get("agent") or ev.get("agent")
+    action = task.get("action") or ev.get("action")
+    if agent:
+        keys.append(f"agent={agent}")
+    if action:
+        keys.append(f"action={action}")
+    result = ev.get("result")
+    success = result.get("success") if isinstance(result, dict) else ev.get("success")
+    if isinstance(success, bool):
+        keys.append(f"success={str(success).lower()}")
+    ts = envelope.get("timestamp")
+    if isinstance(ts, (int, float)):
+        keys.append(f"bucket={_bucket(ts)}")
+    return keys
+
+
+class QueryIndex:
+    """Sidecar secondary indexes for the log at `path`."""
+
+    def __init__(self, path: str, log: Optional[SegmentedLog] = None, flush_every: int = 512):
+        self.path = path
+        self.log = log or SegmentedLog(path)
+        self.dir = f"{os.path.splitext(path)[0]}.qidx"
+        self.meta_path = os.path.join(self.dir, "meta.json")
+        self.flush_every = flush_every
+        self._lock = threading.RLock()
+        self._meta: Optional[Dict] = None
+        self._pending: Dict[str, List[Posting]] = {}
+        self._pending_count = 0
+
+    # -- maintenance -------------------------------------------------------
+
+    def _load_meta(self) -> Dict:
+        if self._meta is None:
+            try:
+                with open(self.meta_path, "r", encoding="utf-8") as fh:
+                    self._meta = json.load(fh)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._meta = {"segments": {}}
+        return self._meta
+
+    def _key_path(self, key: str) -> str:
+        return os.path.join(self.dir, quote(key, safe="=") + ".pst")
+
+    def invalidate(self) -> None:
+        """Drop all indexes; the next refresh rebuilds them."""
+        with self._lock:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            self._meta = {"segments": {}}
+            self._pending.clear()
+            self._pending_count = 0
+
+    def _add(self, seq: int, offset: int, envelope: Dict) -> None:
+        for key in index_keys(envelope):
+            self._pending.setdefault(key, []).append((seq, offset))
+        self._pending_count += 1
+
+    def on_append(self, seq: int, offsets: List[int], envelopes: List[Dict], end: int) -> None:
+        """Index records the bus just wrote to the active segment; `end` is its size after the write."""
+        if not offsets:
+            return
+        with self._lock:
+            known = self._load_meta()["segments"]
+            header = len(self.log.codec.header)
+            state = known.get(str(seq))
+            if state is None and offsets[0] == header:
+                state = known[str(seq)] = {"ino": os.stat(self.log.path).st_ino, "size": 0}
+            if state is None or (state["size"] != offsets[0] and not (state["size"] == 0 and offsets[0] == header)):
+                # not contiguous with what is indexed: refresh() catches up from the file
+                return
+            for off, env in zip(offsets, envelopes):
+                self._add(seq, off, env)
+            state["size"] = end
+            if self._pending_count >= self.flush_every:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write pending postings, then the metadata that covers them."""
+        with self._lock:
+            if self._pending:
+                os.makedirs(self.dir, exist_ok=True)
+                for key, postings in self._pending.items():
+                    with open(self._key_path(key), "ab") as fh:
+                        fh.write(b"".join(_POSTING.pack(s, o) for s, o in postings))
+                self._pending.clear()
+                self._pending_count = 0
+            if self._meta is not None and os.path.isdir(self.dir):
+                write_json_atomic(self.meta_path, self._meta)
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the log, rebuilding if a segment was rewritten."""
+        with self._lock:
+            meta = self._load_meta()
+            segments = self.log.segments()
+            known = meta["segments"]
+            for seg in segments:
+                state = known.get(str(seg.seq))
+                if state is None:
+                    continue
+                try:
+                    st = os.stat(seg.path)
+                except FileNotFoundError:
+                    st = None
+                if st is None or st.st_ino != state["ino"] or st.st_size < state["size"]:
+                    self.invalidate()
+                    meta = self._load_meta()
+                    known = meta["segments"]
+                    break
+            live = {str(seg.seq) for seg in segments}
+            if any(seq not in live for seq in known):
+                # a segment was dropped entirely by compaction
+                self.invalidate()
+                meta = self._load_meta()
+                known = meta["segments"]
+            os.makedirs(self.dir, exist_ok=True)
+            for seg in segments:
+                try:
+                    st = os.stat(seg.path)
+                except FileNotFoundError:
+                    continue
+                state = known.setdefault(str(seg.seq), {"ino": st.st_ino, "size": 0})
+                if state["size"] >= st.st_size:
+                    continue
+                codec = detect_codec(seg.path)
+                pos = max(state["size"], len(codec.header))
+                with open(seg.path, "rb") as fh:
+                    for off, record in codec.iter_records(fh, pos):
+                        if not record.endswith(b"\n") and codec is JSONL:
+                            # a line still being written; index it on the next refresh
+                            break
+                        env = codec.decode(record)
+                        if env is not None:
+                            self._add(seg.seq, off, env)
+                        pos = off + len(record)
+                state["size"] = pos
+            self.flush()
+
+    # -- querying ----------------------------------------------------------
+
+    def _postings_size(self, key: str) -> int:
+        try:
+            return os.path.getsize(self._key_path(key)) // _POSTING.size
+        except FileNotFoundError:
+            return 0
+
+    def _postings(self, keys: Iterable[str]) -> List[Posting]:
+        out = set()
+        for key in keys:
+            try:
+                with open(self._key_path(key), "rb") as fh:
+                    data = fh.read()
+            except FileNotFoundError:
+                continue
+            out.update(p for p in _POSTING.iter_unpack(data[: len(data) - len(data) % _POSTING.size]))
+        return sorted(out)
+
+    def query(
+        self,
+        type: Optional[str] = None,
+        agent: Optional[str] = None,
+        action: Optional[str] = None,
+        success: Optional[bool] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """Return matching envelopes oldest first."""
+        with self._lock:
+            self.refresh()
+            required = []
+            if type is not None:
+                required.append(f"type={type}")
+            if agent is not None:
+                required.append(f"agent={agent}")
+            if action is not None:
+                required.append(f"action={action}")
+            if success is not None:
+                required.append(f"success={str(bool(success)).lower()}")
+
+            # pick the cheapest candidate list: one equality key, or the union of day buckets
+            plans: List[Tuple[int, List[str]]] = [(self._postings_size(k), [k]) for k in required]
+            if since is not None:
+                end = until if until is not None else time.time()
+                day = since - since % DAY
+                buckets = []
+                while day <= end:
+                    buckets.append(f"bucket={_bucket(day)}")
+                    day += DAY
+                plans.append((sum(self._postings_size(b) for b in buckets), buckets))
+            if not plans:
+                # no selective key: every event is a candidate
+                plans.append((0, [k for k in self._all_keys() if k.startswith("type=")]))
+            _, keys = min(plans, key=lambda p: p[0])
+            candidates = self._postings(keys)
+
+        paths = {seg.seq: seg.path for seg in self.log.segments()}
+        required_set = set(required)
+        out: List[Dict] = []
+        handles = {}
+        try:
+            for seq, off in candidates:
+                path = paths.get(seq)
+                if path is None:
+                    continue
+                if seq not in handles:
+                    handles[seq] = (open(path, "rb"), detect_codec(path))
+                fh, codec = handles[seq]
+                rec = next(codec.iter_records(fh, off), None)
+                env = codec.decode(rec[1]) if rec else None
+                if env is None:
+                    continue
+                ts = float(env.get("timestamp", 0.0))
+                if since is not None and ts < since or until is not None and ts > until:
+                    continue
+                if not required_set.issubset(index_keys(env)):
+                    continue
+                out.append(env)
+                if limit is not None and len(out) >= limit:
+                    break
+        finally:
+            for fh, _ in handles.values():
+                fh.close()
+        return out
+
+    def _all_keys(self) -> List[str]:
+        try:
+            names = os.listdir(self.dir)
+        except FileNotFoundError:
+            return []
+        return [unquote(n[:-4]) for n in names if n.endswith(".pst")]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from core.orchestrator.event_compaction import parse_duration
+
+    parser = argparse.ArgumentParser(prog="event-query", description="Query the event log through its secondary indexes")
+    parser.add_argument("path", nargs="?", default="logs/events.jsonl")
+    parser.add_argument("--type")
+    parser.add_argument("--agent")
+    parser.add_argument("--action")
+    parser.add_argument("--success", choices=["true", "false"])
+    parser.add_argument("--since", help="age such as 7d or 12h")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--rebuild", action="store_true", help="drop and rebuild the indexes first")
+    args = parser.parse_args()
+    qi = QueryIndex(args.path)
+    if args.rebuild:
+        qi.invalidate()
+    since = time.time() - parse_duration(args.since) if args.since else None
+    success = None if args.success is None else args.success == "true"
+    for env in qi.query(type=args.type, agent=args.agent, action=args.action, success=success, since=since, limit=args.limit):
+        print(json.dumps(env))
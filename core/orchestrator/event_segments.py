@@ -0,0 +1,401 @@
+import bisect
+import json
+import os
+import time
+import uuid
+from typing import Callable, Dict, Generator, List, Optional, Tuple
+
+from core.orchestrator.event_codec import JSONL, Codec, detect_codec, iter_file
+
+# (byte offset, event id, timestamp) of an indexed record
+IndexEntry = Tuple[int, str, float]
+
+# seconds a replaced segment file stays on disk for readers still using the previous manifest
+RETIRE_GRACE = 300.0
+
+
+
+def _is_time_ordered(event_id: str) -> bool:
+    """Whether `event_id` is a version 7 UUID, as written by `EventBus`."""
+    try:
+        return uuid.UUID(event_id).version == 7
+    except (ValueError, TypeError, AttributeError):
+        return False
+
+class Segment:
+    """One log file plus its sparse offset index. `meta` is None for the active segment."""
+
+    def __init__(self, seq: int, path: str, index_path: str, meta: Optional[Dict] = None):
+        self.seq = seq
+        self.path = path
+        self.index_path = index_path
+        self.meta = meta
+
+    @property
+    def sealed(self) -> bool:
+        return self.meta is not None
+
+
+def load_index(index_path: str) -> List[IndexEntry]:
+    entries: List[IndexEntry] = []
+    if not os.path.exists(index_path):
+        return entries
+    with open(index_path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                rec = json.loads(line)
+                entries.append((int(rec["o"]), rec["id"], float(rec["ts"])))
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                continue
+    return entries
+
+
+def write_json_atomic(path: str, data) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh)
+        fh.flush()
+        try:
+            os.fsync(fh.fileno())
+        except OSError:
+            pass
+    os.replace(tmp, path)
+
+
+class SegmentedLog:
+    """Size/time bounded segments with a manifest and a sparse offset index per segment.
+
+    Layout for `path="logs/events.jsonl"`:
+      - `logs/events.jsonl`            active segment (always the newest)
+      - `logs/events.000001.jsonl`     sealed segments, oldest first
+      - `logs/events.000001.idx`       sparse index, one `{o, id, ts}` line every `index_interval` bytes
+      - `logs/events.manifest.json`    sealed segments with their id/timestamp bounds
+
+    The active segment's index is already written under its future sequence number so sealing
+    is a single rename plus a manifest update. Rolling is enabled when `max_bytes` or `max_age`
+    is set; readers always honour an existing manifest. A single writer process is assumed.
+    Appends use `codec`; each segment is read with the codec found in its own header.
+
+    Segment files replaced by compaction (`replace_segments`) are listed under the manifest's
+    `retired` key and only deleted `RETIRE_GRACE` seconds later (`purge_retired`), so a reader
+    that loaded the previous manifest can still open every file it lists.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        index_interval: int = 64 * 1024,
+        codec: Codec = JSONL,
+    ):
+        self.path = path
+        self.codec = codec
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.index_interval = index_interval
+        base, ext = os.path.splitext(path)
+        self._base = base
+        self._ext = ext or ".jsonl"
+        self.manifest_path = f"{base}.manifest.json"
+        # writer state, initialised lazily on first append
+        self._manifest: Optional[Dict] = None
+        self._size = 0
+        self._first_ts: Optional[float] = None
+        self._last_index_offset: Optional[int] = None
+
+    @property
+    def rolling(self) -> bool:
+        return bool(self.max_bytes or self.max_age)
+
+    def segment_path(self, seq: int) -> str:
+        return f"{self._base}.{seq:06d}{self._ext}"
+
+    def index_path(self, seq: int) -> str:
+        return f"{self._base}.{seq:06d}.idx"
+
+    def load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as fh:
+                manifest = json.load(fh)
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifest = {}
+        manifest.setdefault("segments", [])
+        manifest.setdefault("next_seq", 1)
+        return manifest
+
+    def segments(self) -> List[Segment]:
+        """All segments oldest first; the active segment is always last."""
+        manifest = self._manifest if self._manifest is not None else self.load_manifest()
+        dirname = os.path.dirname(self.path)
+        out = [
+            Segment(m["seq"], os.path.join(dirname, m["file"]), os.path.join(dirname, m["index"]), meta=m)
+            for m in manifest["segments"]
+        ]
+        seq = manifest["next_seq"]
+        out.append(Segment(seq, self.path, self.index_path(seq)))
+        return out
+
+    def manifest(self) -> Dict:
+        """The current manifest: the writer's copy if it has one, else loaded from disk."""
+        return self._manifest if self._manifest is not None else self.load_manifest()
+
+    def reset(self) -> None:
+        """Drop the writer state; the next append re-reads the manifest and the active segment."""
+        self._manifest = None
+
+    # -- maintenance ---------------------------------------------------------
+
+    def index_segment(self, seq: int, path: str, index_path: str) -> Dict:
+        """Write the sparse index for a sealed segment file and return its manifest entry."""
+        self._rebuild_index(Segment(seq, path, index_path))
+        return self._segment_meta(seq, path, index_path)
+
+    def replace_segments(self, segments: List[Dict], obsolete: List[str], grace: float = RETIRE_GRACE, now: Optional[float] = None) -> None:
+        """Swap in a new list of sealed segment entries; `obsolete` files are deleted after `grace` seconds.
+
+        Caller holds the write lock.
+        """
+        now = time.time() if now is None else now
+        manifest = dict(self.manifest(), segments=segments)
+        retired = list(manifest.get("retired", []))
+        if obsolete:
+            retired.append({"at": now, "files": [os.path.basename(f) for f in obsolete]})
+        manifest["retired"] = retired
+        write_json_atomic(self.manifest_path, manifest)
+        self.reset()
+        self.purge_retired(grace, now)
+
+    def purge_retired(self, grace: float = RETIRE_GRACE, now: Optional[float] = None) -> int:
+        """Delete retired segment files older than `grace` seconds; returns how many were removed."""
+        now = time.time() if now is None else now
+        manifest = self.load_manifest()
+        retired = manifest.get("retired") or []
+        keep = [entry for entry in retired if now - float(entry.get("at", 0.0)) < grace]
+        if len(keep) == len(retired):
+            return 0
+        removed = 0
+        dirname = os.path.dirname(self.path)
+        for entry in retired:
+            if entry in keep:
+                continue
+            for name in entry.get("files", []):
+                try:
+                    os.remove(os.path.join(dirname, name))
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        manifest["retired"] = keep
+        write_json_atomic(self.manifest_path, manifest)
+        self.reset()
+        return removed
+
+    # -- writing -----------------------------------------------------------
+
+    def _init_writer(self) -> None:
+        self._manifest = self.load_manifest()
+        self._recover_unlisted_segment()
+        self._size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        self._first_ts = None
+        self._last_index_offset = None
+        existing = detect_codec(self.path)
+        if existing is not None and existing is not self.codec:
+            if not self.rolling:
+                raise ValueError(
+                    f"{self.path} is encoded as {existing.name}, not {self.codec.name}; "
+                    "convert it with `python -m core.orchestrator.event_codec` or enable segment rolling"
+                )
+            # start a fresh segment in the new encoding
+            self._init_index()
+            self.seal()
+            return
+        self._init_index()
+
+    def _init_index(self) -> None:
+        if not self.rolling or not self._size:
+            return
+        active = self.segments()[-1]
+        entries = load_index(active.index_path)
+        header = len((detect_codec(self.path) or self.codec).header)
+        if not entries or entries[0][0] != header or entries[-1][0] >= self._size:
+            entries = self._rebuild_index(active)
+        if entries:
+            self._first_ts = entries[0][2]
+            self._last_index_offset = entries[-1][0]
+
+    def _rebuild_index(self, segment: Segment) -> List[IndexEntry]:
+        entries: List[IndexEntry] = []
+        last = None
+        for off, env in iter_file(segment.path):
+            if last is None or off - last >= self.index_interval:
+                entries.append((off, env.get("id"), float(env.get("timestamp", 0.0))))
+                last = off
+        with open(segment.index_path, "w", encoding="utf-8") as fh:
+            for off, eid, ts in entries:
+                fh.write(json.dumps({"o": off, "id": eid, "ts": ts}) + "\n")
+        return entries
+
+    def _segment_meta(self, seq: int, path: str, index_path: str) -> Dict:
+        entries = load_index(index_path)
+        first = last = None
+        for _, env in iter_file(path, entries[-1][0] if entries else None):
+            last = env
+            if first is None and not entries:
+                first = env
+        meta = {"seq": seq, "file": os.path.basename(path), "index": os.path.basename(index_path), "bytes": os.path.getsize(path)}
+        if entries:
+            meta.update(first_id=entries[0][1], first_ts=entries[0][2])
+        elif first is not None:
+            meta.update(first_id=first.get("id"), first_ts=first.get("timestamp"))
+        if last is not None:
+            meta.update(last_id=last.get("id"), last_ts=last.get("timestamp"))
+        return meta
+
+    def _recover_unlisted_segment(self) -> None:
+        # A crash between renaming the active segment and writing the manifest leaves a sealed
+        # file the manifest does not know about yet.
+        seq = self._manifest["next_seq"]
+        path = self.segment_path(seq)
+        if os.path.exists(path):
+            self._manifest["segments"].append(self._segment_meta(seq, path, self.index_path(seq)))
+            self._manifest["next_seq"] = seq + 1
+            write_json_atomic(self.manifest_path, self._manifest)
+
+    def _should_roll(self, now: float) -> bool:
+        if self._size == 0:
+            return False
+        if self.max_bytes and self._size >= self.max_bytes:
+            return True
+        if self.max_age and self._first_ts is not None and now - self._first_ts >= self.max_age:
+            return True
+        return False
+
+    def seal(self) -> Optional[Segment]:
+        """Close the active segment and start a new one. Returns the sealed segment."""
+        if self._manifest is None:
+            self._init_writer()
+        if self._size == 0:
+            return None
+        seq = self._manifest["next_seq"]
+        path = self.segment_path(seq)
+        os.replace(self.path, path)
+        meta = self._segment_meta(seq, path, self.index_path(seq))
+        self._manifest["segments"].append(meta)
+        self._manifest["next_seq"] = seq + 1
+        write_json_atomic(self.manifest_path, self._manifest)
+        self._size = 0
+        self._first_ts = None
+        self._last_index_offset = None
+        return Segment(seq, path, self.index_path(seq), meta=meta)
+
+    def append(self, records: List[bytes], envelopes: List[Dict]) -> Tuple[int, List[int]]:
+        """Write a batch of `codec`-encoded records to the active segment, rolling first if due.
+
+        Returns the active segment's sequence number and the byte offset of each record.
+        Caller holds the write lock.
+        """
+        if self._manifest is None:
+            self._init_writer()
+        if self.rolling and self._should_roll(time.time()):
+            self.seal()
+        header = self.codec.header if self._size == 0 else b""
+        offsets = []
+        index_lines = []
+        offset = self._size + len(header)
+        for rec, env in zip(records, envelopes):
+            offsets.append(offset)
+            if self.rolling and (self._last_index_offset is None or offset - self._last_index_offset >= self.index_interval):
+                index_lines.append(json.dumps({"o": offset, "id": env["id"], "ts": env["timestamp"]}) + "\n")
+                self._last_index_offset = offset
+                if self._first_ts is None:
+                    self._first_ts = env["timestamp"]
+            offset += len(rec)
+        data = header + b"".join(records)
+        with open(self.path, "ab") as fh:
+            fh.write(data)
+            fh.flush()
+            try:
+                os.fsync(fh.fileno())
+            except OSError:
+                # Best-effort: not all environments support fsync on every fs
+                pass
+        self._size += len(data)
+        if index_lines:
+            # The index is a rebuildable hint, so it is not fsynced.
+            with open(self.segments()[-1].index_path, "a", encoding="utf-8") as fh:
+                fh.writelines(index_lines)
+        return self._manifest["next_seq"], offsets
+
+    # -- reading -----------------------------------------------------------
+
+    def _start_offset(self, segment: Segment, key: Callable[[IndexEntry], object], value) -> Optional[int]:
+        """Offset of the last indexed record whose key is strictly below `value` (None: from the start)."""
+        entries = load_index(segment.index_path)
+        keys = [key(e) for e in entries]
+        i = bisect.bisect_left(keys, value)
+        return entries[i - 1][0] if i > 0 else None
+
+    def read(self, since: Optional[float] = None, from_id: Optional[str] = None) -> Generator[Dict, None, None]:
+        """Yield envelopes oldest first, optionally starting at timestamp `since` or event id `from_id` (inclusive)."""
+        segments = self.segments()
+        start_seg, start_off = 0, None
+        if from_id is not None:
+            pos = self._locate_id(segments, from_id)
+            if pos is None:
+                return
+            start_seg, start_off = pos
+        elif since is not None:
+            start_seg = len(segments) - 1
+            for i, seg in enumerate(segments):
+                if not seg.sealed or (seg.meta.get("last_ts") or 0) >= since:
+                    start_seg = i
+                    break
+            start_off = self._start_offset(segments[start_seg], lambda e: e[2], since)
+        for i in range(start_seg, len(segments)):
+            for _, env in iter_file(segments[i].path, start_off if i == start_seg else None):
+                if since is not None and float(env.get("timestamp", 0.0)) < since:
+                    continue
+                yield env
+
+    def _locate_id(self, segments: List[Segment], event_id: str) -> Optional[Tuple[int, int]]:
+        # Ids are time ordered, so the manifest bounds and the index narrow the search to the
+        # stretch between two index entries.
+        for i, seg in enumerate(segments):
+            if seg.sealed and (seg.meta.get("last_id") or "") < event_id:
+                continue
+            entries = load_index(seg.index_path)
+            ids = [e[1] for e in entries]
+            j = bisect.bisect_right(ids, event_id)
+            start = entries[j - 1][0] if j > 0 else None
+            end = entries[j][0] if j < len(entries) else None
+            for off, env in iter_file(seg.path, start, end):
+                if env.get("id") == event_id:
+                    return i, off
+            break
+        # A time-ordered id the index cannot place is not in the log (mistyped, or compacted
+        # away); only ids written before ids were time ordered need a linear scan.
+        if _is_time_ordered(event_id):
+            return None
+        for i, seg in enumerate(segments):
+            for off, env in iter_file(seg.path):
+                if env.get("id") == event_id:
+                    return i, off
+        return None
+
+    def tail(self, n: int, block_size: int = 8192) -> List[Dict]:
+        """Return up to the last `n` envelopes, reading backward through as few segments as needed.
+
+        Undecodable records count towards `n` and are skipped.
+        """
+        out: List[Dict] = []
+        wanted = n
+        for seg in reversed(self.segments()):
+            if wanted <= 0:
+                break
+            codec = detect_codec(seg.path)
+            if codec is None:
+                continue
+            records = codec.read_last(seg.path, wanted, block_size)
+            wanted -= len(records)
+            out = [env for env in map(codec.decode, records) if env is not None] + out
+        return out
@@ -0,0 +1,149 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class CommitHandle:
+    """Handle returned for an event submitted to a group-commit writer.
+
+    `wait()` blocks until the batch containing the event has been written and
+    fsynced (or the write failed, in which case the error is re-raised).
+    """
+
+    def __init__(self, envelope: Dict):
+        self.envelope = envelope
+        self._done = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the commit; returns False on timeout."""
+        if not self._done.wait(timeout):
+            return False
+        if self._error is not None:
+            raise self._error
+        return True
+
+    def _resolve(self, error: Optional[BaseException] = None) -> None:
+        self._error = error
+        self._done.set()
+
+
+class GroupCommitWriter:
+    """Buffers encoded records and hands them to `sink` in batches from a background thread.
+
+    A batch is flushed when the oldest pending record is `flush_interval` seconds old,
+    or when `max_batch` records / `max_bytes` bytes are pending, whichever comes first.
+    `sink(records, envelopes)` is expected to write and fsync the whole batch at once.
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[List[bytes], List[Dict]], None],
+        flush_interval: float = 0.005,
+        max_batch: int = 256,
+        max_bytes: int = 1 << 20,
+    ):
+        self._sink = sink
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_bytes = max_bytes
+        self._cond = threading.Condition()
+        self._pending: List[bytes] = []
+        self._handles: List[CommitHandle] = []
+        self._pending_bytes = 0
+        self._first_pending_at = 0.0
+        self._flush_requested = False
+        self._closed = False
+        self._submitted = 0
+        self._committed = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="eventbus-group-commit", daemon=True)
+            self._thread.start()
+
+    def submit(self, record: bytes, handle: CommitHandle) -> CommitHandle:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("group commit writer is closed")
+            self._ensure_thread()
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+            self._pending.append(record)
+            self._handles.append(handle)
+            self._pending_bytes += len(record)
+            self._submitted += 1
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch or self._pending_bytes >= self.max_bytes:
+                self._cond.notify_all()
+        return handle
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every record submitted before this call is committed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self._submitted
+            if self._committed >= target:
+                return True
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._committed < target:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _take_batch(self):
+        """Wait for a batch to become due; returns (records, handles) or None when closed and drained."""
+        with self._cond:
+            while True:
+                if self._pending:
+                    due = (
+                        self._closed
+                        or self._flush_requested
+                        or len(self._pending) >= self.max_batch
+                        or self._pending_bytes >= self.max_bytes
+                    )
+                    wait_for = self._first_pending_at + self.flush_interval - time.monotonic()
+                    if due or wait_for <= 0:
+                        records, handles = self._pending, self._handles
+                        self._pending, self._handles = [], []
+                        self._pending_bytes = 0
+                        self._flush_requested = False
+                        return records, handles
+                    self._cond.wait(wait_for)
+                elif self._closed:
+                    return None
+                else:
+                    self._flush_requested = False
+                    self._cond.wait()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            records, handles = batch
+            error = None
+            try:
+                self._sink(records, [h.envelope for h in handles])
+            except Exception as e:  # surfaced to waiters via CommitHandle.wait
+                error = e
+            for h in handles:
+                h._resolve(error)
+            with self._cond:
+                self._committed += len(records)
+                self._cond.notify_all()
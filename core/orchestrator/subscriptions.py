@@ -0,0 +1,285 @@
+import asyncio
+import fnmatch
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, List, Optional
+
+from core.orchestrator.event_codec import BINARY, JSONL, detect_codec
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEW = "drop_new"
+
+# seconds a "block" publisher waits for a full queue before dropping: a stalled consumer may
+# slow `append_event` down, but never stop it
+DEFAULT_PUT_TIMEOUT = 1.0
+
+EventFilter = Callable[[Dict], bool]
+
+
+def make_filter(spec: Any = None) -> EventFilter:
+    """Build an envelope predicate from a filter spec.
+
+    - None: every event
+    - str: event type, glob patterns allowed (e.g. "task.*")
+    - list/tuple/set: any of the given event types
+    - dict: every key/value must equal the event's fields
+    - callable: used as-is, receives the full envelope
+    """
+    if spec is None:
+        return lambda env: True
+    if callable(spec):
+        return spec
+    if isinstance(spec, str):
+        return lambda env: fnmatch.fnmatchcase(str((env.get("event") or {}).get("type", "")), spec)
+    if isinstance(spec, (list, tuple, set, frozenset)):
+        types = set(spec)
+        return lambda env: (env.get("event") or {}).get("type") in types
+    if isinstance(spec, dict):
+        items = list(spec.items())
+        return lambda env: all((env.get("event") or {}).get(k) == v for k, v in items)
+    raise ValueError(f"unsupported filter: {spec!r}")
+
+
+class Subscription:
+    """Bounded per-consumer queue fed by `EventBus` right after each append.
+
+    Consume with `get()`, plain iteration, `async for`, or pass a sync/async `callback`
+    to have a dispatcher thread deliver envelopes. When the queue is full, `overflow`
+    decides what the publisher does: "block" (backpressure on the appender for up to
+    `put_timeout` seconds, then drop, and keep dropping without waiting until the consumer
+    makes room; None waits as long as it takes), "drop_oldest" or "drop_new". Drops are
+    counted in `dropped`. `close()` always ends iteration: if the queue is full, the oldest
+    envelope makes room for the end-of-stream marker.
+    """
+
+    def __init__(
+        self,
+        filter: Any = None,
+        maxsize: int = 1000,
+        overflow: str = BLOCK,
+        put_timeout: Optional[float] = DEFAULT_PUT_TIMEOUT,
+        callback: Optional[Callable[[Dict], Any]] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        on_close: Optional[Callable[["Subscription"], None]] = None,
+    ):
+        if overflow not in (BLOCK, DROP_OLDEST, DROP_NEW):
+            raise ValueError(f"unknown overflow policy: {overflow}")
+        self.matches = make_filter(filter)
+        self.overflow = overflow
+        self.put_timeout = put_timeout
+        self.dropped = 0
+        self.delivered = 0
+        self._stalled = False
+        self._queue: "queue.Queue[Optional[Dict]]" = queue.Queue(maxsize=maxsize)
+        self._closed = threading.Event()
+        self._on_close = on_close
+        self._callback = callback
+        self._loop = loop
+        self._dispatcher: Optional[threading.Thread] = None
+        if callback is not None:
+            if asyncio.iscoroutinefunction(callback) and self._loop is None:
+                self._loop = asyncio.get_running_loop()
+            self._dispatcher = threading.Thread(target=self._dispatch, name="eventbus-subscriber", daemon=True)
+            self._dispatcher.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    def publish(self, envelope: Dict) -> bool:
+        """Offer an envelope; returns False if it was filtered out or dropped."""
+        if self.closed or not self.matches(envelope):
+            return False
+        if self.overflow == BLOCK:
+            # once a wait timed out, drop without waiting until the consumer makes room again
+            deadline = None if self.put_timeout is None else time.monotonic() + (0.0 if self._stalled else self.put_timeout)
+            while not self.closed:
+                wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+                try:
+                    if wait <= 0:
+                        self._queue.put_nowait(envelope)
+                    else:
+                        self._queue.put(envelope, timeout=wait)
+                    self._stalled = False
+                    return True
+                except queue.Full:
+                    if wait <= 0:
+                        break
+            self._stalled = deadline is not None
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(envelope)
+            return True
+        except queue.Full:
+            pass
+        if self.overflow == DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+                self.dropped += 1
+                self._queue.put_nowait(envelope)
+                return True
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+        return False
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Next envelope, or None on timeout or once the subscription is closed and drained."""
+        if self.closed and self._queue.empty():
+            return None
+        try:
+            env = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if env is not None:
+            self.delivered += 1
+        return env
+
+    def __iter__(self):
+        while True:
+            env = self.get()
+            if env is None:
+                return
+            yield env
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict:
+        env = await asyncio.get_running_loop().run_in_executor(None, self.get)
+        if env is None:
+            raise StopAsyncIteration
+        return env
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._closed.set()
+        # end-of-stream marker for consumers; evict the oldest envelope if there is no room
+        while True:
+            try:
+                self._queue.put_nowait(None)
+                break
+            except queue.Full:
+                pass
+            try:
+                self._queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def _dispatch(self) -> None:
+        for env in self:
+            try:
+                if asyncio.iscoroutinefunction(self._callback):
+                    asyncio.run_coroutine_threadsafe(self._callback(env), self._loop).result()
+                else:
+                    self._callback(env)
+            except Exception:
+                # A failing consumer must not stop delivery to itself or others
+                continue
+
+
+class SubscriberRegistry:
+    """Thread-safe fan-out of envelopes to in-process subscriptions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subs: List[Subscription] = []
+
+    def add(self, sub: Subscription) -> Subscription:
+        with self._lock:
+            self._subs.append(sub)
+        return sub
+
+    def remove(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    def __len__(self) -> int:
+        return len(self._subs)
+
+    def publish(self, envelopes: List[Dict]) -> None:
+        with self._lock:
+            subs = list(self._subs)
+        for sub in subs:
+            for env in envelopes:
+                sub.publish(env)
+
+
+def _sniff(buf: bytes):
+    """Codec for a stream that starts with `buf`, or None if more bytes are needed."""
+    header = BINARY.header
+    if buf.startswith(header):
+        return BINARY
+    if len(buf) < len(header) and header.startswith(buf):
+        return None
+    return JSONL
+
+
+def follow_file(
+    path: str,
+    filter: Any = None,
+    from_start: bool = False,
+    poll_interval: float = 0.25,
+    stop: Optional[threading.Event] = None,
+) -> Generator[Dict, None, None]:
+    """`tail -f` for the event log, usable from other processes.
+
+    Polls `os.stat` for growth, and reopens the path when it is replaced (segment roll or
+    compaction) or truncated, after draining what is left in the old file. Works with both
+    event codecs. Stops when `stop` is set or the generator is closed.
+    """
+    matches = make_filter(filter)
+
+    def _open(at_end: bool):
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return None, None, None
+        codec = None
+        if at_end and f.seek(0, os.SEEK_END) > 0:
+            codec = detect_codec(path)
+        return f, os.fstat(f.fileno()).st_ino, codec
+
+    fh, ino, codec = _open(at_end=not from_start)
+    pending = b""
+    try:
+        while stop is None or not stop.is_set():
+            if fh is None:
+                fh, ino, codec = _open(at_end=False)
+            chunk = fh.read() if fh is not None else b""
+            if chunk:
+                pending += chunk
+                if codec is None:
+                    codec = _sniff(pending)
+                    if codec is None:
+                        continue
+                    pending = pending[len(codec.header):]
+                records, pending = codec.split(pending)
+                for record in records:
+                    env = codec.decode(record)
+                    if env is not None and matches(env):
+                        yield env
+                continue
+            if fh is not None:
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    st = None
+                if st is None or st.st_ino != ino or st.st_size < fh.tell():
+                    # the file was rolled/replaced or truncated: start over on the new one
+                    fh.close()
+                    fh, ino, codec, pending = None, None, None, b""
+                    continue
+            time.sleep(poll_interval)
+    finally:
+        if fh is not None:
+            fh.close()
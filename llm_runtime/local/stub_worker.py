@@ -0,0 +1,63 @@
+"""Stub local model runner speaking the `worker_pool` protocol, for tests and benchmarks.
+
+Run as `python -m llm_runtime.local.stub_worker [--load-seconds S]`. After the simulated weight
+load it prints `{"ready": true}` and then answers one JSON request per stdin line:
+
+  {"id": 1, "op": "generate", "prompt": "hi", "params": {...}}  ->  {"id": 1, "ok": true, "text": "echo: hi", "pid": ...}
+  with "stream": true it first sends {"id": 1, "chunk": "echo:"} and {"id": 1, "chunk": " hi"},
+  sleeping `params["chunk_delay"]` seconds (default 0) before each chunk
+  {"id": 2, "op": "ping"}                                      ->  {"id": 2, "ok": true, "pong": true, "pid": ...}
+
+The prompts `__crash__` (exit immediately) and `__hang__` (never answer) simulate failures.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+
+def _send(msg: dict) -> None:
+    sys.stdout.write(json.dumps(msg) + "\n")
+    sys.stdout.flush()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="stub-worker")
+    parser.add_argument("--load-seconds", type=float, default=0.0, help="simulated model load time")
+    args = parser.parse_args(argv)
+    time.sleep(args.load_seconds)
+    pid = os.getpid()
+    _send({"ready": True, "pid": pid})
+    for line in sys.stdin:
+        try:
+            req = json.loads(line)
+        except json.JSONDecodeError:
+            _send({"id": None, "ok": False, "error": "invalid_json"})
+            continue
+        rid = req.get("id")
+        op = req.get("op")
+        if op == "ping":
+            _send({"id": rid, "ok": True, "pong": True, "pid": pid})
+        elif op == "generate":
+            prompt = req.get("prompt", "")
+            if prompt == "__crash__":
+                os._exit(1)
+            if prompt == "__hang__":
+                time.sleep(3600)
+            text = f"echo: {prompt}"
+            if req.get("stream"):
+                words = text.split(" ")
+                delay = float((req.get("params") or {}).get("chunk_delay", 0.0))
+                for i, word in enumerate(words):
+                    time.sleep(delay)
+                    _send({"id": rid, "chunk": word if i == 0 else " " + word})
+            _send({"id": rid, "ok": True, "text": text, "pid": pid})
+        else:
+            _send({"id": rid, "ok": False, "error": f"unknown_op:{op}"})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
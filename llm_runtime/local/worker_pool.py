@@ -0,0 +1,439 @@
+"""Pool of resident local model runners spoken to over a line-framed JSON protocol.
+
+Starting a local runner (loading a 7B model's weights) costs far more than one generation, so
+`WorkerPool(cmd, workers=N)` starts `cmd` N times and keeps the processes alive. Each runner
+speaks one JSON object per line on stdin/stdout (JSON escapes newlines, so a line is a frame):
+
+  runner -> {"ready": true}                                             once, after loading
+  pool   -> {"id": 7, "op": "generate", "prompt": "...", "params": {...}, "stream": false}
+  runner -> {"id": 7, "chunk": "..."}                                   zero or more, when streaming
+  runner -> {"id": 7, "ok": true, "text": "..."} | {"id": 7, "ok": false, "error": "..."}
+  pool   -> {"id": 8, "op": "ping"}   runner -> {"id": 8, "ok": true}   health check
+
+Stdout lines that are not JSON are ignored (runner banners); stderr is kept as a short tail for
+error messages. `llm_runtime/local/stub_worker.py` is a reference runner.
+
+Requests take an idle worker; at most `max_queue` callers wait for one (each up to
+`queue_timeout`), later callers are rejected at once with `PoolBusy` so overload surfaces as a
+fast error instead of an ever-growing backlog. A worker that exits is restarted in the background
+and the request is retried once on another worker, unless output was already streamed; a worker
+that misses `timeout` is killed and restarted. Restarts are retried with a backoff capped at
+`max_restart_backoff` until they succeed; after `restart_attempts` failures in a row the worker
+counts as `lost` in `stats()`, and `PoolBusy` errors carry the last start error (raised at once
+when every worker is lost). A stream abandoned mid-generation is drained in the background
+before its worker takes new requests. With `health_interval`, idle workers are pinged
+periodically and unresponsive ones replaced; `check_health()` does one such round on demand.
+"""
+
+import json
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class PoolBusy(RuntimeError):
+    """The pool's wait queue is full, or no worker became free within `queue_timeout`."""
+
+
+class WorkerCrashed(RuntimeError):
+    """The runner exited (or closed stdout) before answering."""
+
+
+class _Worker:
+    """One resident runner process with reader threads for its stdout and stderr."""
+
+    def __init__(self, cmd: List[str], env: Optional[Dict[str, str]] = None):
+        self.cmd = cmd
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+        self.inbox: "queue.Queue[Optional[dict]]" = queue.Queue()
+        self.stderr: "deque[str]" = deque(maxlen=20)
+        self._next_id = 0
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+    @property
+    def pid(self) -> int:
+        return self.proc.pid
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def _read_stdout(self) -> None:
+        try:
+            for line in self.proc.stdout:
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(msg, dict):
+                    self.inbox.put(msg)
+        except (OSError, ValueError):
+            pass
+        self.inbox.put(None)
+
+    def _read_stderr(self) -> None:
+        try:
+            for line in self.proc.stderr:
+                self.stderr.append(line.decode("utf-8", "replace").rstrip())
+        except (OSError, ValueError):
+            pass
+
+    def _crashed(self) -> WorkerCrashed:
+        code = self.proc.poll()
+        tail = "\n".join(self.stderr)
+        return WorkerCrashed(f"Local model worker {self.pid} exited ({code}): {tail}".rstrip(": "))
+
+    def wait_ready(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                msg = self.inbox.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(self.cmd, timeout) from None
+            if msg is None:
+                raise self._crashed()
+            if msg.get("ready"):
+                return
+
+    def exchange(self, msg: Dict[str, Any], timeout: float) -> Iterator[dict]:
+        """Send one request and yield its frames up to and including the final reply."""
+        self._next_id += 1
+        rid = self._next_id
+        frame = (json.dumps(dict(msg, id=rid)) + "\n").encode("utf-8")
+        try:
+            self.proc.stdin.write(frame)
+            self.proc.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            raise self._crashed() from None
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise queue.Empty
+                reply = self.inbox.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(self.cmd, timeout) from None
+            if reply is None:
+                raise self._crashed()
+            # frames left over from an abandoned stream carry an older id
+            if reply.get("id") != rid:
+                continue
+            yield reply
+            if "chunk" not in reply:
+                return
+
+    def stop(self, grace: float = 2.0) -> None:
+        if self.alive():
+            try:
+                self.proc.stdin.close()
+            except OSError:
+                pass
+            try:
+                self.proc.wait(timeout=grace)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout, self.proc.stderr):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def kill(self) -> None:
+        if self.alive():
+            self.proc.kill()
+            self.proc.wait()
+        self.stop(grace=0)
+
+
+class WorkerPool:
+    """N resident runners of `cmd` behind a bounded wait queue (see the module docstring)."""
+
+    def __init__(
+        self,
+        cmd: List[str],
+        workers: int = 1,
+        max_queue: int = 8,
+        queue_timeout: float = 30.0,
+        start_timeout: float = 120.0,
+        health_interval: Optional[float] = None,
+        ping_timeout: float = 5.0,
+        restart_attempts: int = 3,
+        max_restart_backoff: float = 30.0,
+        env: Optional[Dict[str, str]] = None,
+    ):
+        if not cmd:
+            raise ValueError("WorkerPool needs a command")
+        if workers < 1:
+            raise ValueError("WorkerPool needs at least one worker")
+        self.cmd = list(cmd)
+        self.size = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.start_timeout = start_timeout
+        self.health_interval = health_interval
+        self.ping_timeout = ping_timeout
+        self.restart_attempts = restart_attempts
+        self.max_restart_backoff = max_restart_backoff
+        self.env = env
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        # a caller holds a slot from admission until its request finishes
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = threading.Event()
+        self._stats = {"requests": 0, "rejected": 0, "crashes": 0, "timeouts": 0, "restarts": 0, "start_failures": 0, "drained": 0}
+        # replacements still failing after `restart_attempts`, and why the last start failed
+        self._lost = 0
+        self._last_start_error: Optional[str] = None
+
+    # -- lifecycle
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self.cmd, env=self.env)
+        try:
+            worker.wait_ready(self.start_timeout)
+        except BaseException:
+            worker.kill()
+            raise
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def start(self) -> "WorkerPool":
+        """Start every worker (they load in parallel) and wait until all report ready."""
+        with self._lock:
+            if self._started:
+                return self
+            if self._closed.is_set():
+                raise RuntimeError("WorkerPool is closed")
+            self._started = True
+        pending = [_Worker(self.cmd, env=self.env) for _ in range(self.size)]
+        try:
+            for worker in pending:
+                worker.wait_ready(self.start_timeout)
+        except BaseException:
+            for worker in pending:
+                worker.kill()
+            with self._lock:
+                self._started = False
+            raise
+        with self._lock:
+            self._workers.extend(pending)
+        for worker in pending:
+            self._idle.put(worker)
+        if self.health_interval:
+            threading.Thread(target=self._health_loop, name="worker-pool-health", daemon=True).start()
+        return self
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+    def __enter__(self) -> "WorkerPool":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _retire(self, worker: _Worker) -> None:
+        """Kill `worker` and start its replacement in the background."""
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.kill()
+        if not self._closed.is_set():
+            threading.Thread(target=self._replace, name="worker-pool-restart", daemon=True).start()
+
+    def _replace(self) -> None:
+        attempt = 0
+        try:
+            while not self._closed.is_set():
+                try:
+                    worker = self._spawn()
+                except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+                    attempt += 1
+                    with self._lock:
+                        self._stats["start_failures"] += 1
+                        self._last_start_error = str(e) or type(e).__name__
+                        if attempt == self.restart_attempts:
+                            self._lost += 1
+                    self._closed.wait(min(self.max_restart_backoff, 0.5 * 2 ** (attempt - 1)))
+                    continue
+                if self._closed.is_set():
+                    worker.stop()
+                    return
+                with self._lock:
+                    self._stats["restarts"] += 1
+                    self._last_start_error = None
+                self._idle.put(worker)
+                return
+        finally:
+            if attempt >= self.restart_attempts:
+                with self._lock:
+                    self._lost -= 1
+
+    def _drain(self, worker: _Worker, frames: Iterator[dict]) -> None:
+        """Read the rest of an abandoned reply, then return the worker (or replace it)."""
+        try:
+            for _ in frames:
+                pass
+        except (WorkerCrashed, subprocess.TimeoutExpired) as e:
+            with self._lock:
+                self._stats["crashes" if isinstance(e, WorkerCrashed) else "timeouts"] += 1
+            self._retire(worker)
+            return
+        with self._lock:
+            self._stats["drained"] += 1
+        self._idle.put(worker)
+
+    def _unavailable(self, message: str) -> PoolBusy:
+        with self._lock:
+            running, error = len(self._workers), self._last_start_error
+        if running < self.size and error:
+            message += f" ({running}/{self.size} workers running; last start error: {error})"
+        return PoolBusy(message)
+
+    # -- requests
+
+    def _acquire(self, deadline: float) -> _Worker:
+        while True:
+            with self._lock:
+                all_lost = self._lost >= self.size and not self._workers
+            if all_lost:
+                raise self._unavailable("no local model worker is running")
+            remaining = deadline - time.monotonic()
+            try:
+                # wake up now and then to notice that every worker is lost
+                worker = self._idle.get(timeout=max(0.0, min(remaining, 0.25)))
+            except queue.Empty:
+                if remaining <= 0.25:
+                    raise self._unavailable(f"no local model worker free within {self.queue_timeout}s") from None
+                continue
+            if worker.alive():
+                return worker
+            with self._lock:
+                self._stats["crashes"] += 1
+            self._retire(worker)
+
+    def request(self, msg: Dict[str, Any], timeout: float = 120.0) -> Iterator[dict]:
+        """Yield the reply frames for `msg` from the next free worker."""
+        if not self._started:
+            self.start()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise PoolBusy(f"local model queue is full ({self.max_queue} waiting)")
+        try:
+            with self._lock:
+                self._stats["requests"] += 1
+            deadline = time.monotonic() + self.queue_timeout
+            for attempt in (0, 1):
+                worker = self._acquire(deadline)
+                streamed = False
+                frames = worker.exchange(msg, timeout)
+                try:
+                    for frame in frames:
+                        streamed = streamed or "chunk" in frame
+                        yield frame
+                except WorkerCrashed:
+                    with self._lock:
+                        self._stats["crashes"] += 1
+                    self._retire(worker)
+                    if attempt or streamed:
+                        raise
+                    continue
+                except subprocess.TimeoutExpired:
+                    with self._lock:
+                        self._stats["timeouts"] += 1
+                    self._retire(worker)
+                    raise
+                except BaseException:
+                    # abandoned mid-stream: the runner is still generating, so it only takes new
+                    # requests once the rest of this reply has been read
+                    threading.Thread(target=self._drain, args=(worker, frames), name="worker-pool-drain", daemon=True).start()
+                    raise
+                self._idle.put(worker)
+                return
+        finally:
+            self._slots.release()
+
+    def generate(self, prompt: str, timeout: float = 120.0, **params) -> str:
+        reply: Dict[str, Any] = {}
+        # run the request to completion so the worker goes back to the pool before returning
+        for frame in self.request({"op": "generate", "prompt": prompt, "params": params}, timeout):
+            reply = frame
+        return self._text(reply)
+
+    def generate_stream(self, prompt: str, timeout: float = 120.0, **params) -> Iterator[str]:
+        """Yield the runner's chunks; a runner that does not stream yields its whole reply once."""
+        chunked = False
+        for frame in self.request({"op": "generate", "prompt": prompt, "params": params, "stream": True}, timeout):
+            if "chunk" in frame:
+                chunked = True
+                if frame["chunk"]:
+                    yield frame["chunk"]
+                continue
+            text = self._text(frame)
+            if not chunked and text:
+                yield text
+
+    @staticmethod
+    def _text(frame: dict) -> str:
+        if not frame.get("ok"):
+            raise RuntimeError(f"Local model failed: {frame.get('error', 'unknown error')}")
+        return frame.get("text", "")
+
+    # -- health
+
+    def ping(self, worker: _Worker) -> bool:
+        try:
+            for frame in worker.exchange({"op": "ping"}, self.ping_timeout):
+                return bool(frame.get("ok"))
+        except (WorkerCrashed, subprocess.TimeoutExpired):
+            return False
+        return False
+
+    def check_health(self) -> Dict[str, int]:
+        """Ping every currently idle worker; replace the ones that fail. Busy workers are skipped."""
+        idle = []
+        while True:
+            try:
+                idle.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        healthy = failed = 0
+        for worker in idle:
+            if worker.alive() and self.ping(worker):
+                healthy += 1
+                self._idle.put(worker)
+            else:
+                failed += 1
+                with self._lock:
+                    self._stats["crashes"] += 1
+                self._retire(worker)
+        return {"checked": len(idle), "healthy": healthy, "replaced": failed}
+
+    def _health_loop(self) -> None:
+        while not self._closed.wait(self.health_interval):
+            self.check_health()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["workers"] = len(self._workers)
+            out["alive"] = sum(1 for w in self._workers if w.alive())
+            out["size"] = self.size
+            out["lost"] = self._lost
+            out["last_start_error"] = self._last_start_error
+            out["pids"] = [w.pid for w in self._workers]
+        out["idle"] = self._idle.qsize()
+        return out
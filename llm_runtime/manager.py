@@ -1,6 +1,11 @@
+import asyncio
+import inspect
 import os
 import json
-from typing import Any, Dict
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, Tuple
 
 try:
     import requests
@@ -8,10 +13,137 @@ except Exception:  # pragma: no cover - tests will mock network calls
     requests = None
 
 
+class PooledHTTP:
+    """Keep-alive HTTP client shared by an adapter's threads.
+
+    Holds one `requests.Session` whose connection pool keeps at most `pool_size` connections
+    per host (callers beyond that wait for a free connection), so repeated calls skip the TCP
+    (and TLS) handshake. Calls that certainly did not start a generation are retried up to
+    `retries` times with exponential backoff (`backoff` * 2**attempt seconds): connection
+    failures and 429/503 responses. Read timeouts and other errors are not retried, since the
+    server may still be generating (and billing) the first request. A numeric `timeout` bounds
+    the whole call, retries and backoff included. When `requests` has no `Session` (e.g.
+    replaced in tests) calls go through `requests.post`.
+    """
+
+    RETRY_STATUSES = frozenset((429, 503))
+
+    def __init__(self, pool_size: int = 4, retries: int = 2, backoff: float = 0.25):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _post_fn(self):
+        if getattr(requests, "Session", None) is None:
+            return requests.post
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.pool_size, pool_block=True, max_retries=0)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session.post
+
+    @staticmethod
+    def _retryable_errors() -> tuple:
+        # requests' ConnectionError (which includes ConnectTimeout but not ReadTimeout) is not
+        # the builtin one
+        exc = getattr(getattr(requests, "exceptions", None), "ConnectionError", None)
+        return (ConnectionError, exc) if isinstance(exc, type) else (ConnectionError,)
+
+    def post(self, url: str, **kwargs):
+        post = self._post_fn()
+        retryable = self._retryable_errors()
+        timeout = kwargs.get("timeout")
+        deadline = time.monotonic() + timeout if isinstance(timeout, (int, float)) else None
+        for attempt in range(self.retries + 1):
+            pause = self.backoff * (2 ** attempt)
+            if deadline is not None:
+                kwargs["timeout"] = max(0.001, deadline - time.monotonic())
+            try:
+                r = post(url, **kwargs)
+            except retryable:
+                if self._final(attempt, pause, deadline):
+                    raise
+            else:
+                if getattr(r, "status_code", 200) not in self.RETRY_STATUSES or self._final(attempt, pause, deadline):
+                    return r
+                close = getattr(r, "close", None)
+                if callable(close):
+                    close()
+            time.sleep(pause)
+
+    def _final(self, attempt: int, pause: float, deadline: float | None) -> bool:
+        """No retry left, or none that could finish before `deadline`."""
+        return attempt >= self.retries or (deadline is not None and time.monotonic() + pause >= deadline)
+
+    @property
+    def can_stream(self) -> bool:
+        """Whether responses can be read incrementally (`post(..., stream=True)`)."""
+        return getattr(requests, "Session", None) is not None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+def _iter_sse(response) -> Iterator[Any]:
+    """Decoded JSON `data:` payloads of a server-sent-events response, up to `[DONE]`."""
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            yield json.loads(data)
+        except json.JSONDecodeError:
+            continue
+
+
+def _sse_text(event: Any) -> str:
+    """Text carried by one streamed event (OpenAI chat/completion deltas or TGI tokens)."""
+    if not isinstance(event, dict):
+        return ""
+    choices = event.get("choices")
+    if choices:
+        choice = choices[0]
+        delta = choice.get("delta") or {}
+        return delta.get("content") or choice.get("text") or ""
+    token = event.get("token")
+    if isinstance(token, dict):
+        return "" if token.get("special") else token.get("text") or ""
+    # TGI's final event repeats the whole text in `generated_text` next to its last token
+    return event.get("text") or ""
+
+
 class BaseAdapter:
+    """LLM adapter interface.
+
+    `generate` returns the finished completion; `generate_stream` yields it in chunks as they are
+    produced, so callers can act on the first tokens. Adapters that cannot stream inherit a
+    `generate_stream` that yields the whole completion as one chunk.
+
+    `agenerate` is the asyncio form of `generate`. By default it runs `generate` in a worker
+    thread, which suits the HTTP adapters (their pooled session is thread-safe);
+    `LocalSubprocessAdapter` drives its runner with asyncio subprocesses instead.
+    """
+
     def generate(self, prompt: str, **kwargs) -> str:
         raise NotImplementedError
 
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        yield self.generate(prompt, **kwargs)
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        return await asyncio.to_thread(self.generate, prompt, **kwargs)
+
 
 class LocalAdapter(BaseAdapter):
     def __init__(self, model_name: str = "local-7b"):
@@ -27,11 +159,13 @@ class LocalHTTPAdapter(BaseAdapter):
 
     Configure with `LOCAL_LLM_URL` env var (e.g., http://localhost:5000/generate) and model via `model_name`.
     The adapter POSTs a JSON payload {"inputs": prompt, "parameters": {...}} and extracts text from the response.
+    Connections are pooled and kept alive across calls; see `PooledHTTP` for `pool_size`, `retries` and `backoff`.
     """
 
-    def __init__(self, model_name: str = "local-7b", url: str | None = None):
+    def __init__(self, model_name: str = "local-7b", url: str | None = None, pool_size: int = 4, retries: int = 2, backoff: float = 0.25):
         self.model_name = model_name
         self.url = url or os.getenv("LOCAL_LLM_URL") or f"http://localhost:8080/models/{self.model_name}/generate"
+        self.http = PooledHTTP(pool_size=pool_size, retries=retries, backoff=backoff)
 
     def _assert_requests(self):
         if requests is None:
@@ -40,9 +174,38 @@ class LocalHTTPAdapter(BaseAdapter):
     def generate(self, prompt: str, max_tokens: int = 128, temperature: float = 0.0, **kwargs) -> str:
         self._assert_requests()
         payload = {"inputs": prompt, "parameters": {"max_new_tokens": max_tokens, "temperature": temperature}}
-        r = requests.post(self.url, json=payload, timeout=30)
+        r = self.http.post(self.url, json=payload, timeout=30)
         r.raise_for_status()
-        data = r.json()
+        return self._extract_text(r.json())
+
+    def generate_stream(self, prompt: str, max_tokens: int = 128, temperature: float = 0.0, **kwargs) -> Iterator[str]:
+        """Stream the completion: SSE token events, a chunked plain-text body, or one JSON reply as a single chunk."""
+        self._assert_requests()
+        if not self.http.can_stream:
+            yield self.generate(prompt, max_tokens=max_tokens, temperature=temperature, **kwargs)
+            return
+        payload = {"inputs": prompt, "parameters": {"max_new_tokens": max_tokens, "temperature": temperature}, "stream": True}
+        r = self.http.post(self.url, json=payload, timeout=30, stream=True)
+        try:
+            r.raise_for_status()
+            ctype = r.headers.get("Content-Type", "")
+            if ctype.startswith("text/event-stream"):
+                for event in _iter_sse(r):
+                    text = _sse_text(event)
+                    if text:
+                        yield text
+            elif ctype.startswith("application/json"):
+                yield self._extract_text(r.json())
+            else:
+                r.encoding = r.encoding or "utf-8"
+                for chunk in r.iter_content(chunk_size=None, decode_unicode=True):
+                    if chunk:
+                        yield chunk
+        finally:
+            r.close()
+
+    @staticmethod
+    def _extract_text(data: Any) -> str:
         # Support common shapes returned by local servers
         if isinstance(data, dict) and "generated_text" in data:
             return data["generated_text"]
@@ -60,22 +223,167 @@ class LocalSubprocessAdapter(BaseAdapter):
 
     The `cmd` should be a list of command parts to execute, where the prompt will be provided on stdin.
     For example: ['./run_local_model.sh']
+
+    With `workers` > 0 the runner is started once per worker and kept resident instead
+    (`llm_runtime.local.worker_pool.WorkerPool`), so the model is loaded once rather than per
+    prompt; `cmd` must then speak the pool's line-framed JSON protocol. `max_queue` bounds how many
+    callers wait for a free worker, and idle workers are pinged every `health_interval` seconds.
     """
 
-    def __init__(self, model_name: str = "local-7b", cmd: list | None = None):
+    def __init__(
+        self,
+        model_name: str = "local-7b",
+        cmd: list | None = None,
+        workers: int = 0,
+        max_queue: int = 8,
+        health_interval: float | None = 30.0,
+    ):
         self.model_name = model_name
         self.cmd = cmd
-
-    def generate(self, prompt: str, max_tokens: int = 128, temperature: float = 0.0, **kwargs) -> str:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.health_interval = health_interval
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        """The resident worker pool, started on first use (None unless `workers` > 0)."""
+        if not self.workers:
+            return None
+        if self._pool is None:
+            from llm_runtime.local.worker_pool import WorkerPool
+
+            if not self.cmd:
+                raise RuntimeError("No command configured for LocalSubprocessAdapter")
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = WorkerPool(self.cmd, workers=self.workers, max_queue=self.max_queue, health_interval=self.health_interval).start()
+        return self._pool
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+    def generate(self, prompt: str, max_tokens: int = 128, temperature: float = 0.0, timeout: float = 120, **kwargs) -> str:
         import subprocess
 
         if not self.cmd:
             raise RuntimeError("No command configured for LocalSubprocessAdapter")
-        proc = subprocess.run(self.cmd, input=prompt.encode("utf-8"), capture_output=True, timeout=120)
+        if self.workers:
+            return self.pool.generate(prompt, timeout=timeout, max_tokens=max_tokens, temperature=temperature).strip()
+        proc = subprocess.run(self.cmd, input=prompt.encode("utf-8"), capture_output=True, timeout=timeout)
         if proc.returncode != 0:
             raise RuntimeError(f"Local model failed: {proc.stderr.decode('utf-8')}")
         return proc.stdout.decode("utf-8").strip()
 
+    async def agenerate(self, prompt: str, max_tokens: int = 128, temperature: float = 0.0, timeout: float = 120, **kwargs) -> str:
+        if not self.cmd:
+            raise RuntimeError("No command configured for LocalSubprocessAdapter")
+        if self.workers:
+            return await asyncio.to_thread(self.generate, prompt, max_tokens=max_tokens, temperature=temperature, timeout=timeout)
+        proc = await asyncio.create_subprocess_exec(*self.cmd, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(prompt.encode("utf-8")), timeout)
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+        if proc.returncode != 0:
+            raise RuntimeError(f"Local model failed: {stderr.decode('utf-8')}")
+        return stdout.decode("utf-8").strip()
+
+    def generate_stream(self, prompt: str, max_tokens: int = 128, temperature: float = 0.0, timeout: float = 120, **kwargs) -> Iterator[str]:
+        """Yield stdout as the runner writes it; the chunks join to what `generate` returns.
+
+        The prompt is fed to stdin in `select.PIPE_BUF` chunks from the same selector loop (as
+        `Popen.communicate` does), so large prompts and runners that answer while still reading
+        cannot deadlock, and `timeout` bounds the whole exchange.
+        """
+        import codecs
+        import select
+        import selectors
+        import subprocess
+        import tempfile
+
+        if not self.cmd:
+            raise RuntimeError("No command configured for LocalSubprocessAdapter")
+        if self.workers:
+            yield from self._pool_stream(prompt, timeout=timeout, max_tokens=max_tokens, temperature=temperature)
+            return
+        deadline = time.monotonic() + timeout
+        data_in = memoryview(prompt.encode("utf-8"))
+        written = 0
+        with tempfile.TemporaryFile() as err:
+            proc = subprocess.Popen(self.cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=err)
+            try:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                fd = proc.stdout.fileno()
+                started = False
+                pending = ""  # trailing whitespace, held back in case the output ends here
+                with selectors.DefaultSelector() as sel:
+                    sel.register(fd, selectors.EVENT_READ)
+                    if data_in:
+                        sel.register(proc.stdin, selectors.EVENT_WRITE)
+                    else:
+                        proc.stdin.close()
+                    while sel.get_map():
+                        remaining = deadline - time.monotonic()
+                        ready = sel.select(remaining) if remaining > 0 else []
+                        if not ready:
+                            raise subprocess.TimeoutExpired(self.cmd, timeout)
+                        for key, _ in ready:
+                            if key.fileobj is proc.stdin:
+                                try:
+                                    written += os.write(key.fd, data_in[written:written + select.PIPE_BUF])
+                                except BrokenPipeError:
+                                    written = len(data_in)
+                                if written >= len(data_in):
+                                    sel.unregister(proc.stdin)
+                                    proc.stdin.close()
+                                continue
+                            data = os.read(fd, 4096)
+                            text = decoder.decode(data, final=not data)
+                            if not started:
+                                text = text.lstrip()
+                                started = bool(text)
+                            if text:
+                                body = text.rstrip()
+                                if body:
+                                    yield pending + body
+                                    pending = ""
+                                pending += text[len(body):]
+                            if not data:
+                                # the output is complete; any unread input no longer matters
+                                for registered in list(sel.get_map().values()):
+                                    sel.unregister(registered.fileobj)
+                                break
+                if proc.wait(timeout=max(0.0, deadline - time.monotonic())) != 0:
+                    err.seek(0)
+                    raise RuntimeError(f"Local model failed: {err.read().decode('utf-8', 'replace')}")
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                proc.stdin.close()
+                proc.stdout.close()
+
+    def _pool_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        # strip like `generate`: leading whitespace of the first chunk, trailing of the last
+        pending = ""
+        started = False
+        for chunk in self.pool.generate_stream(prompt, **kwargs):
+            if not started:
+                chunk = chunk.lstrip()
+                started = bool(chunk)
+            body = chunk.rstrip()
+            if body:
+                yield pending + body
+                pending = ""
+            pending += chunk[len(body):]
+
 
 class RemoteAdapter(BaseAdapter):
     """Generic remote LLM adapter with support for OpenAI and HuggingFace Inference API.
@@ -85,10 +393,21 @@ class RemoteAdapter(BaseAdapter):
     - Else if HF_API_KEY is set -> use HuggingFace Inference API
 
     For tests we keep network calls testable by mocking `requests.post`.
+    Connections are pooled and kept alive across calls; see `PooledHTTP` for `pool_size`, `retries` and `backoff`.
     """
 
-    def __init__(self, model_name: str = "gpt-4", provider: str | None = None, api_key: str | None = None, base_url: str | None = None):
+    def __init__(
+        self,
+        model_name: str = "gpt-4",
+        provider: str | None = None,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        pool_size: int = 4,
+        retries: int = 2,
+        backoff: float = 0.25,
+    ):
         self.model_name = model_name
+        self.http = PooledHTTP(pool_size=pool_size, retries=retries, backoff=backoff)
         self.provider = provider or os.getenv("LLM_PROVIDER")
         self.api_key = api_key or os.getenv("OPENAI_API_KEY") or os.getenv("HF_API_KEY")
         self.base_url = base_url or os.getenv("OPENAI_API_BASE") or os.getenv("HF_API_URL")
@@ -116,18 +435,59 @@ class RemoteAdapter(BaseAdapter):
         else:
             raise ValueError(f"Unknown provider: {self.provider}")
 
-    def _generate_openai(self, prompt: str, max_tokens: int = 128, temperature: float = 0.0, **kwargs) -> str:
+    def generate_stream(self, prompt: str, max_tokens: int = 128, temperature: float = 0.0, **kwargs) -> Iterator[str]:
+        """Stream the completion over server-sent events (OpenAI chat deltas, HF/TGI tokens)."""
+        self._assert_requests()
+        if self.provider not in ("openai", "hf", "huggingface"):
+            raise ValueError(f"Unknown provider: {self.provider}")
+        if not self.http.can_stream:
+            yield self.generate(prompt, max_tokens=max_tokens, temperature=temperature, **kwargs)
+            return
+        if self.provider == "openai":
+            url, payload, timeout = self._openai_request(prompt, max_tokens, temperature)
+        else:
+            url, payload, timeout = self._hf_request(prompt, max_tokens, temperature)
+        payload["stream"] = True
+        headers = {"Authorization": f"Bearer {self.api_key}", "Accept": "text/event-stream"}
+        r = self.http.post(url, headers=headers, json=payload, timeout=timeout, stream=True)
+        try:
+            r.raise_for_status()
+            if not r.headers.get("Content-Type", "").startswith("text/event-stream"):
+                # the endpoint ignored `stream`: one complete reply
+                data = r.json()
+                yield self._openai_text(data) if self.provider == "openai" else self._hf_text(data)
+                return
+            for event in _iter_sse(r):
+                text = _sse_text(event)
+                if text:
+                    yield text
+        finally:
+            r.close()
+
+    def _openai_request(self, prompt: str, max_tokens: int, temperature: float):
         url = (self.base_url or "https://api.openai.com") + "/v1/chat/completions"
-        headers = {"Authorization": f"Bearer {self.api_key}"}
         payload = {
             "model": self.model_name,
             "messages": [{"role": "user", "content": prompt}],
             "max_tokens": max_tokens,
             "temperature": temperature,
         }
-        r = requests.post(url, headers=headers, json=payload, timeout=15)
+        return url, payload, 15
+
+    def _hf_request(self, prompt: str, max_tokens: int, temperature: float):
+        url = self.base_url or f"https://api-inference.huggingface.co/models/{self.model_name}"
+        payload = {"inputs": prompt, "parameters": {"max_new_tokens": max_tokens, "temperature": temperature}}
+        return url, payload, 30
+
+    def _generate_openai(self, prompt: str, max_tokens: int = 128, temperature: float = 0.0, **kwargs) -> str:
+        url, payload, timeout = self._openai_request(prompt, max_tokens, temperature)
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        r = self.http.post(url, headers=headers, json=payload, timeout=timeout)
         r.raise_for_status()
-        data = r.json()
+        return self._openai_text(r.json())
+
+    @staticmethod
+    def _openai_text(data: Any) -> str:
         # Support both 'choices[0].message.content' (chat) and 'choices[0].text' (completion)
         choice = data.get("choices", [{}])[0]
         if "message" in choice and choice["message"]:
@@ -135,13 +495,14 @@ class RemoteAdapter(BaseAdapter):
         return choice.get("text", "")
 
     def _generate_hf(self, prompt: str, max_tokens: int = 128, temperature: float = 0.0, **kwargs) -> str:
-        model = self.model_name
-        url = self.base_url or f"https://api-inference.huggingface.co/models/{model}"
+        url, payload, timeout = self._hf_request(prompt, max_tokens, temperature)
         headers = {"Authorization": f"Bearer {self.api_key}"}
-        payload = {"inputs": prompt, "parameters": {"max_new_tokens": max_tokens, "temperature": temperature}}
-        r = requests.post(url, headers=headers, json=payload, timeout=30)
+        r = self.http.post(url, headers=headers, json=payload, timeout=timeout)
         r.raise_for_status()
-        data = r.json()
+        return self._hf_text(r.json())
+
+    @staticmethod
+    def _hf_text(data: Any) -> str:
         # The HF inference API may return a string or a list/dict with generated_text
         if isinstance(data, str):
             return data
@@ -153,6 +514,99 @@ class RemoteAdapter(BaseAdapter):
         return json.dumps(data)
 
 
+def request_params(adapter: BaseAdapter, prompt: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """The prompt and parameters of `adapter.generate(prompt, **kwargs)`, with defaults filled in.
+
+    Wrappers exposing the wrapped adapter as `.adapter` are looked through.
+    """
+    while isinstance(getattr(adapter, "adapter", None), BaseAdapter):
+        adapter = adapter.adapter
+    try:
+        sig = inspect.signature(adapter.generate)
+        bound = sig.bind(prompt, **kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+        for p in sig.parameters.values():
+            if p.kind is p.VAR_KEYWORD:
+                params.update(params.pop(p.name, None) or {})
+        return params
+    except (TypeError, ValueError):
+        return dict(kwargs, prompt=prompt)
+
+
+class CoalescingAdapter(BaseAdapter):
+    """Wraps an adapter so identical concurrent requests share one underlying generation.
+
+    Requests are identical when they go to the same adapter and model with the same prompt and
+    parameters (defaults filled in, so `max_tokens=128` and an omitted `max_tokens` match). While
+    such a request is in flight, further `generate` calls from other threads wait for its result,
+    and further `agenerate` calls on the same event loop await it; errors are shared the same way.
+    Nothing is kept once the call finishes. `calls` counts underlying generations and `coalesced`
+    the requests that joined one. Streaming passes straight through.
+    """
+
+    def __init__(self, adapter: BaseAdapter):
+        self.adapter = adapter
+        self.model_name = getattr(adapter, "model_name", None)
+        self._lock = threading.Lock()
+        self._inflight: Dict[tuple, Future] = {}
+        self._ainflight: Dict[tuple, "asyncio.Future"] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def key(self, prompt: str, **kwargs) -> tuple:
+        params = request_params(self.adapter, prompt, kwargs)
+        return (id(self.adapter), type(self.adapter).__name__, self.model_name, json.dumps(params, sort_keys=True, default=repr))
+
+    def _join(self, table: Dict[tuple, Any], key: tuple, make) -> Tuple[Any, bool]:
+        with self._lock:
+            fut = table.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                return fut, False
+            fut = table[key] = make()
+            self.calls += 1
+            return fut, True
+
+    def generate(self, prompt: str, **kwargs) -> str:
+        key = self.key(prompt, **kwargs)
+        fut, leader = self._join(self._inflight, key, Future)
+        if not leader:
+            return fut.result()
+        try:
+            fut.set_result(self.adapter.generate(prompt, **kwargs))
+        except BaseException as e:
+            fut.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return fut.result()
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        loop = asyncio.get_running_loop()
+        key = (id(loop),) + self.key(prompt, **kwargs)
+
+        def start():
+            agenerate = getattr(self.adapter, "agenerate", None)
+            coro = agenerate(prompt, **kwargs) if agenerate else asyncio.to_thread(self.adapter.generate, prompt, **kwargs)
+            task = loop.create_task(coro)
+
+            def done(_):
+                with self._lock:
+                    if self._ainflight.get(key) is task:
+                        del self._ainflight[key]
+
+            task.add_done_callback(done)
+            return task
+
+        task, _ = self._join(self._ainflight, key, start)
+        # a cancelled waiter must not cancel the generation the others are waiting for
+        return await asyncio.shield(task)
+
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        return self.adapter.generate_stream(prompt, **kwargs)
+
+
 class LLMSelector:
     """Selects LLM adapter based on simple heuristic: task complexity or forced preference."""
 
@@ -0,0 +1,271 @@
+"""Response cache for LLM adapters: memory LRU, persistent SQLite store, optional near-duplicate lookup.
+
+`CachingAdapter(adapter, path=...)` answers repeated deterministic requests (`temperature` 0,
+see `cacheable`) without calling the wrapped adapter:
+
+  1. memory: LRU of `maxsize` entries keyed by a SHA-256 of (backend, prompt, parameters), where
+             the backend is the adapter class, model, provider and endpoint (`backend_identity`)
+  2. disk:   SQLite table at `path` (WAL mode), so answers survive restarts; hits are promoted to memory
+  3. near:   with `near_duplicates=True`, a second key over the normalised prompt (case-folded,
+             whitespace collapsed, trailing punctuation dropped) also matches on both tiers
+
+Entries expire `ttl` seconds after they were stored (None: never). `stats()` reports requests,
+hits per tier, misses, the hit rate and `saved_ms`, the generation time the hits avoided (each
+entry remembers how long its original generation took). Non-deterministic requests are passed
+through and counted as `bypassed`.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from llm_runtime.manager import BaseAdapter, request_params
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    nkey TEXT,
+    model TEXT,
+    response TEXT NOT NULL,
+    latency_ms REAL NOT NULL,
+    created REAL NOT NULL,
+    expires REAL
+);
+CREATE INDEX IF NOT EXISTS responses_nkey ON responses (nkey);
+"""
+
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    return _SPACE.sub(" ", prompt.casefold()).strip().rstrip(".!?;,: ")
+
+
+def cacheable(params: Dict[str, Any]) -> bool:
+    """Only deterministic requests are cached: `temperature` 0 (or not a parameter at all)."""
+    try:
+        return float(params.get("temperature") or 0.0) == 0.0
+    except (TypeError, ValueError):
+        return False
+
+
+def backend_identity(adapter: BaseAdapter) -> List[Any]:
+    """What distinguishes the backend behind `adapter` (wrappers exposing `.adapter` are looked through).
+
+    Two adapters serving the same model name from different providers or endpoints do not share
+    cache entries.
+    """
+    while isinstance(getattr(adapter, "adapter", None), BaseAdapter):
+        adapter = adapter.adapter
+    cls = type(adapter)
+    ident: List[Any] = [f"{cls.__module__}.{cls.__qualname__}", getattr(adapter, "model_name", None)]
+    for attr in ("provider", "base_url", "url", "cmd"):
+        value = getattr(adapter, attr, None)
+        if value is not None:
+            ident.append([attr, value])
+    return ident
+
+
+class CachingAdapter(BaseAdapter):
+    """Wraps an adapter with the tiered response cache described in the module docstring."""
+
+    def __init__(
+        self,
+        adapter: BaseAdapter,
+        path: Optional[str] = None,
+        ttl: Optional[float] = 24 * 3600.0,
+        maxsize: int = 1024,
+        near_duplicates: bool = False,
+        clock=time.time,
+    ):
+        self.adapter = adapter
+        self.model_name = getattr(adapter, "model_name", None)
+        self.backend = backend_identity(adapter)
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.near_duplicates = near_duplicates
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires, response, latency_ms, near key); near key -> exact key
+        self._memory: "OrderedDict[str, Tuple[Optional[float], str, float, Optional[str]]]" = OrderedDict()
+        self._near: Dict[str, str] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._stats = {"requests": 0, "hits_memory": 0, "hits_disk": 0, "hits_near": 0, "misses": 0, "bypassed": 0}
+        self._saved_ms = 0.0
+
+    # -- keys and storage
+
+    def _keys(self, prompt: str, kwargs: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        params = request_params(self.adapter, prompt, kwargs)
+        if not cacheable(params):
+            return None, None
+        params.pop("prompt", None)
+        blob = json.dumps([self.backend, prompt, params], sort_keys=True, default=repr)
+        key = hashlib.sha256(blob.encode("utf-8")).hexdigest()
+        nkey = None
+        if self.near_duplicates:
+            nblob = json.dumps([self.backend, normalize_prompt(prompt), params], sort_keys=True, default=repr)
+            nkey = hashlib.sha256(nblob.encode("utf-8")).hexdigest()
+        return key, nkey
+
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        # opened on first use so constructing the adapter creates no files
+        if self.path is None:
+            return None
+        if self._db is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            try:
+                db.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError:
+                pass
+            db.executescript(_SCHEMA)
+            self._db = db
+        return self._db
+
+    def _remember(self, key: str, nkey: Optional[str], expires: Optional[float], response: str, latency_ms: float) -> None:
+        self._memory[key] = (expires, response, latency_ms, nkey)
+        self._memory.move_to_end(key)
+        if nkey is not None:
+            self._near[nkey] = key
+        while len(self._memory) > self.maxsize:
+            self._forget(next(iter(self._memory)))
+
+    def _forget(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None and entry[3] is not None and self._near.get(entry[3]) == key:
+            del self._near[entry[3]]
+
+    def _lookup(self, key: Optional[str], nkey: Optional[str]) -> Optional[Tuple[str, float]]:
+        if key is None:
+            with self._lock:
+                self._stats["bypassed"] += 1
+            return None
+        now = self._clock()
+        with self._lock:
+            self._stats["requests"] += 1
+            for tier, k in (("hits_memory", key), ("hits_near", self._near.get(nkey) if nkey else None)):
+                entry = self._memory.get(k) if k else None
+                if entry is None:
+                    continue
+                if entry[0] is not None and entry[0] <= now:
+                    self._forget(k)
+                    continue
+                self._memory.move_to_end(k)
+                return self._hit(tier, entry[1], entry[2])
+
+            db = self._conn()
+            if db is not None:
+                for tier, column, k in (("hits_disk", "key", key), ("hits_near", "nkey", nkey)):
+                    if k is None:
+                        continue
+                    row = db.execute(
+                        f"SELECT key, response, latency_ms, expires FROM responses WHERE {column} = ? AND (expires IS NULL OR expires > ?) LIMIT 1",
+                        (k, now),
+                    ).fetchone()
+                    if row is not None:
+                        self._remember(row[0], nkey, row[3], row[1], row[2])
+                        return self._hit(tier, row[1], row[2])
+            self._stats["misses"] += 1
+            return None
+
+    def _hit(self, tier: str, response: str, latency_ms: float) -> Tuple[str, float]:
+        self._stats[tier] += 1
+        self._saved_ms += latency_ms
+        return response, latency_ms
+
+    def _store(self, key: str, nkey: Optional[str], response: str, latency_ms: float) -> None:
+        now = self._clock()
+        expires = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._remember(key, nkey, expires, response, latency_ms)
+            db = self._conn()
+            if db is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, nkey, model, response, latency_ms, created, expires) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, nkey, self.model_name, response, latency_ms, now, expires),
+                )
+
+    # -- adapter interface
+
+    def generate(self, prompt: str, **kwargs) -> str:
+        key, nkey = self._keys(prompt, kwargs)
+        hit = self._lookup(key, nkey)
+        if hit is not None:
+            return hit[0]
+        t0 = time.perf_counter()
+        out = self.adapter.generate(prompt, **kwargs)
+        if key is not None:
+            self._store(key, nkey, out, (time.perf_counter() - t0) * 1000)
+        return out
+
+    async def agenerate(self, prompt: str, **kwargs) -> str:
+        key, nkey = self._keys(prompt, kwargs)
+        hit = self._lookup(key, nkey)
+        if hit is not None:
+            return hit[0]
+        t0 = time.perf_counter()
+        out = await self.adapter.agenerate(prompt, **kwargs)
+        if key is not None:
+            self._store(key, nkey, out, (time.perf_counter() - t0) * 1000)
+        return out
+
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """A hit is one chunk; a miss streams from the wrapped adapter and is stored once complete."""
+        key, nkey = self._keys(prompt, kwargs)
+        hit = self._lookup(key, nkey)
+        if hit is not None:
+            yield hit[0]
+            return
+        t0 = time.perf_counter()
+        parts = []
+        for chunk in self.adapter.generate_stream(prompt, **kwargs):
+            parts.append(chunk)
+            yield chunk
+        if key is not None:
+            self._store(key, nkey, "".join(parts), (time.perf_counter() - t0) * 1000)
+
+    # -- maintenance and metrics
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            hits = out["hits_memory"] + out["hits_disk"] + out["hits_near"]
+            out["hits"] = hits
+            out["hit_rate"] = round(hits / out["requests"], 4) if out["requests"] else 0.0
+            out["saved_ms"] = round(self._saved_ms, 3)
+            out["memory_entries"] = len(self._memory)
+            return out
+
+    def purge_expired(self) -> int:
+        """Drop expired entries from both tiers; returns how many disk rows were removed."""
+        now = self._clock()
+        with self._lock:
+            for k in [k for k, e in self._memory.items() if e[0] is not None and e[0] <= now]:
+                self._forget(k)
+            db = self._conn()
+            if db is None:
+                return 0
+            return db.execute("DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?", (now,)).rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._near.clear()
+            db = self._conn()
+            if db is not None:
+                db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -1,77 +1,95 @@
-"""Simple CLI demo wiring perception -> orchestrator -> agents."""
+"""Simple CLI demo wiring perception -> orchestrator -> agents.
+
+`python main.py` runs an interactive loop. `python main.py --daemon` keeps the same runtime
+warm behind a Unix socket; talk to it with `python -m orchestrator.daemon` (see that module).
+"""
+
+import argparse
+import threading
 
 from perception.perception_manager import PerceptionManager
 from orchestrator.intent_parser import IntentParser
+from orchestrator.semantic_intent import SemanticIntentClassifier
 from orchestrator.task_planner import TaskPlanner
 from core.agents.registry import AgentRegistry
-from core.agents.safe.noop_agent import NoopAgent
-from core.agents.safe.wifi_agent import WifiAgent
-from core.agents.privileged.power_agent import PowerAgent
 from core.orchestrator.event_bus import EventBus
 from orchestrator.execution_manager import ExecutionManager
 from permissions.policy_engine import PolicyEngine
+from voice.listener import Listener
+from voice.speaker import Speaker
+
+
+# agent name -> factory; agents are imported and built on first use, and their capabilities
+# are indexed once loaded
+AGENT_FACTORIES = {
+    "noop_agent": "core.agents.safe.noop_agent:NoopAgent",
+    "wifi_agent": "core.agents.safe.wifi_agent:WifiAgent",
+    "power_agent": "core.agents.privileged.power_agent:PowerAgent",
+    # network agent so multi-step plans (wifi -> network status) succeed
+    "network_agent": "core.agents.privileged.network_agent:NetworkAgent",
+    # LLM-backed agent (uses local/remote adapters)
+    "llm-agent": "core.agents.safe.llm_agent:LLMAgent",
+    "music_agent": "core.agents.safe.music_agent:MusicAgent",
+}
 
 
-def main_loop():
-    print("JARVIS CLI demo. Type 'exit' to quit.")
+def setup():
+    """Build the runtime (no agent or TTS engine is loaded yet) and return `handle(text, out=print, ask=input)`.
+
+    `handle` runs one command through perception, parsing, routing and execution; results go to
+    `out` (print-like) and confirmation questions to `ask`. Commands are handled one at a time.
+    """
     pm = PerceptionManager()
-    ip = IntentParser()
+    ip = IntentParser(semantic=SemanticIntentClassifier())
     tp = TaskPlanner()
     registry = AgentRegistry()
 
     # register agents
-    registry.register(NoopAgent().name, NoopAgent())
-    registry.register(WifiAgent().name, WifiAgent())
-    registry.register(PowerAgent().name, PowerAgent())
-    # Register network agent so multi-step plans (wifi -> network status) succeed
-    from core.agents.privileged.network_agent import NetworkAgent
-
-    registry.register(NetworkAgent().name, NetworkAgent())
-
-    # LLM-backed agent (uses local/remote adapters)
-    from core.agents.safe.llm_agent import LLMAgent
-
-    registry.register(LLMAgent().name, LLMAgent())
-
-    # Music agent
-    from core.agents.safe.music_agent import MusicAgent
+    for name, factory in AGENT_FACTORIES.items():
+        registry.register_factory(name, factory)
 
-    registry.register(MusicAgent().name, MusicAgent())
-
-    eb = EventBus()
+    eb = EventBus(segment_max_bytes=64 * 1024 * 1024)
     policy = PolicyEngine()
-    exec_mgr = ExecutionManager(registry, eb, policy_engine=policy)
+    # bound coroutine agents, which can be cancelled; synchronous agents (power, system, ...)
+    # cannot be stopped once started, so they only get a budget they declare themselves
+    exec_mgr = ExecutionManager(registry, eb, policy_engine=policy, task_timeout=30.0)
 
     from orchestrator.router import Router
 
-    router = Router(planner=tp)
+    router = Router(planner=tp, registry=registry)
 
     from orchestrator.confirmation import handle_confirmation
 
+    # the TTS engine is chosen on first `speak`
+    speaker = Speaker()
+    # where the current command's output and confirmation prompts go
+    io = {"out": print, "ask": input}
+
     def on_event(event):
+        out = io["out"]
         parsed = ip.parse(event)
         base_ctx = {"time_hour": 12, "battery": 0.8}
         r = router.route(parsed, context=base_ctx)
         if r["status"] == "no_plan":
-            print(f"No plan: {r['reason']} for: {parsed}")
+            out(f"No plan: {r['reason']} for: {parsed}")
             return
         if r["status"] == "require_confirmation":
-            print("Action requires confirmation:", r.get("needed"))
-            res = handle_confirmation(parsed, router, exec_mgr, context=base_ctx)
+            out("Action requires confirmation:", r.get("needed"))
+            res = handle_confirmation(parsed, router, exec_mgr, context=base_ctx, input_fn=io["ask"])
             if res.get("status") == "confirmed":
                 for rr in res.get("results", []):
-                    print("->", rr)
+                    out("->", rr)
             elif res.get("status") == "denied":
-                print("User denied action.")
+                out("User denied action.")
             else:
-                print("Confirmation flow error:", res)
+                out("Confirmation flow error:", res)
             return
-        for task in r["plan"]:
-            res = exec_mgr.execute_task(task, context=base_ctx)
-            print("->", res)
+        # independent steps run concurrently; results come back in plan order
+        for res in exec_mgr.execute_plan(r["plan"], context=base_ctx):
+            out("->", res)
             # voice feedback for music actions
             try:
-                if speaker and res.get("success") and isinstance(res.get("result"), dict):
+                if res.get("success") and isinstance(res.get("result"), dict):
                     rr = res["result"]
                     status = rr.get("status")
                     if status == "playing":
@@ -89,31 +107,47 @@ def main_loop():
 
     pm.register_listener(on_event)
 
-    speaker = None
-    try:
-        from voice.speaker import Speaker
+    # Demo: use the listener to normalize text (could be real STT in future)
+    listener = Listener()
+    lock = threading.Lock()
+
+    def handle(text: str, out=print, ask=input) -> None:
+        with lock:
+            io["out"], io["ask"] = out, ask
+            try:
+                pm.emit_voice_event(listener.listen_from_text(text))
+            finally:
+                io["out"], io["ask"] = print, input
+
+    return handle
 
-        speaker = Speaker()
-    except Exception:
-        speaker = None
+
+def main_loop():
+    print("JARVIS CLI demo. Type 'exit' to quit.")
+    handle = setup()
 
     while True:
         txt = input("You: ")
         if txt.strip().lower() in ("exit", "quit"):
             break
-        # Demo: use the listener to normalize text (could be real STT in future)
-        from voice.listener import Listener
+        handle(txt)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JARVIS CLI demo")
+    parser.add_argument("--daemon", action="store_true", help="serve commands over a Unix socket instead of reading stdin")
+    parser.add_argument("--socket", default=None, help="socket path for --daemon (default: $JARVIS_SOCKET or data/jarvis.sock)")
+    args = parser.parse_args(argv)
+    if not args.daemon:
+        main_loop()
+        return
 
-        listener = Listener()
-        text = listener.listen_from_text(txt)
-        pm.emit_voice_event(text)
+    from orchestrator.daemon import default_socket_path, serve
 
-        # simple flow: if LLM agent answered, speak the response
-        # when execution manager returns responses, they are printed above; we also speak them
-        # Hook into exec_mgr by wrapping its execute_task is non-trivial here, instead speakers will be used in confirmation and response flows
-        # For demo, if agent 'llm-agent' was used we will speak back inside exec_mgr results
-        
+    path = args.socket or default_socket_path()
+    print(f"JARVIS daemon listening on {path}")
+    serve(setup(), path)
 
 
 if __name__ == "__main__":
-    main_loop()
+    main()
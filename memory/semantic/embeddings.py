@@ -0,0 +1,114 @@
+"""Text embedders for semantic lookups (intent fallback, memory search).
+
+`HashingEmbedder` needs nothing beyond the standard library: words, word bigrams and
+character n-grams are hashed into a fixed number of signed buckets and L2-normalised, so
+paraphrases that share words or word pieces ("internet" / "internet connection") land close
+together. `SentenceTransformerEmbedder` wraps a small local model when
+`sentence-transformers` is installed. `default_embedder()` picks the best available one.
+
+Embeddings are sparse `{dimension: weight}` dicts; dense model output is converted.
+"""
+
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from sentence_transformers import SentenceTransformer
+except Exception:
+    SentenceTransformer = None
+
+SparseVector = Dict[int, float]
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# filler words that carry no intent
+STOP_WORDS = frozenset(
+    "a an the to of for me my please can could would you hey hi hello jarvis now just and is it i".split()
+)
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lower-cased tokens joined by single spaces; the cache key for an utterance."""
+    return " ".join(_TOKEN.findall((text or "").lower()))
+
+
+def _l2(vec: SparseVector) -> SparseVector:
+    norm = sum(w * w for w in vec.values()) ** 0.5
+    if not norm:
+        return {}
+    return {d: w / norm for d, w in vec.items()}
+
+
+class HashingEmbedder:
+    """Feature-hashing embedder (no model, no training).
+
+    Features: words (minus `STOP_WORDS`), adjacent word pairs and character n-grams of each
+    word padded with `<`/`>`, weighted by `word_weight`/`bigram_weight`/`char_weight`. Each
+    feature hashes (CRC32, stable across processes) to one of `dim` buckets with a sign bit.
+    """
+
+    def __init__(
+        self,
+        dim: int = 1 << 12,
+        ngram_range=(3, 4),
+        word_weight: float = 1.0,
+        bigram_weight: float = 0.5,
+        char_weight: float = 0.3,
+    ):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.word_weight = word_weight
+        self.bigram_weight = bigram_weight
+        self.char_weight = char_weight
+
+    def _features(self, text: str) -> Iterable[tuple]:
+        words = [w for w in normalize(text).split() if w not in STOP_WORDS]
+        lo, hi = self.ngram_range
+        for i, word in enumerate(words):
+            yield "w:" + word, self.word_weight
+            if i:
+                yield f"b:{words[i - 1]} {word}", self.bigram_weight
+            padded = f"<{word}>"
+            for n in range(lo, hi + 1):
+                for j in range(len(padded) - n + 1):
+                    yield "c:" + padded[j:j + n], self.char_weight
+
+    def embed(self, text: str) -> SparseVector:
+        vec: SparseVector = {}
+        for feature, weight in self._features(text):
+            h = zlib.crc32(feature.encode("utf-8"))
+            d = h % self.dim
+            vec[d] = vec.get(d, 0.0) + (weight if h & 0x80000000 else -weight)
+        return _l2({d: w for d, w in vec.items() if w})
+
+    def embed_many(self, texts: Iterable[str]) -> List[SparseVector]:
+        return [self.embed(t) for t in texts]
+
+
+class SentenceTransformerEmbedder:
+    """Small local sentence-embedding model on CPU (requires `sentence-transformers`)."""
+
+    def __init__(self, model: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        if SentenceTransformer is None:
+            raise RuntimeError("sentence-transformers is not installed")
+        self.model = SentenceTransformer(model, device="cpu")
+        # dense output: lets `VectorIndex` use faiss
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, text: str) -> SparseVector:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Iterable[str]) -> List[SparseVector]:
+        rows = self.model.encode(list(texts), normalize_embeddings=True)
+        return [{d: float(w) for d, w in enumerate(row) if w} for row in rows]
+
+
+def default_embedder(prefer_model: bool = False):
+    """`SentenceTransformerEmbedder` when requested and installed, otherwise `HashingEmbedder`."""
+    if prefer_model and SentenceTransformer is not None:
+        try:
+            return SentenceTransformerEmbedder()
+        except Exception:
+            pass
+    return HashingEmbedder()
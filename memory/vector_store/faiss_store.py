@@ -0,0 +1,79 @@
+"""In-memory nearest-neighbour index over embeddings (cosine similarity).
+
+Vectors are the sparse `{dimension: weight}` dicts produced by `memory.semantic.embeddings`,
+L2-normalised so the inner product is the cosine. Without extra dependencies the index is an
+inverted list per dimension: a query only touches the entries that share a dimension with it,
+which for hashed text features is a small fraction of the index. When `faiss` and `numpy` are
+installed and `dim` is given, `build()` moves the vectors into a `faiss.IndexFlatIP` instead,
+which is the better fit for dense model embeddings.
+"""
+
+import heapq
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import faiss
+    import numpy as np
+except Exception:
+    faiss = None
+    np = None
+
+SparseVector = Dict[int, float]
+
+
+class VectorIndex:
+    """Labelled vectors with top-k cosine search."""
+
+    def __init__(self, dim: Optional[int] = None, use_faiss: bool = True):
+        self.dim = dim
+        self.labels: List[Any] = []
+        self._vectors: List[SparseVector] = []
+        # dimension -> [(row, weight)]
+        self._postings: Dict[int, List[Tuple[int, float]]] = {}
+        self._faiss = None
+        self._use_faiss = use_faiss and faiss is not None and dim is not None
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def add(self, vector: SparseVector, label: Any) -> int:
+        row = len(self.labels)
+        self.labels.append(label)
+        self._vectors.append(vector)
+        for d, w in vector.items():
+            self._postings.setdefault(d, []).append((row, w))
+        self._faiss = None
+        return row
+
+    def build(self) -> None:
+        """Prepare the faiss index if enabled (called lazily by `search`)."""
+        if not self._use_faiss or not self._vectors:
+            return
+        mat = np.zeros((len(self._vectors), self.dim), dtype="float32")
+        for row, vec in enumerate(self._vectors):
+            for d, w in vec.items():
+                mat[row, d] = w
+        index = faiss.IndexFlatIP(self.dim)
+        index.add(mat)
+        self._faiss = index
+
+    def search(self, vector: SparseVector, k: int = 1) -> List[Tuple[float, Any]]:
+        """Up to `k` (score, label) pairs, best first; entries with no overlap are not returned."""
+        if not vector or not self.labels:
+            return []
+        if self._use_faiss:
+            if self._faiss is None:
+                self.build()
+            q = np.zeros((1, self.dim), dtype="float32")
+            for d, w in vector.items():
+                q[0, d] = w
+            scores, rows = self._faiss.search(q, min(k, len(self.labels)))
+            return [(float(s), self.labels[r]) for s, r in zip(scores[0], rows[0]) if r >= 0 and s > 0]
+
+        scores: Dict[int, float] = {}
+        postings = self._postings
+        for d, w in vector.items():
+            for row, rw in postings.get(d, ()):
+                scores[row] = scores.get(row, 0.0) + w * rw
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(score, self.labels[row]) for row, score in best if score > 0]
@@ -37,7 +37,7 @@ def handle_confirmation(parsed_intent: Dict[str, Any], router, exec_mgr, context
             # Lazy import to avoid cycles
             from permissions.approvals import ApprovalStore
 
-            store = ApprovalStore()
+            store = ApprovalStore.shared()
             # grant for agent/action according to the first task in plan
             first_task = route_res.get("needed")
             # route_res.needed contains 'intent' and 'confidence' only; identify agent/action by re-routing with confirmation
@@ -53,10 +53,7 @@ def handle_confirmation(parsed_intent: Dict[str, Any], router, exec_mgr, context
         r2 = router.route(parsed_intent, ctx)
         if r2.get("status") != "ok":
             return {"status": "error", "route": r2}
-        results = []
-        for task in r2.get("plan", []):
-            res = exec_mgr.execute_task(task, context=ctx)
-            results.append(res)
+        results = exec_mgr.execute_plan(r2.get("plan", []), context=ctx)
         return {"status": "confirmed", "results": results}
     else:
         return {"status": "denied"}
@@ -0,0 +1,210 @@
+"""Unix-socket daemon that keeps the JARVIS runtime warm, and the thin client that talks to it.
+
+Server: `python main.py --daemon` builds the runtime once (`main.setup()`) and passes its
+`handle(text, out, ask)` to `serve`. Client: `python -m orchestrator.daemon "open chrome"` runs
+one command; without arguments it reads commands interactively. The client uses only the
+standard library, so it starts without importing any of the runtime.
+
+Protocol: newline-delimited JSON over the socket. A connection may carry many requests.
+  client -> {"op": "command", "text": ...}   server -> {"out": line}* then {"done": true, "ms": ...}
+            {"op": "ping"}                               {"done": true, "pong": true}
+            {"op": "shutdown"}                           {"done": true}
+While a command runs the server may send {"prompt": question}; the client answers
+{"reply": answer} (confirmation flows).
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+DEFAULT_SOCKET = "data/jarvis.sock"
+
+
+def default_socket_path() -> str:
+    return os.environ.get("JARVIS_SOCKET") or DEFAULT_SOCKET
+
+
+def _send(wfile, msg: dict) -> None:
+    wfile.write((json.dumps(msg, default=str) + "\n").encode("utf-8"))
+    wfile.flush()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for raw in self.rfile:
+            try:
+                req = json.loads(raw)
+            except json.JSONDecodeError:
+                _send(self.wfile, {"done": True, "error": "invalid_json"})
+                continue
+            op = req.get("op", "command")
+            if op == "ping":
+                _send(self.wfile, {"done": True, "pong": True})
+            elif op == "shutdown":
+                _send(self.wfile, {"done": True})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+            elif op == "command":
+                self._command(str(req.get("text") or ""))
+            else:
+                _send(self.wfile, {"done": True, "error": f"unknown_op:{op}"})
+
+    def _command(self, text: str) -> None:
+        def out(*args) -> None:
+            _send(self.wfile, {"out": " ".join(str(a) for a in args)})
+
+        def ask(question: str) -> str:
+            _send(self.wfile, {"prompt": question})
+            line = self.rfile.readline()
+            try:
+                return str(json.loads(line).get("reply", ""))
+            except (json.JSONDecodeError, AttributeError):
+                return ""
+
+        t0 = time.perf_counter()
+        try:
+            self.server.handle_command(text, out=out, ask=ask)
+        except Exception as e:
+            _send(self.wfile, {"done": True, "error": str(e)})
+            return
+        _send(self.wfile, {"done": True, "ms": round((time.perf_counter() - t0) * 1000, 3)})
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, handle_command: Callable[..., None]):
+        self.handle_command = handle_command
+        super().__init__(path, _Handler)
+
+
+def _remove_stale(path: str) -> None:
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise RuntimeError(f"{path} exists and is not a socket; refusing to replace it")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"a daemon is already listening on {path}")
+
+
+def make_server(handle_command: Callable[..., None], path: Optional[str] = None) -> DaemonServer:
+    """Bind the socket (owner-only permissions), replacing a stale one left by a dead daemon."""
+    path = path or default_socket_path()
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    _remove_stale(path)
+    old = os.umask(0o177)
+    try:
+        return DaemonServer(path, handle_command)
+    finally:
+        os.umask(old)
+
+
+def serve(handle_command: Callable[..., None], path: Optional[str] = None) -> None:
+    """Serve until a client sends `shutdown` (or the process is interrupted)."""
+    server = make_server(handle_command, path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(server.server_address)
+        except OSError:
+            pass
+
+
+class Client:
+    """Connection to a running daemon."""
+
+    def __init__(self, path: Optional[str] = None, timeout: Optional[float] = None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path or default_socket_path())
+        self.rfile = self.sock.makefile("rb")
+        self.wfile = self.sock.makefile("wb")
+
+    def request(self, msg: dict, ask: Callable[[str], str] = input) -> Iterator[dict]:
+        """Send one request and yield the server's messages up to and including `done`."""
+        _send(self.wfile, msg)
+        for raw in self.rfile:
+            reply = json.loads(raw)
+            if "prompt" in reply:
+                _send(self.wfile, {"reply": ask(reply["prompt"])})
+                continue
+            yield reply
+            if reply.get("done"):
+                return
+        raise ConnectionError("daemon closed the connection")
+
+    def command(self, text: str, ask: Callable[[str], str] = input) -> Iterator[str]:
+        """Run `text` and yield its output lines."""
+        for reply in self.request({"op": "command", "text": text}, ask=ask):
+            if "error" in reply:
+                raise RuntimeError(reply["error"])
+            if "out" in reply:
+                yield reply["out"]
+
+    def close(self) -> None:
+        for f in (self.rfile, self.wfile, self.sock):
+            try:
+                f.close()
+            except OSError:
+                pass
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="jarvis", description="Send commands to a running JARVIS daemon (python main.py --daemon).")
+    parser.add_argument("text", nargs="*", help="command to run; omit for an interactive session")
+    parser.add_argument("--socket", default=None, help="daemon socket (default: $JARVIS_SOCKET or data/jarvis.sock)")
+    parser.add_argument("--stop", action="store_true", help="shut the daemon down")
+    args = parser.parse_args(argv)
+    try:
+        client = Client(args.socket)
+    except OSError as e:
+        print(f"cannot reach daemon: {e}", file=sys.stderr)
+        return 1
+    with client:
+        if args.stop:
+            list(client.request({"op": "shutdown"}))
+            return 0
+        if args.text:
+            for line in client.command(" ".join(args.text)):
+                print(line)
+            return 0
+        while True:
+            try:
+                txt = input("You: ")
+            except EOFError:
+                return 0
+            if txt.strip().lower() in ("exit", "quit"):
+                return 0
+            for line in client.command(txt):
+                print(line)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,145 @@
-from typing import Dict, Optional
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
 
 from core.orchestrator.event_bus import EventBus
 from core.agents.registry import AgentRegistry
 from permissions.policy_engine import PolicyEngine
 
 
+def plan_dependencies(plan: List[Dict]) -> List[List[int]]:
+    """Dependencies of each plan step, as plan indices.
+
+    A step's `depends_on` lists plan indices or the `id` of other steps. Raises ValueError for
+    unknown references and cycles.
+    """
+    ids = {t.get("id"): i for i, t in enumerate(plan) if t.get("id") is not None}
+    deps: List[List[int]] = []
+    for i, task in enumerate(plan):
+        refs = task.get("depends_on") or []
+        if isinstance(refs, (int, str)):
+            refs = [refs]
+        out = set()
+        for ref in refs:
+            j = ids.get(ref) if isinstance(ref, str) else ref
+            if not isinstance(j, int) or not 0 <= j < len(plan) or j == i:
+                raise ValueError(f"plan step {i} has an invalid dependency: {ref!r}")
+            out.add(j)
+        deps.append(sorted(out))
+
+    remaining = [len(d) for d in deps]
+    dependents: List[List[int]] = [[] for _ in plan]
+    for i, d in enumerate(deps):
+        for j in d:
+            dependents[j].append(i)
+    ready = [i for i, n in enumerate(remaining) if n == 0]
+    visited = 0
+    while ready:
+        visited += 1
+        for k in dependents[ready.pop()]:
+            remaining[k] -= 1
+            if remaining[k] == 0:
+                ready.append(k)
+    if visited != len(plan):
+        raise ValueError("plan dependencies contain a cycle")
+    return deps
+
+
+def _timeout_result(still_running: bool = False) -> Dict:
+    result = {"success": False, "error": "timeout"}
+    if still_running:
+        # the agent was abandoned, not stopped: its action may yet take effect
+        result["still_running"] = True
+    return result
+
+
+def _run_coroutine(make: Callable[[], Coroutine]) -> Any:
+    """Run the coroutine `make()` to completion from synchronous code.
+
+    Inside a running event loop (e.g. `execute_task` called from async code) `asyncio.run` is not
+    allowed, so the coroutine then runs on a fresh loop in a helper thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(make())
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-loop") as pool:
+        return pool.submit(lambda: asyncio.run(make())).result()
+
+
 class ExecutionManager:
-    """Manage execution of planned tasks, including permission checks and event logging."""
+    """Manage execution of planned tasks, including permission checks and event logging.
+
+    `execute_plan` / `execute_plan_async` run a whole plan: steps start once their `depends_on`
+    steps have finished (successfully or not), independent steps run concurrently, at most
+    `agent_limits.get(agent, default_agent_limit)` at a time per agent.
 
-    def __init__(self, registry: AgentRegistry, event_bus: EventBus, policy_engine: Optional[PolicyEngine] = None):
+    Deadlines: each task gets a time budget (see `budget_for`). When it runs out, a `task.timeout`
+    event is logged and the task ends with `{"success": False, "error": "timeout"}`. Agents whose
+    `execute` is a coroutine function are cancelled. Synchronous agents cannot be stopped: they run
+    in a daemon thread that is abandoned, so their action may still complete later; the result and
+    the `task.timeout` event then carry `"still_running": True`. For that reason the manager-wide
+    `task_timeout` only applies to coroutine agents; a synchronous agent is only bounded when
+    the task, the caller, the context or the agent itself asks for it. Without a budget, agents
+    run inline.
+    """
+
+    def __init__(
+        self,
+        registry: AgentRegistry,
+        event_bus: EventBus,
+        policy_engine: Optional[PolicyEngine] = None,
+        agent_limits: Optional[Dict[str, int]] = None,
+        default_agent_limit: int = 1,
+        task_timeout: Optional[float] = None,
+        max_workers: int = 8,
+    ):
         self.registry = registry
         self.event_bus = event_bus
         self.policy_engine = policy_engine
+        self.agent_limits = dict(agent_limits or {})
+        self.default_agent_limit = default_agent_limit
+        self.task_timeout = task_timeout
+        self.max_workers = max_workers
+
+    def _agent_limit(self, agent_name: Optional[str]) -> int:
+        return max(1, int(self.agent_limits.get(agent_name, self.default_agent_limit)))
 
-    def execute_task(self, task: Dict, context: Dict = None) -> Dict:
-        agent_name = task.get("agent")
-        action = task.get("action")
-        args = task.get("args", {})
+    def budget_for(self, task: Dict, agent: Any = None, context: Optional[Dict] = None, timeout: Optional[float] = None) -> Optional[float]:
+        """Seconds `task` may run for, or None for no limit.
 
-        self.event_bus.append_event({"type": "task.start", "task": task, "context": context})
+        The budget is the first of `task["timeout"]`, the `timeout` argument, `context["timeout"]`,
+        the agent's `timeout` attribute and, for coroutine agents only, `task_timeout`; it is
+        capped by an absolute `context["deadline"]` (`time.time()` seconds) shared by every step
+        of a plan.
+        """
+        ctx = context or {}
+        default = self.task_timeout if asyncio.iscoroutinefunction(getattr(agent, "execute", None)) else None
+        for value in (task.get("timeout"), timeout, ctx.get("timeout"), getattr(agent, "timeout", None), default):
+            if value is not None:
+                budget = float(value)
+                break
+        else:
+            budget = None
+        deadline = ctx.get("deadline")
+        if deadline is not None:
+            remaining = float(deadline) - time.time()
+            budget = remaining if budget is None else min(budget, remaining)
+        return budget
 
-        agent = self.registry.get(agent_name)
+    def _begin(self, task: Dict, context: Optional[Dict]) -> Tuple[str, Any, Optional[Dict]]:
+        """Log task.start and run the policy check. Returns (task id, agent, early result)."""
+        # correlates the start/policy/timeout/end events of this execution
+        task_id = uuid.uuid4().hex
+
+        self.event_bus.append_event({"type": "task.start", "task_id": task_id, "task": task, "context": context})
+
+        agent = self.registry.get(task.get("agent"))
         if not agent:
-            result = {"success": False, "error": "agent_not_found"}
-            self.event_bus.append_event({"type": "task.end", "task": task, "result": result})
-            return result
+            return task_id, None, {"success": False, "error": "agent_not_found"}
 
         # Policy evaluation
         if self.policy_engine:
@@ -32,17 +147,143 @@ class ExecutionManager:
             ctx = dict(context or {})
             ctx.setdefault("agent_risk", getattr(agent, "risk", "low"))
             allowed, reason = self.policy_engine.evaluate(task, ctx)
-            self.event_bus.append_event({"type": "task.policy", "task": task, "allowed": allowed, "reason": reason})
+            self.event_bus.append_event({"type": "task.policy", "task_id": task_id, "task": task, "allowed": allowed, "reason": reason})
             if not allowed:
-                result = {"success": False, "error": "policy_denied", "reason": reason}
-                self.event_bus.append_event({"type": "task.end", "task": task, "result": result})
-                return result
+                return task_id, agent, {"success": False, "error": "policy_denied", "reason": reason}
+        return task_id, agent, None
+
+    def _end(self, task_id: str, task: Dict, result: Dict, budget: Optional[float] = None, timed_out: bool = False) -> Dict:
+        if timed_out:
+            self.event_bus.append_event(
+                {"type": "task.timeout", "task_id": task_id, "task": task, "budget": budget, "still_running": bool(result.get("still_running"))}
+            )
+        self.event_bus.append_event({"type": "task.end", "task_id": task_id, "task": task, "result": result})
+        return result
+
+    def _invoke(self, agent: Any, action: str, args: Dict, budget: Optional[float]) -> Tuple[Dict, bool]:
+        """Run `agent.execute` within `budget` seconds; returns (result dict, whether the budget ran out).
+
+        The flag, not the result's `error`, marks a timeout: an agent may fail with "timeout" itself.
+        """
+        if budget is not None and budget <= 0:
+            return _timeout_result(), True
+        if asyncio.iscoroutinefunction(agent.execute):
+            try:
+                res = _run_coroutine(lambda: asyncio.wait_for(agent.execute(action, args), budget))
+            except asyncio.TimeoutError:
+                return _timeout_result(), True
+            except Exception as e:
+                return {"success": False, "error": str(e)}, False
+            return {"success": True, "result": res}, False
+        if budget is None:
+            try:
+                return {"success": True, "result": agent.execute(action, args)}, False
+            except Exception as e:
+                return {"success": False, "error": str(e)}, False
+
+        outcome: Dict = {}
+        finished = threading.Event()
+
+        def run() -> None:
+            try:
+                outcome["result"] = {"success": True, "result": agent.execute(action, args)}
+            except Exception as e:
+                outcome["result"] = {"success": False, "error": str(e)}
+            finally:
+                finished.set()
+
+        threading.Thread(target=run, name=f"task-{getattr(agent, 'name', 'agent')}", daemon=True).start()
+        if not finished.wait(budget):
+            # the thread cannot be stopped; it is left to finish on its own
+            return _timeout_result(still_running=True), True
+        return outcome["result"], False
+
+    def execute_task(self, task: Dict, context: Dict = None, timeout: Optional[float] = None) -> Dict:
+        task_id, agent, result = self._begin(task, context)
+        budget = None
+        timed_out = False
+        if result is None:
+            budget = self.budget_for(task, agent, context, timeout)
+            result, timed_out = self._invoke(agent, task.get("action"), task.get("args", {}), budget)
+        return self._end(task_id, task, result, budget, timed_out)
+
+    async def execute_task_async(self, task: Dict, context: Dict = None, timeout: Optional[float] = None) -> Dict:
+        """Async `execute_task`: coroutine agents run on the loop and are cancelled at the deadline."""
+        task_id, agent, result = await asyncio.to_thread(self._begin, task, context)
+        budget = None
+        timed_out = False
+        if result is None:
+            budget = self.budget_for(task, agent, context, timeout)
+            action, args = task.get("action"), task.get("args", {})
+            if not asyncio.iscoroutinefunction(agent.execute):
+                result, timed_out = await asyncio.to_thread(self._invoke, agent, action, args, budget)
+            elif budget is not None and budget <= 0:
+                result, timed_out = _timeout_result(), True
+            else:
+                try:
+                    result = {"success": True, "result": await asyncio.wait_for(agent.execute(action, args), budget)}
+                except asyncio.TimeoutError:
+                    result, timed_out = _timeout_result(), True
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+        return await asyncio.to_thread(self._end, task_id, task, result, budget, timed_out)
 
+    def _run_step(self, task: Dict, context: Optional[Dict], timeout: Optional[float]) -> Dict:
         try:
-            res = agent.execute(action, args)
-            result = {"success": True, "result": res}
+            return self.execute_task(task, context=context, timeout=timeout)
         except Exception as e:
-            result = {"success": False, "error": str(e)}
+            # e.g. the event log could not be written
+            return {"success": False, "error": str(e)}
 
-        self.event_bus.append_event({"type": "task.end", "task": task, "result": result})
-        return result
+    def execute_plan(self, plan: List[Dict], context: Dict = None, timeout: Optional[float] = None) -> List[Dict]:
+        """Run a plan on a thread pool, respecting dependencies; results come back in plan order.
+
+        `timeout` is the default per-step budget; set `context["deadline"]` to bound the whole plan.
+        """
+        deps = plan_dependencies(plan)
+        results: List[Optional[Dict]] = [None] * len(plan)
+        pending = list(range(len(plan)))
+        running: Dict = {}
+        busy: Dict[Optional[str], int] = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="plan-step")
+        try:
+            while pending or running:
+                for i in list(pending):
+                    agent = plan[i].get("agent")
+                    if busy.get(agent, 0) >= self._agent_limit(agent) or any(results[j] is None for j in deps[i]):
+                        continue
+                    pending.remove(i)
+                    busy[agent] = busy.get(agent, 0) + 1
+                    running[executor.submit(self._run_step, plan[i], context, timeout)] = i
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    i = running.pop(fut)
+                    results[i] = fut.result()
+                    busy[plan[i].get("agent")] -= 1
+        finally:
+            executor.shutdown(wait=False)
+        return results
+
+    async def execute_plan_async(self, plan: List[Dict], context: Dict = None, timeout: Optional[float] = None) -> List[Dict]:
+        """Async variant of `execute_plan`, built on `execute_task_async`."""
+        deps = plan_dependencies(plan)
+        results: List[Optional[Dict]] = [None] * len(plan)
+        finished = [asyncio.Event() for _ in plan]
+        slots: Dict[Optional[str], asyncio.Semaphore] = {}
+
+        async def run(i: int) -> None:
+            for j in deps[i]:
+                await finished[j].wait()
+            task = plan[i]
+            agent = task.get("agent")
+            slot = slots.setdefault(agent, asyncio.Semaphore(self._agent_limit(agent)))
+            async with slot:
+                try:
+                    results[i] = await self.execute_task_async(task, context=context, timeout=timeout)
+                except Exception as e:
+                    results[i] = {"success": False, "error": str(e)}
+            finished[i].set()
+
+        await asyncio.gather(*(run(i) for i in range(len(plan))))
+        return results
@@ -0,0 +1,65 @@
+"""Declarative intent and entity grammar for `IntentParser`.
+
+INTENTS: (keyword, intent) pairs in priority order. A text's intent is the one of the
+highest-priority keyword found anywhere in it (case-insensitive substring).
+
+ENTITIES: how entity values are extracted. Each spec has a `name` and one `capture`:
+  - "word":    a `trigger` keyword, whitespace, then a run of letters/digits/`_`/`-`
+  - "rest":    a `trigger` keyword, whitespace, then the rest of the line up to the end of the text
+  - "keyword": the first of `keywords` in the text, lower-cased
+  - "digits":  the first run of digits, as an int
+The first (leftmost) occurrence that satisfies the capture wins.
+
+OVERLAP: how overlapping keyword matches are resolved before picking the intent:
+"priority" (keep the higher-priority keyword) or "longest" (keep the longer one).
+"""
+
+INTENTS = [
+    ("shutdown", "shutdown_system"),
+    ("reboot", "reboot_system"),
+    ("wifi", "manage_wifi"),
+    ("open", "open_app"),
+    ("search", "search_web"),
+    ("play", "play_music"),
+    ("music", "play_music"),
+]
+
+ENTITIES = [
+    {"name": "app", "capture": "word", "trigger": "open"},
+    {"name": "query", "capture": "rest", "trigger": "play"},
+    {"name": "device", "capture": "keyword", "keywords": ["wifi", "bluetooth", "screen", "volume", "battery"]},
+    {"name": "number", "capture": "digits"},
+]
+
+OVERLAP = "priority"
+
+# Labelled example utterances for the optional semantic fallback
+# (`orchestrator.semantic_intent.SemanticIntentClassifier`), used when no keyword matches.
+EXAMPLES = [
+    ("turn off the internet", "manage_wifi"),
+    ("disconnect from the internet", "manage_wifi"),
+    ("turn the wireless network on", "manage_wifi"),
+    ("connect me to the network", "manage_wifi"),
+    ("enable wireless", "manage_wifi"),
+    ("go offline", "manage_wifi"),
+    ("power off the computer", "shutdown_system"),
+    ("turn off the computer", "shutdown_system"),
+    ("switch off the machine", "shutdown_system"),
+    ("power down", "shutdown_system"),
+    ("restart the computer", "reboot_system"),
+    ("restart the machine", "reboot_system"),
+    ("launch the browser", "open_app"),
+    ("start the text editor", "open_app"),
+    ("run the terminal", "open_app"),
+    ("look up the weather", "search_web"),
+    ("google how tall is the eiffel tower", "search_web"),
+    ("find information about python", "search_web"),
+    ("put on some jazz", "play_music"),
+    ("listen to a song", "play_music"),
+    ("start some tunes", "play_music"),
+]
+
+# Intents the semantic fallback never returns: destructive actions need an explicit keyword.
+# Their examples stay in EXAMPLES so that e.g. "power off the speaker" is rejected rather than
+# matched to the next-closest intent.
+SEMANTIC_EXCLUDED = ("shutdown_system", "reboot_system")
@@ -1,62 +1,114 @@
-import re
-from typing import Dict, Any
+import multiprocessing
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from orchestrator import intent_grammar
+from orchestrator.keyword_matcher import CompiledGrammar
+
+
+@lru_cache(maxsize=1)
+def _default_grammar() -> CompiledGrammar:
+    return CompiledGrammar(intent_grammar.INTENTS, intent_grammar.ENTITIES, overlap=intent_grammar.OVERLAP)
+
+
+# a VOICE_COMMAND-style event dict, a bare transcript string, or (text, confidence)
+Utterance = Union[Dict[str, Any], str, Tuple[str, float]]
+
+
+def _as_text(item: Utterance) -> Tuple[str, float]:
+    if isinstance(item, str):
+        return item, 1.0
+    if isinstance(item, tuple):
+        return item[0], item[1]
+    return item.get("text"), item.get("confidence", 1.0)
+
+
+# the parsing pool worker's copy of the calling parser, set by `_init_worker`
+_worker_parser: Optional["IntentParser"] = None
+
+
+def _init_worker(grammar: CompiledGrammar, semantic) -> None:
+    global _worker_parser
+    _worker_parser = IntentParser(grammar=grammar, semantic=semantic)
+
+
+def _parse_chunk(chunk: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
+    # runs in pool workers
+    return [_worker_parser.parse_text(text, confidence) for text, confidence in chunk]
 
 
 class IntentParser:
-    """Keyword + regex-based lightweight NLU for prototyping.
+    """Keyword-based lightweight NLU for prototyping.
+
+    Intents and entities come from the declarative grammar in `orchestrator.intent_grammar`,
+    compiled into a single-pass keyword automaton (`orchestrator.keyword_matcher`).
+
+    An optional `semantic` classifier (`orchestrator.semantic_intent.SemanticIntentClassifier`)
+    is consulted when no keyword matches, so paraphrases like "turn off the internet" still
+    resolve; its similarity scales the confidence of such matches, which are marked
+    `"source": "semantic"` (the Router always asks before running high-risk steps for those).
 
     Returns a dict with keys: intent, confidence, entities.
     This is a stopgap until a proper LLM-powered NLU is added.
     """
 
-    KEYWORD_MAP = {
-        "shutdown": "shutdown_system",
-        "reboot": "reboot_system",
-        "wifi": "manage_wifi",
-        "open": "open_app",
-        "search": "search_web",
-        "play": "play_music",
-        "music": "play_music",
-    }
-
-    APP_RE = re.compile(r"open\s+(?P<app>[a-z0-9_\-]+)", re.I)
-    PLAY_RE = re.compile(r"play\s+(?P<query>.+)$", re.I)
-    DEVICE_RE = re.compile(r"(wifi|bluetooth|screen|volume|battery)", re.I)
-    NUMBER_RE = re.compile(r"(?P<num>\d+)")
+    # keyword -> intent, in priority order; see orchestrator.intent_grammar
+    KEYWORD_MAP = dict(intent_grammar.INTENTS)
+
+    def __init__(self, grammar: Optional[CompiledGrammar] = None, semantic=None):
+        self.grammar = grammar or _default_grammar()
+        self.semantic = semantic
 
     def parse(self, event: Dict[str, Any]) -> Dict[str, Any]:
-        text = (event.get("text") or "").strip()
-        lower = text.lower()
+        return self.parse_text(event.get("text"), event.get("confidence", 1.0))
+
+    def parse_text(self, text: Optional[str], confidence: float = 1.0) -> Dict[str, Any]:
+        """`parse` for a bare transcript, without building an event dict first."""
+        text = (text or "").strip()
 
         # base confidence from perception
-        confidence = float(event.get("confidence", 1.0))
+        confidence = float(confidence)
 
-        # intent detection by keyword
-        intent = "unknown"
-        for k, v in self.KEYWORD_MAP.items():
-            if k in lower:
-                intent = v
-                break
+        # keywords and entities are found in a single pass over the text
+        intent, entities = self.grammar.match(text)
+        source = None
+        if intent is None and self.semantic is not None:
+            intent, score = self.semantic.classify(text)
+            if intent is not None:
+                confidence *= score
+                source = "semantic"
+        intent = intent or "unknown"
 
-        entities = {}
-        m_app = self.APP_RE.search(text)
-        if m_app:
-            entities["app"] = m_app.group("app")
+        # strengthen confidence if entities present
+        if entities:
+            confidence = min(0.99, confidence + 0.1)
 
-        m_play = self.PLAY_RE.search(text)
-        if m_play:
-            entities["query"] = m_play.group("query").strip()
+        out = {"intent": intent, "confidence": confidence, "entities": entities, "text": text}
+        if source:
+            out["source"] = source
+        return out
 
-        m_dev = self.DEVICE_RE.search(text)
-        if m_dev:
-            entities["device"] = m_dev.group(1).lower()
+    def parse_iter(self, items: Iterable[Utterance], processes: int = 0, chunksize: int = 2000) -> Iterator[Dict[str, Any]]:
+        """Parse a stream of event dicts, transcripts or (text, confidence) pairs, yielding results in order.
 
-        m_num = self.NUMBER_RE.search(text)
-        if m_num:
-            entities["number"] = int(m_num.group("num"))
+        With `processes` > 0 chunks of `chunksize` utterances are parsed by a process pool
+        (each worker gets this parser's grammar and semantic classifier); the input is consumed
+        lazily either way.
+        """
+        if processes <= 0:
+            parse_text = self.parse_text
+            for item in items:
+                yield parse_text(*_as_text(item))
+            return
 
-        # strengthen confidence if entities present
-        if entities:
-            confidence = min(0.99, confidence + 0.1)
+        it = iter(items)
+        chunks = iter(lambda: [_as_text(item) for item in islice(it, chunksize)], [])
+        # workers get this parser's grammar and semantic classifier (pickled as their specs)
+        with multiprocessing.get_context("spawn").Pool(processes, initializer=_init_worker, initargs=(self.grammar, self.semantic)) as pool:
+            for results in pool.imap(_parse_chunk, chunks):
+                yield from results
 
-        return {"intent": intent, "confidence": confidence, "entities": entities, "text": text}
+    def parse_batch(self, items: Iterable[Utterance], processes: int = 0, chunksize: int = 2000) -> List[Dict[str, Any]]:
+        """List form of `parse_iter`."""
+        return list(self.parse_iter(items, processes=processes, chunksize=chunksize))
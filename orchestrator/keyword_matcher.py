@@ -0,0 +1,186 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# (start, end, pattern id) of a keyword occurrence
+Hit = Tuple[int, int, int]
+
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-")
+
+
+class AhoCorasick:
+    """Multi-pattern substring automaton: one pass over the text finds every occurrence of every pattern."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(patterns)
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+        for pid, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = self.goto[state][ch] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(pid)
+
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find_all(self, text: str) -> List[Hit]:
+        hits: List[Hit] = []
+        goto, fail, out, patterns = self.goto, self.fail, self.out, self.patterns
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pid in out[state]:
+                hits.append((i + 1 - len(patterns[pid]), i + 1, pid))
+        return hits
+
+
+def _fold(text: str) -> str:
+    """Lower-case `text` without changing its length, so match offsets index the original."""
+    lower = text.lower()
+    if len(lower) == len(text):
+        return lower
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+class CompiledGrammar:
+    """Intent/entity grammar (see `orchestrator.intent_grammar`) compiled into one automaton.
+
+    `match(text)` scans the text once, collecting keyword hits and the first digit run, then
+    resolves the intent and entities from those hits only. Its cost depends on the text length
+    and the number of hits, not on the size of the vocabulary.
+    """
+
+    def __init__(self, intents: Sequence[Tuple[str, str]], entities: Sequence[Dict[str, Any]], overlap: str = "priority"):
+        if overlap not in ("priority", "longest"):
+            raise ValueError(f"unknown overlap rule: {overlap}")
+        self.overlap = overlap
+        self.intents = [tuple(pair) for pair in intents]
+        self.entities = [dict(spec) for spec in entities]
+        pids: Dict[str, int] = {}
+
+        def pid_of(keyword: str) -> int:
+            return pids.setdefault(keyword.lower(), len(pids))
+
+        # keyword id -> (rank, intent), keeping the highest-priority intent for duplicate keywords
+        self._intent: Dict[int, Tuple[int, str]] = {}
+        for rank, (keyword, intent) in enumerate(intents):
+            self._intent.setdefault(pid_of(keyword), (rank, intent))
+        # keyword id -> [(entity index, keyword order)]
+        self._entity: Dict[int, List[Tuple[int, int]]] = {}
+        for idx, spec in enumerate(self.entities):
+            capture = spec.get("capture")
+            if capture in ("word", "rest"):
+                keywords = [spec["trigger"]]
+            elif capture == "keyword":
+                keywords = list(spec["keywords"])
+            elif capture == "digits":
+                continue
+            else:
+                raise ValueError(f"entity {spec.get('name')}: unknown capture {capture!r}")
+            for order, keyword in enumerate(keywords):
+                self._entity.setdefault(pid_of(keyword), []).append((idx, order))
+        self._digits = [i for i, spec in enumerate(self.entities) if spec.get("capture") == "digits"]
+        self.automaton = AhoCorasick(sorted(pids, key=pids.get))
+
+    def __reduce__(self):
+        # pickled as its spec (e.g. for pool workers); the automaton is rebuilt on load
+        return (CompiledGrammar, (self.intents, self.entities, self.overlap))
+
+    def scan(self, text: str) -> Tuple[List[Hit], Optional[Tuple[int, int]]]:
+        """Single pass: every keyword hit, and the span of the first run of digits."""
+        goto, fail, out, patterns = self.automaton.goto, self.automaton.fail, self.automaton.out, self.automaton.patterns
+        hits: List[Hit] = []
+        digits: Optional[Tuple[int, int]] = None
+        run_start = -1
+        state = 0
+        for i, ch in enumerate(_fold(text)):
+            if digits is None:
+                if ch.isdecimal():
+                    if run_start < 0:
+                        run_start = i
+                elif run_start >= 0:
+                    digits = (run_start, i)
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pid in out[state]:
+                hits.append((i + 1 - len(patterns[pid]), i + 1, pid))
+        if digits is None and run_start >= 0:
+            digits = (run_start, len(text))
+        return hits, digits
+
+    def resolve(self, hits: List[Hit]) -> List[Hit]:
+        """Non-overlapping intent keyword hits, preferring priority or length per `overlap`."""
+        candidates = [h for h in hits if h[2] in self._intent]
+        if self.overlap == "priority":
+            candidates.sort(key=lambda h: (self._intent[h[2]][0], h[0]))
+        else:
+            candidates.sort(key=lambda h: (h[0] - h[1], self._intent[h[2]][0], h[0]))
+        kept: List[Hit] = []
+        for hit in candidates:
+            if all(hit[1] <= k[0] or hit[0] >= k[1] for k in kept):
+                kept.append(hit)
+        return kept
+
+    def _capture(self, spec: Dict[str, Any], text: str, end: int) -> Optional[Any]:
+        n = len(text)
+        k = end
+        while k < n and text[k].isspace():
+            k += 1
+        if k == end:
+            return None
+        if spec["capture"] == "word":
+            j = k
+            while j < n and text[j] in _WORD_CHARS:
+                j += 1
+            return text[k:j] if j > k else None
+        # "rest": the remainder, which must be a single line (a final newline is allowed)
+        rest = text[k:]
+        if rest.endswith("\n"):
+            rest = rest[:-1]
+        if not rest or "\n" in rest:
+            return None
+        return rest.strip()
+
+    def match(self, text: str) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Return (intent or None, entities) for `text`."""
+        hits, digits = self.scan(text)
+        kept = self.resolve(hits)
+        intent = min((self._intent[h[2]] for h in kept), default=None)
+
+        found: Dict[int, Any] = {}
+        best_keyword: Dict[int, Tuple[int, int]] = {}
+        for start, end, pid in sorted(hits):
+            for idx, order in self._entity.get(pid, ()):
+                spec = self.entities[idx]
+                if spec["capture"] == "keyword":
+                    # leftmost keyword; at the same position the earlier-listed keyword wins
+                    prev = best_keyword.get(idx)
+                    if prev is None or (start, order) < prev:
+                        best_keyword[idx] = (start, order)
+                        found[idx] = text[start:end].lower()
+                elif idx not in found:
+                    value = self._capture(spec, text, end)
+                    if value is not None:
+                        found[idx] = value
+        if digits is not None:
+            for idx in self._digits:
+                found[idx] = int(text[digits[0]:digits[1]])
+
+        entities = {self.entities[idx]["name"]: found[idx] for idx in sorted(found)}
+        return (intent[1] if intent else None), entities
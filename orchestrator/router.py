@@ -1,4 +1,7 @@
-from typing import Dict, List, Optional
+import copy
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 from orchestrator.task_planner import TaskPlanner
 from core.agents.registry import AgentRegistry
@@ -11,12 +14,65 @@ class Router:
     - Accepts an AgentRegistry to consult agent metadata (priority)
     - Supports routing preferences via `context["prefer_agent"]` or `context["prefer_local"]`
     - Reorders multi-step plans by agent priority and preferences
+    - Caches routing outcomes (see below)
+
+    High-risk steps need `context["user_confirmed"]` or a standing approval, and always the
+    former when the intent came from the parser's semantic fallback (`"source": "semantic"`).
+
+    Plan cache: the outcome of planning, the approval scan and ordering is kept in a bounded
+    LRU of `plan_cache_size` entries keyed by (intent, text, entities, source, the context keys
+    routing reads). The cache is cleared when the registry's or the approval store's `version` changes,
+    and an entry that relied on an approval expires with it. The planner must be a pure function
+    of the parsed intent. `cache_stats()` reports hits and misses; `plan_cache_size=0` disables it.
     """
 
-    def __init__(self, planner: Optional[TaskPlanner] = None, registry: Optional[AgentRegistry] = None, confirmation_threshold: float = 0.85):
+    # context keys that influence routing
+    CONTEXT_KEYS = ("agent_risk", "user_confirmed", "prefer_agent")
+
+    def __init__(
+        self,
+        planner: Optional[TaskPlanner] = None,
+        registry: Optional[AgentRegistry] = None,
+        confirmation_threshold: float = 0.85,
+        plan_cache_size: int = 256,
+    ):
         self.planner = planner or TaskPlanner()
         self.confirmation_threshold = confirmation_threshold
         self.registry = registry or AgentRegistry()
+        self.plan_cache_size = plan_cache_size
+        # key -> (valid until (epoch), status, reason, plan)
+        self._plans: "OrderedDict[tuple, Tuple[float, str, str, List[Dict]]]" = OrderedDict()
+        self._plans_versions: Optional[tuple] = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {"hits": self.cache_hits, "misses": self.cache_misses, "size": len(self._plans)}
+
+    def clear_cache(self) -> None:
+        self._plans.clear()
+
+    def _cache_key(self, p: Dict, ctx: Dict) -> Optional[tuple]:
+        try:
+            entities = tuple(sorted((p.get("entities") or {}).items()))
+            # the exact text: the plan carries it in its args
+            key = (p.get("intent"), p.get("text"), entities, p.get("source")) + tuple(
+                bool(ctx.get(k)) if k == "user_confirmed" else ctx.get(k) for k in self.CONTEXT_KEYS
+            )
+            hash(key)
+        except TypeError:
+            # unhashable entity or context values: route without caching
+            return None
+        return key
+
+    @staticmethod
+    def _result(status: str, reason: str, plan: List[Dict], intent: str, confidence: float) -> Dict:
+        if status == "ok":
+            # callers and agents may mutate nested args; cached plans stay private
+            return {"status": "ok", "plan": copy.deepcopy(plan)}
+        if status == "require_confirmation":
+            return {"status": status, "reason": reason, "needed": {"intent": intent, "confidence": confidence}}
+        return {"status": status, "reason": reason, "plan": []}
 
     def _apply_preferences(self, plan: List[Dict], context: Dict) -> List[Dict]:
         # Move preferred agent tasks to the front, then sort by agent priority
@@ -29,7 +85,18 @@ class Router:
             boost = 5 if prefer_agent and name == prefer_agent else 0
             return base + boost
 
-        return sorted(plan, key=score, reverse=True)
+        order = sorted(range(len(plan)), key=lambda i: score(plan[i]), reverse=True)
+        # `depends_on` may refer to steps by index: renumber those for the new order
+        position = {old: new for new, old in enumerate(order)}
+        ordered = []
+        for i in order:
+            task = plan[i]
+            refs = task.get("depends_on")
+            if refs is not None:
+                refs = [refs] if isinstance(refs, (int, str)) else refs
+                task = dict(task, depends_on=[position.get(r, r) if isinstance(r, int) else r for r in refs])
+            ordered.append(task)
+        return ordered
 
     def route(self, parsed_intent: Dict, context: Dict = None) -> Dict:
         p = parsed_intent or {}
@@ -41,26 +108,56 @@ class Router:
         if intent == "unknown":
             return {"status": "no_plan", "reason": "unknown_intent", "plan": []}
 
+        from permissions.approvals import ApprovalStore
+
+        store = ApprovalStore.shared()
+        key = self._cache_key(p, ctx) if self.plan_cache_size > 0 else None
+        if key is not None:
+            store.refresh()
+            versions = (id(self.registry), self.registry.version, id(store), store.version)
+            if versions != self._plans_versions:
+                self._plans.clear()
+                self._plans_versions = versions
+            entry = self._plans.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._plans.move_to_end(key)
+                self.cache_hits += 1
+                return self._result(entry[1], entry[2], entry[3], intent, confidence)
+            self.cache_misses += 1
+
+        status, reason, plan, valid_until = self._plan(p, ctx, store)
+        if key is not None:
+            self._plans[key] = (valid_until, status, reason, copy.deepcopy(plan))
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.plan_cache_size:
+                self._plans.popitem(last=False)
+        return self._result(status, reason, plan, intent, confidence)
+
+    def _plan(self, p: Dict, ctx: Dict, store) -> Tuple[str, str, List[Dict], float]:
+        """Plan, check approvals and order; returns (status, reason, plan, valid until)."""
+        valid_until = float("inf")
         plan = self.planner.plan(p)
         if not plan:
-            return {"status": "no_plan", "reason": "planner_empty", "plan": []}
+            return "no_plan", "planner_empty", [], valid_until
 
         # Confirmation check for any high risk task
         # If an approval exists for the agent/action, skip confirmation
-        from permissions.approvals import ApprovalStore
-
-        store = ApprovalStore()
         for t in plan:
             agent_risk = ctx.get("agent_risk") or t.get("agent_risk") or "low"
             agent_name = t.get("agent")
             action_name = t.get("action")
             if agent_risk == "high" and not ctx.get("user_confirmed"):
-                if store.is_approved(agent_name, action_name):
+                if p.get("source") == "semantic":
+                    # a guessed intent never runs a high-risk step on a standing approval
+                    return "require_confirmation", "semantic_match_for_high_risk", [], valid_until
+                expiry = store.approval_expiry(agent_name, action_name)
+                if expiry is not None:
                     # approved, continue without requiring explicit confirmation
+                    valid_until = min(valid_until, expiry)
                     continue
-                return {"status": "require_confirmation", "reason": "low_confidence_for_high_risk", "needed": {"intent": intent, "confidence": confidence}}
+                return "require_confirmation", "low_confidence_for_high_risk", [], valid_until
 
         # Apply preferences and prioritization
         ordered = self._apply_preferences(plan, ctx)
 
-        return {"status": "ok", "plan": ordered}
+        return "ok", "", ordered, valid_until
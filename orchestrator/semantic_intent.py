@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+from memory.semantic.embeddings import HashingEmbedder, normalize
+from memory.vector_store.faiss_store import VectorIndex
+from orchestrator import intent_grammar
+
+
+class SemanticIntentClassifier:
+    """Nearest-neighbour intent classifier over labelled example utterances.
+
+    Examples (default: `intent_grammar.EXAMPLES`) are embedded once into a `VectorIndex`.
+    `classify(text)` embeds the text, takes the `k` most similar examples and returns the
+    intent with the highest summed similarity, provided the best single similarity reaches
+    `threshold` and the intent is not in `exclude` (default: `intent_grammar.SEMANTIC_EXCLUDED`,
+    the destructive intents); otherwise (None, score). Results are cached per normalised text in a bounded
+    LRU, so repeated commands cost one dict lookup. The classifier is shared by worker threads (the
+    daemon, `execute_plan`), so the cache is guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        examples: Optional[Sequence[Tuple[str, str]]] = None,
+        embedder=None,
+        threshold: float = 0.6,
+        k: int = 3,
+        cache_size: int = 4096,
+        exclude: Optional[Sequence[str]] = None,
+    ):
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.exclude = frozenset(intent_grammar.SEMANTIC_EXCLUDED if exclude is None else exclude)
+        self.k = k
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.examples = list(intent_grammar.EXAMPLES if examples is None else examples)
+        self.index = VectorIndex(dim=getattr(self.embedder, "dim", None))
+        for vector, (_, intent) in zip(self.embedder.embed_many([text for text, _ in self.examples]), self.examples):
+            self.index.add(vector, intent)
+
+    def __reduce__(self):
+        # pickled as its configuration (e.g. for pool workers); the index is rebuilt on load
+        return (SemanticIntentClassifier, (self.examples, self.embedder, self.threshold, self.k, self.cache_size, tuple(self.exclude)))
+
+    def add_example(self, text: str, intent: str) -> None:
+        self.examples.append((text, intent))
+        self.index.add(self.embedder.embed(text), intent)
+        with self._cache_lock:
+            self._cache.clear()
+
+    def classify(self, text: Optional[str]) -> Tuple[Optional[str], float]:
+        key = normalize(text)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        result: Tuple[Optional[str], float] = (None, 0.0)
+        neighbours = self.index.search(self.embedder.embed(key), k=self.k) if key else []
+        if neighbours:
+            votes: Dict[str, float] = {}
+            for score, intent in neighbours:
+                votes[intent] = votes.get(intent, 0.0) + score
+            intent = max(votes, key=votes.get)
+            best = max(score for score, label in neighbours if label == intent)
+            result = (intent, best) if best >= self.threshold and intent not in self.exclude else (None, best)
+
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
@@ -4,7 +4,10 @@ from typing import Dict, List, Any
 class TaskPlanner:
     """Simple task planner that maps intents to agent tasks.
 
-    Returns a plan which is a list of task dicts: {"agent": str, "action": str, "args": {}}
+    Returns a plan which is a list of task dicts: {"agent": str, "action": str, "args": {}}.
+    A task may list `depends_on` (the `id`s, or indices, of earlier plan steps); steps without
+    dependencies may be run concurrently by `ExecutionManager.execute_plan`. Multi-step plans
+    refer to steps by `id`, which stays valid when the Router reorders the plan.
     """
 
     INTENT_AGENT_MAP = {
@@ -23,9 +26,9 @@ class TaskPlanner:
         # Special-case multi-step expansions
         if intent == "manage_wifi":
             # primary: toggle wifi
-            primary = {"agent": "wifi_agent", "action": "toggle", "args": {"text": parsed_intent.get("text")}, "agent_risk": "low"}
+            primary = {"id": "toggle_wifi", "agent": "wifi_agent", "action": "toggle", "args": {"text": parsed_intent.get("text")}, "agent_risk": "low"}
             # follow-up: check network status
-            follow = {"agent": "network_agent", "action": "status", "args": {}, "agent_risk": "medium"}
+            follow = {"id": "network_status", "agent": "network_agent", "action": "status", "args": {}, "agent_risk": "medium", "depends_on": ["toggle_wifi"]}
             return [primary, follow]
 
         if intent == "open_and_search":
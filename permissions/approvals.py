@@ -1,7 +1,29 @@
+import contextlib
 import json
 import os
+import threading
 import time
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_shared: Dict[str, "ApprovalStore"] = {}
+_shared_lock = threading.Lock()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+        fh.flush()
+        try:
+            os.fsync(fh.fileno())
+        except OSError:
+            pass
+    os.replace(tmp, path)
 
 
 class ApprovalStore:
@@ -11,15 +33,71 @@ class ApprovalStore:
 
     Optionally accepts a `confirmer` callable for runtime interactive approvals (e.g., voice or console).
     The callable signature is `confirmer(message: str) -> bool`.
+
+    The grant/revoke history is replayed once; afterwards lookups are served from memory and
+    the file is checked at most every `check_interval` seconds (one `stat`) for changes made by
+    other processes such as `permissions.cli`. New records are read incrementally from the last
+    offset; a replaced or truncated file is replayed from scratch. Use `ApprovalStore.shared()`
+    on hot paths to reuse one store per file across the process.
+
+    Compaction: state is a snapshot of active approvals (`<base>.snapshot.json`) plus the
+    append-only delta log at `path`. Once at least `compact_min_records` records are held and
+    the share of dead ones (expired, superseded or revoked) reaches `compact_ratio`, the snapshot
+    is rewritten and the log restarted; this is checked after writes only, so opening a store
+    to read it never rewrites its files. Both files are replaced atomically, snapshot first:
+    replaying an old log over a newer snapshot yields the same state, so a crash in between is harmless.
+
+    Several processes may share the files: grant/revoke/compaction hold an exclusive advisory
+    `flock` on `<base>.lock` and catch up with other writers before appending; loads hold a shared
+    lock. Without `fcntl` (Windows) only the in-process lock applies. Reading never creates files:
+    until a writer has created the lock file, loads go without the file lock (appends are whole
+    lines and compaction replaces files atomically, so such a load still sees a consistent state).
+
+    `version` increases whenever the in-memory state changes, so callers can cache decisions
+    derived from it (see `orchestrator.router.Router`).
     """
 
-    def __init__(self, path: str = "data/approvals.jsonl", confirmer=None):
+    def __init__(
+        self,
+        path: str = "data/approvals.jsonl",
+        confirmer=None,
+        check_interval: float = 1.0,
+        compact_ratio: float = 0.5,
+        compact_min_records: int = 64,
+    ):
         self.path = path
-        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.snapshot_path = f"{os.path.splitext(path)[0]}.snapshot.json"
+        self.lock_path = f"{os.path.splitext(path)[0]}.lock"
+        self._lock_fh = None
+        self._lock_mode = 0
+        self._lock_depth = 0
         self._store: Dict[str, float] = {}
+        self.version = 0
         self._confirmer = confirmer
+        self.check_interval = check_interval
+        self.compact_ratio = compact_ratio
+        self.compact_min_records = compact_min_records
+        self._lock = threading.RLock()
+        # file identity and how far it has been replayed
+        self._ino: Optional[int] = None
+        self._offset = 0
+        self._next_check = 0.0
+        self._snap_sig: Optional[tuple] = None
+        # records behind the in-memory state: snapshot entries and delta log lines
+        self._snapshot_count = 0
+        self._log_records = 0
         self._load()
 
+    @classmethod
+    def shared(cls, path: str = "data/approvals.jsonl") -> "ApprovalStore":
+        """Process-wide store for `path`, loaded on first use."""
+        key = os.path.abspath(path)
+        with _shared_lock:
+            store = _shared.get(key)
+            if store is None:
+                store = _shared[key] = cls(path)
+        return store
+
     def request_approval(self, message: str) -> bool:
         """Request runtime approval via configured confirmer, returns True if approved."""
         if callable(self._confirmer):
@@ -30,37 +108,200 @@ class ApprovalStore:
         # No runtime confirmer available; default to False (deny)
         return False
 
+    def _ensure_dir(self) -> None:
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+    def _open_lock_file(self, exclusive: bool):
+        """Open the lock file; created for writers only (None: no lock file yet, reading)."""
+        if exclusive:
+            self._ensure_dir()
+            return open(self.lock_path, "a+b")
+        try:
+            return open(self.lock_path, "rb")
+        except FileNotFoundError:
+            return None
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive: bool = True) -> Iterator[None]:
+        """Hold the in-process lock and the cross-process file lock (re-entrant).
+
+        The lock file is only open while locked: the level that opens it closes it again, which
+        also drops the `flock`, so a store holds no file descriptor between operations.
+        """
+        with self._lock:
+            mode = 0
+            fh = opened = None
+            if fcntl is not None:
+                mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+                if self._lock_fh is None:
+                    opened = self._lock_fh = self._open_lock_file(exclusive)
+                fh = self._lock_fh
+            previous = self._lock_mode
+            if fh is not None and (self._lock_depth == 0 or (mode == fcntl.LOCK_EX and previous != mode)):
+                fcntl.flock(fh.fileno(), mode)
+                self._lock_mode = mode
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if fh is not None and self._lock_mode != previous:
+                    # back to the outer level's mode, or unlocked
+                    fcntl.flock(fh.fileno(), previous or fcntl.LOCK_UN)
+                    self._lock_mode = previous
+                if opened is not None:
+                    self._lock_fh = None
+                    opened.close()
+
+    def _apply(self, rec: Dict) -> None:
+        key = rec.get("key")
+        action = rec.get("action", "grant")
+        if not key:
+            return
+        self.version += 1
+        if action == "grant":
+            exp = rec.get("expiry")
+            if exp:
+                self._store[key] = float(exp)
+        elif action == "revoke":
+            if key in self._store:
+                del self._store[key]
+
+    def _snapshot_sig(self) -> Optional[tuple]:
+        # Compaction always replaces the snapshot, so its identity doubles as the log generation
+        # (log inode numbers alone may be recycled between compactions).
+        try:
+            st = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _reset(self) -> None:
+        """Start over from the snapshot; the delta log is replayed from offset 0."""
+        self._snap_sig = self._snapshot_sig()
+        self._store = {}
+        self.version += 1
+        self._offset = 0
+        self._log_records = 0
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as fh:
+                snap = json.load(fh)
+            self._store = {k: float(v) for k, v in snap.get("approvals", {}).items()}
+        except FileNotFoundError:
+            pass
+        except (ValueError, TypeError, AttributeError):
+            # unreadable snapshot: rely on whatever the log holds
+            self._store = {}
+        self._snapshot_count = len(self._store)
+
     def _load(self):
-        if not os.path.exists(self.path):
+        with self._locked(exclusive=False):
+            self._reset()
+            self._ino = None
+            self._read_new()
+            self._next_check = time.monotonic() + self.check_interval
+
+    def _read_new(self) -> None:
+        """Replay records appended since the last read (complete lines only)."""
+        try:
+            fh = open(self.path, "rb")
+        except FileNotFoundError:
             return
         try:
-            with open(self.path, "r", encoding="utf-8") as fh:
-                for line in fh:
-                    try:
-                        rec = json.loads(line)
-                        key = rec.get("key")
-                        action = rec.get("action", "grant")
-                        if not key:
-                            continue
-                        if action == "grant":
-                            exp = rec.get("expiry")
-                            if exp:
-                                self._store[key] = float(exp)
-                        elif action == "revoke":
-                            if key in self._store:
-                                del self._store[key]
-                    except json.JSONDecodeError:
-                        continue
+            with fh:
+                ino = os.fstat(fh.fileno()).st_ino
+                if self._ino is not None and ino != self._ino:
+                    # replaced, e.g. compacted by another process
+                    self._reset()
+                self._ino = ino
+                fh.seek(self._offset)
+                data = fh.read()
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                try:
+                    self._apply(json.loads(line))
+                    self._log_records += 1
+                except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                    continue
+            self._offset += end
         except Exception:
             # best-effort; on failure, start with empty store
             self._store = {}
 
+    def refresh(self, force: bool = False) -> None:
+        """Pick up changes made by other processes; throttled to one `stat` per `check_interval`."""
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return
+        with self._lock:
+            self._next_check = now + self.check_interval
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                st = None
+            same_log = (st.st_ino, st.st_size) == (self._ino, self._offset) if st is not None else self._ino is None
+            if same_log and self._snapshot_sig() == self._snap_sig:
+                return
+            with self._locked(exclusive=False):
+                try:
+                    st = os.stat(self.path)
+                except FileNotFoundError:
+                    st = None
+                if st is None or self._snapshot_sig() != self._snap_sig or st.st_ino != self._ino or st.st_size < self._offset:
+                    # compacted, replaced or truncated
+                    self._load()
+                else:
+                    self._read_new()
+
     def _persist_record(self, key: str, expiry: Optional[float] = None, action: str = "grant") -> None:
         rec = {"key": key, "action": action}
         if expiry is not None:
             rec["expiry"] = expiry
-        with open(self.path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(rec) + "\n")
+        line = (json.dumps(rec) + "\n").encode("utf-8")
+        self._ensure_dir()
+        with open(self.path, "ab") as fh:
+            fh.write(line)
+            end = fh.tell()
+            ino = os.fstat(fh.fileno()).st_ino
+        if (ino == self._ino or self._ino is None) and end - len(line) == self._offset:
+            # nobody else appended in between: our record is already applied in memory
+            self._ino = ino
+            self._offset = end
+            self._log_records += 1
+        self._maybe_compact()
+
+    def stats(self) -> Dict[str, int]:
+        """Records behind the current state and how many of them are still live."""
+        now = time.time()
+        live = sum(1 for v in self._store.values() if v > now)
+        total = self._snapshot_count + self._log_records
+        return {"records": total, "live": live, "dead": max(0, total - live)}
+
+    def _maybe_compact(self) -> None:
+        st = self.stats()
+        if st["records"] >= self.compact_min_records and st["dead"] >= self.compact_ratio * st["records"]:
+            self.compact()
+
+    def compact(self) -> Dict[str, int]:
+        """Write active approvals to the snapshot and restart the delta log. Returns `stats()`."""
+        with self._locked():
+            self.refresh(force=True)
+            now = time.time()
+            active = {k: v for k, v in self._store.items() if v > now}
+            _write_atomic(self.snapshot_path, json.dumps({"approvals": active}).encode("utf-8"))
+            # carry over records appended after our last read
+            tail = b""
+            try:
+                with open(self.path, "rb") as fh:
+                    fh.seek(self._offset)
+                    tail = fh.read()
+            except FileNotFoundError:
+                pass
+            _write_atomic(self.path, tail)
+            self._load()
+            return self.stats()
 
     @staticmethod
     def _make_key(agent: str, action: Optional[str]) -> str:
@@ -69,30 +310,43 @@ class ApprovalStore:
     def grant(self, agent: str, action: Optional[str], ttl_seconds: int) -> None:
         key = self._make_key(agent, action)
         expiry = time.time() + int(ttl_seconds)
-        self._store[key] = expiry
-        self._persist_record(key, expiry, action="grant")
+        with self._locked():
+            # catch up with other processes first so the append lands right after what we know
+            self.refresh(force=True)
+            self._store[key] = expiry
+            self.version += 1
+            self._persist_record(key, expiry, action="grant")
 
-    def is_approved(self, agent: str, action: Optional[str]) -> bool:
+    def approval_expiry(self, agent: str, action: Optional[str]) -> Optional[float]:
+        """Expiry of the approval covering (agent, action), or None if there is none."""
         # Check specific agent:action first, then agent:* wildcard
+        self.refresh()
         now = time.time()
         key = self._make_key(agent, action)
         exp = self._store.get(key)
         if exp and exp > now:
-            return True
+            return exp
         # wildcard
         key2 = self._make_key(agent, None)
         exp2 = self._store.get(key2)
         if exp2 and exp2 > now:
-            return True
-        return False
+            return exp2
+        return None
+
+    def is_approved(self, agent: str, action: Optional[str]) -> bool:
+        return self.approval_expiry(agent, action) is not None
 
     def revoke(self, agent: str, action: Optional[str] = None) -> None:
         key = self._make_key(agent, action)
-        if key in self._store:
-            del self._store[key]
-        # Persist a revocation entry so it will be applied when reloading
-        self._persist_record(key, expiry=None, action="revoke")
+        with self._locked():
+            self.refresh(force=True)
+            if key in self._store:
+                del self._store[key]
+            self.version += 1
+            # Persist a revocation entry so it will be applied when reloading
+            self._persist_record(key, expiry=None, action="revoke")
 
     def list_active(self) -> Dict[str, float]:
+        self.refresh()
         now = time.time()
         return {k: v for k, v in self._store.items() if v > now}
@@ -33,6 +33,13 @@ def revoke_approval(agent: str, action: Optional[str] = None, path: Optional[str
     return existed
 
 
+def compact_approvals(path: Optional[str] = None) -> Dict[str, int]:
+    store = ApprovalStore(path=path) if path else ApprovalStore()
+    stats = store.compact()
+    print(f"Compacted approvals: {stats['live']} active")
+    return stats
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(prog="permissions-cli")
     sub = parser.add_subparsers(dest="cmd")
@@ -51,6 +58,9 @@ def main(argv=None):
     sub_revoke.add_argument("action", nargs="?", help="action name or omit for wildcard", default=None)
     sub_revoke.add_argument("--path", help="approvals file path", default=None)
 
+    sub_compact = sub.add_parser("compact", help="Snapshot active approvals and drop dead records")
+    sub_compact.add_argument("--path", help="approvals file path", default=None)
+
     args = parser.parse_args(argv)
     if args.cmd == "list":
         list_approvals(path=args.path)
@@ -66,6 +76,8 @@ def main(argv=None):
         grant_approval(agent, action, hours=hours, path=args.path)
     elif args.cmd == "revoke":
         revoke_approval(args.agent, args.action, path=args.path)
+    elif args.cmd == "compact":
+        compact_approvals(path=args.path)
     else:
         parser.print_help()
 
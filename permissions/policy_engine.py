@@ -1,15 +1,42 @@
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Optional, Tuple
+
+from policy_engine.decision import DecisionCache
+from policy_engine.evaluator import CompiledPolicy, load_rules
 
 
 class PolicyEngine:
-    """Minimal policy engine prototype with a few example rules.
+    """Rule-based policy engine.
+
+    Rules come from `policy_engine/rules/*.yaml` and `contracts/permission_matrix.yaml` (see
+    `policy_engine.evaluator` for the format) and are compiled into a table indexed by
+    (agent, action, risk). The highest-priority applicable rule decides; the first deny stops
+    the action. Returns (allowed: bool, reason: str).
 
-    Rules are evaluated in order; the first deny stops the action. Returns (allowed: bool, reason: str)
+    Evaluation is pure, so decisions are cached per (agent, action, risk, context fields the
+    candidate rules read) for `cache_ttl` seconds; `cache_ttl=0` disables the cache.
     """
 
-    def __init__(self, blocked_hours: Tuple[int, int] = (2, 4)):
+    def __init__(
+        self,
+        blocked_hours: Tuple[int, int] = (2, 4),
+        rule_paths: Optional[Iterable[str]] = None,
+        rules: Optional[Iterable[Dict]] = None,
+        cache_ttl: float = 5.0,
+    ):
         # blocked_hours: tuple(start_hour, end_hour) 24h format where some operations are restricted
         self.blocked_hours = blocked_hours
+        self.rule_paths = rule_paths
+        self._rules = list(rules) if rules is not None else None
+        self.cache = DecisionCache(ttl=cache_ttl) if cache_ttl else None
+        self.reload()
+
+    def reload(self) -> None:
+        """Re-read and recompile the rule sets and drop cached decisions."""
+        start, end = self.blocked_hours
+        rules = self._rules if self._rules is not None else load_rules(self.rule_paths)
+        self.policy = CompiledPolicy(rules, params={"blocked_start": start, "blocked_end": end})
+        if self.cache is not None:
+            self.cache.clear()
 
     def evaluate(self, task: Dict, context: Dict) -> Tuple[bool, str]:
         # Basic structure for tasks: {"agent": "power_agent", "action": "shutdown", "args": {}}
@@ -17,24 +44,19 @@ class PolicyEngine:
         t = context or {}
         agent = task.get("agent")
         action = task.get("action")
-
-        # Time-based rule
-        hour = t.get("time_hour")
-        if hour is not None:
-            start, end = self.blocked_hours
-            if start <= hour < end:
-                return False, f"action restricted during hours {start}-{end}"
-
-        # Battery rule example: don't allow shutdown if battery critically low and user hasn't confirmed
-        battery = t.get("battery")
-        if agent == "power_agent" and action in ("shutdown", "reboot"):
-            if battery is not None and battery < 0.05 and not t.get("user_confirmed"):
-                return False, "battery_too_low"
-
-        # Confidence / trust rule
-        user_conf = t.get("user_confidence", 1.0)
-        agent_risk = t.get("agent_risk", "low")
-        if agent_risk == "high" and user_conf < 0.85 and not t.get("user_confirmed"):
-            return False, "low_user_confidence_for_high_risk_action"
-
-        return True, "ok"
+        risk = t.get("agent_risk", "low")
+        rules, fields = self.policy.candidates(agent, action, risk)
+        if self.cache is None:
+            return self.policy.decide(rules, t)
+
+        key = (agent, action, risk) + tuple(t.get(f) for f in fields)
+        try:
+            cached = self.cache.get(key)
+        except TypeError:
+            # unhashable context values are evaluated uncached
+            return self.policy.decide(rules, t)
+        if cached is not None:
+            return cached
+        decision = self.policy.decide(rules, t)
+        self.cache.put(key, decision)
+        return decision
@@ -0,0 +1,207 @@
+"""Compile declarative policy rules into a dispatch table.
+
+A rule set is a YAML document with a `rules:` list. Each rule:
+
+    - id: quiet_hours
+      priority: 100               # higher runs first; ties keep file order
+      match:                      # optional; "*" or a missing key matches anything, lists allowed
+        agent: power_agent
+        action: [shutdown, reboot]
+        risk: high                # the task context's `agent_risk` (default "low")
+      when:                       # every condition must hold; a missing field fails it
+        time_hour: {gte: $blocked_start, lt: $blocked_end}
+        user_confirmed: {truthy: false}
+        user_confidence: {lt: 0.85, default: 1.0}
+      effect: deny                # deny | allow; the first applicable rule decides
+      reason: "action restricted during hours {blocked_start}-{blocked_end}"
+
+Values starting with `$` and `{name}` placeholders in reasons are taken from the engine's
+params. A permission matrix (`contracts/permission_matrix.yaml`) uses `matrix: {agent: {action:
+allow|deny|confirm}}` instead and is compiled into equivalent rules.
+
+Rules are indexed by (agent, action, risk) with wildcards, so evaluating a task only looks at the
+rules that can apply to it, however many rules are loaded.
+"""
+
+import glob
+import os
+from itertools import product
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import yaml
+except Exception:
+    yaml = None
+
+ANY = "*"
+ALLOW = "allow"
+DENY = "deny"
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RULE_PATHS = sorted(glob.glob(os.path.join(_ROOT, "policy_engine", "rules", "*.yaml"))) + [
+    os.path.join(_ROOT, "contracts", "permission_matrix.yaml")
+]
+
+_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda v, x: v == x,
+    "ne": lambda v, x: v != x,
+    "lt": lambda v, x: v < x,
+    "lte": lambda v, x: v <= x,
+    "gt": lambda v, x: v > x,
+    "gte": lambda v, x: v >= x,
+    "in": lambda v, x: v in x,
+    "not_in": lambda v, x: v not in x,
+}
+
+
+def _matrix_rules(doc: Dict) -> List[Dict]:
+    rules = []
+    priority = doc.get("priority", 0)
+    for agent, actions in (doc.get("matrix") or {}).items():
+        for action, effect in (actions or {}).items():
+            rule = {"id": f"matrix:{agent}:{action}", "priority": priority, "match": {"agent": agent, "action": action}}
+            if effect == "confirm":
+                rule.update(when={"user_confirmed": {"truthy": False}}, effect=DENY, reason="confirmation_required")
+            elif effect == DENY:
+                rule.update(effect=DENY, reason="denied_by_permission_matrix")
+            else:
+                rule.update(effect=ALLOW, reason="ok")
+            rules.append(rule)
+    return rules
+
+
+def load_rules(paths: Optional[Iterable[str]] = None) -> List[Dict]:
+    """Read rule sets from YAML files in order; missing files are skipped.
+
+    Reading an existing rule file without PyYAML raises RuntimeError.
+    """
+    paths = DEFAULT_RULE_PATHS if paths is None else list(paths)
+    if yaml is None:
+        for path in paths:
+            if os.path.exists(path):
+                raise RuntimeError(f"PyYAML is required to read policy rules from {path}")
+        return []
+    rules: List[Dict] = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                doc = yaml.safe_load(fh)
+        except FileNotFoundError:
+            continue
+        if not doc:
+            continue
+        if not isinstance(doc, dict):
+            raise ValueError(f"{path}: expected a mapping with `rules` or `matrix`")
+        rules.extend(doc.get("rules") or [])
+        rules.extend(_matrix_rules(doc))
+    return rules
+
+
+def _resolve(value: Any, params: Dict[str, Any]) -> Any:
+    if isinstance(value, str) and value.startswith("$"):
+        return params[value[1:]]
+    if isinstance(value, list):
+        return [_resolve(v, params) for v in value]
+    return value
+
+
+def _compile_condition(field: str, spec: Any, params: Dict[str, Any]) -> Callable[[Dict], bool]:
+    if not isinstance(spec, dict):
+        spec = {"eq": spec}
+    spec = {op: _resolve(arg, params) for op, arg in spec.items()}
+    default = spec.pop("default", None)
+    truthy = spec.pop("truthy", None)
+    checks = []
+    for op, arg in spec.items():
+        if op not in _OPS:
+            raise ValueError(f"unknown policy condition operator: {op}")
+        checks.append((_OPS[op], arg))
+
+    def condition(ctx: Dict) -> bool:
+        value = ctx.get(field, default)
+        if truthy is not None and bool(value) != bool(truthy):
+            return False
+        if not checks:
+            return True
+        if value is None:
+            return False
+        try:
+            return all(fn(value, arg) for fn, arg in checks)
+        except TypeError:
+            return False
+
+    return condition
+
+
+class CompiledRule:
+    __slots__ = ("id", "priority", "order", "allow", "reason", "fields", "checks")
+
+    def __init__(self, spec: Dict, order: int, params: Dict[str, Any]):
+        self.id = spec.get("id") or f"rule{order}"
+        self.priority = int(spec.get("priority", 0))
+        self.order = order
+        effect = spec.get("effect", DENY)
+        if effect not in (ALLOW, DENY):
+            raise ValueError(f"policy rule {self.id}: unknown effect {effect!r}")
+        self.allow = effect == ALLOW
+        reason = str(spec.get("reason") or ("ok" if self.allow else self.id))
+        try:
+            reason = reason.format(**params)
+        except (KeyError, IndexError, ValueError):
+            pass
+        self.reason = reason
+        when = spec.get("when") or {}
+        self.fields = tuple(when)
+        try:
+            self.checks = [_compile_condition(f, c, params) for f, c in when.items()]
+        except KeyError as e:
+            raise ValueError(f"policy rule {self.id}: unknown parameter ${e.args[0]}") from None
+
+    def applies(self, ctx: Dict) -> bool:
+        for check in self.checks:
+            if not check(ctx):
+                return False
+        return True
+
+
+def _match_values(match: Dict, key: str) -> List[str]:
+    value = match.get(key, ANY)
+    return [str(v) for v in value] if isinstance(value, (list, tuple)) else [str(value)]
+
+
+class CompiledPolicy:
+    """Rules indexed by (agent, action, risk); wildcard entries are merged in at lookup time."""
+
+    def __init__(self, rules: Iterable[Dict], params: Optional[Dict[str, Any]] = None):
+        params = params or {}
+        self._table: Dict[Tuple[str, str, str], List[CompiledRule]] = {}
+        self.size = 0
+        for order, spec in enumerate(rules):
+            rule = CompiledRule(spec, order, params)
+            match = spec.get("match") or {}
+            for key in product(_match_values(match, "agent"), _match_values(match, "action"), _match_values(match, "risk")):
+                self._table.setdefault(key, []).append(rule)
+            self.size += 1
+        self._candidates: Dict[Tuple, Tuple[List[CompiledRule], Tuple[str, ...]]] = {}
+
+    def candidates(self, agent: Any, action: Any, risk: Any) -> Tuple[List[CompiledRule], Tuple[str, ...]]:
+        """Rules that may apply to (agent, action, risk) in evaluation order, and the context fields they read."""
+        key = (str(agent), str(action), str(risk))
+        found = self._candidates.get(key)
+        if found is None:
+            rules = {}
+            for k in product((key[0], ANY), (key[1], ANY), (key[2], ANY)):
+                for rule in self._table.get(k, ()):
+                    rules[rule.order] = rule
+            ordered = sorted(rules.values(), key=lambda r: (-r.priority, r.order))
+            fields = tuple(sorted({f for r in ordered for f in r.fields}))
+            if len(self._candidates) >= 4096:
+                self._candidates.clear()
+            found = self._candidates[key] = (ordered, fields)
+        return found
+
+    def decide(self, rules: List[CompiledRule], ctx: Dict) -> Tuple[bool, str]:
+        for rule in rules:
+            if rule.applies(ctx):
+                return rule.allow, rule.reason
+        return True, "ok"
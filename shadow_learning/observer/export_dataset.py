@@ -3,6 +3,8 @@ import os
 import re
 from typing import Generator
 
+from core.orchestrator.event_segments import SegmentedLog
+
 PII_KEYS = {"user_id", "email", "phone", "ssn"}
 EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
 
@@ -24,16 +26,14 @@ def _filter_pii(event: dict) -> dict:
 
 
 def export_dataset(events_path: str, out_path: str) -> int:
+    """Export events (any codec, including sealed segments) as PII-filtered JSONL."""
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
     count = 0
-    if not os.path.exists(events_path):
+    log = SegmentedLog(events_path)
+    if not os.path.exists(events_path) and not os.path.exists(log.manifest_path):
         return 0
-    with open(events_path, "r", encoding="utf-8") as fh_in, open(out_path, "w", encoding="utf-8") as fh_out:
-        for line in fh_in:
-            try:
-                e = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+    with open(out_path, "w", encoding="utf-8") as fh_out:
+        for e in log.read():
             e_f = _filter_pii(e)
             fh_out.write(json.dumps(e_f) + "\n")
             count += 1
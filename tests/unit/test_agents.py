@@ -23,3 +23,105 @@ def test_power_agent_simulated_actions():
 
     res2 = p.execute("reboot", {})
     assert res2["success"] is True
+
+
+def test_registry_capability_index_and_dynamic_fallback():
+    from core.agents.registry import AgentRegistry
+
+    class Declared:
+        capabilities = ("play",)
+
+        def __init__(self, priority):
+            self.priority = priority
+
+        def can_handle(self, intent):
+            return (intent.get("action") or intent.get("intent")) in self.capabilities
+
+    class Dynamic:
+        def can_handle(self, intent):
+            return intent.get("action") == "dance"
+
+    reg = AgentRegistry()
+    low, high, dyn = Declared(1), Declared(5), Dynamic()
+    reg.register("low", low)
+    reg.register("dyn", dyn)
+    assert reg.find_agent_for_intent({"action": "play"}) is low
+    reg.register("high", high)
+    assert reg.agents_for("play") == ["high", "low"]
+    assert reg.find_agent_for_intent({"intent": "play"}) is high
+    assert reg.find_agent_for_intent({"action": "dance"}) is dyn
+    assert reg.find_agent_for_intent({"action": "sing"}) is None
+
+
+def test_indexed_agents_keep_their_can_handle_semantics(tmp_path):
+    from core.agents.registry import AgentRegistry
+    from core.agents.safe.music_agent import MusicAgent
+    from core.agents.safe.system_agent import SystemAgent
+    from permissions.approvals import ApprovalStore
+
+    reg = AgentRegistry()
+    store = ApprovalStore(path=str(tmp_path / "approvals.jsonl"), confirmer=lambda m: True)
+    system, music = SystemAgent(approval_store=store, sys_runner=lambda c: None), MusicAgent(music_dir=str(tmp_path))
+    reg.register(system.name, system)
+    reg.register(music.name, music)
+    # SystemAgent only reads `action`: an intent merely named like its capability is not its
+    assert reg.find_agent_for_intent({"intent": "shutdown"}) is None
+    assert reg.find_agent_for_intent({"action": "shutdown"}) is system
+    # MusicAgent reads `action`, then `intent`
+    assert reg.find_agent_for_intent({"intent": "play_music"}) is music
+    assert reg.find_agent_for_intent({"action": "shutdown", "intent": "play_music"}) is system
+    assert reg.find_agent_for_intent({"action": "pause", "intent": "play_music"}) is None
+
+
+def test_registry_factories_load_on_first_use():
+    from core.agents.registry import AgentRegistry
+
+    built = []
+
+    def make():
+        built.append(1)
+        return PowerAgent()
+
+    reg = AgentRegistry()
+    reg.register_factory("power_agent", make, capabilities=("shutdown",), priority=3)
+    reg.register_factory("wifi_agent", "core.agents.safe.wifi_agent:WifiAgent")
+    assert reg.agent_priority("power_agent") == 3
+    assert reg.agents_for("shutdown") == ["power_agent"]
+    assert not built and not reg.is_loaded("power_agent")
+    agent = reg.find_agent_for_intent({"action": "shutdown"})
+    assert isinstance(agent, PowerAgent) and reg.get("power_agent") is agent
+    assert built == [1]
+    assert isinstance(reg.get("wifi_agent"), WifiAgent)
+
+
+def test_loading_an_agent_refreshes_its_declared_metadata():
+    from core.agents.registry import AgentRegistry
+    from core.agents.safe.music_agent import MusicAgent
+
+    reg = AgentRegistry()
+    reg.register_factory("music_agent", "core.agents.safe.music_agent:MusicAgent", capabilities=("play",), priority=2)
+    reg.register_factory("noop_agent", "core.agents.safe.noop_agent:NoopAgent")
+    assert reg.agents_for("play_music") == []
+    version = reg.version
+
+    # the loaded agent's own capabilities and priority replace the declared ones
+    assert isinstance(reg.get("music_agent"), MusicAgent)
+    assert reg.version == version + 1
+    assert reg.agents_for("play_music") == ["music_agent"]
+    assert reg.agent_priority("music_agent") == 0
+
+    # nothing changes when the declaration matched
+    reg.get("noop_agent")
+    assert reg.version == version + 1
+
+
+def test_speaker_selects_engine_lazily(monkeypatch):
+    import voice.speaker as speaker_mod
+
+    calls = []
+    monkeypatch.setattr(speaker_mod.Speaker, "_select_engine", staticmethod(lambda: calls.append(1) or speaker_mod.DummyTTSEngine()))
+    s = speaker_mod.Speaker()
+    assert calls == []
+    s.speak("hello")
+    s.speak("again")
+    assert calls == [1]
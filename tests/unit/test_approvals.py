@@ -30,3 +30,87 @@ def test_approval_persistence(tmp_path):
     # Create a new instance reading the same file
     store2 = ApprovalStore(path=str(p))
     assert store2.is_approved("network_agent", "status") is True
+
+
+def test_shared_store_picks_up_other_writers(tmp_path, monkeypatch):
+    p = str(tmp_path / "approvals.jsonl")
+    shared = ApprovalStore.shared(p)
+    assert ApprovalStore.shared(p) is shared
+    assert shared.is_approved("power_agent", "shutdown") is False
+
+    # another process (e.g. permissions.cli) appends a grant
+    ApprovalStore(path=p).grant("power_agent", "shutdown", ttl_seconds=3600)
+
+    # within the check interval lookups are served from memory without touching the file
+    def no_stat(*a, **k):
+        raise AssertionError("unexpected stat")
+
+    monkeypatch.setattr("permissions.approvals.os.stat", no_stat)
+    assert shared.is_approved("power_agent", "shutdown") is False
+    monkeypatch.undo()
+
+    shared.refresh(force=True)
+    assert shared.is_approved("power_agent", "shutdown") is True
+    offset = shared._offset
+
+    ApprovalStore(path=p).revoke("power_agent", "shutdown")
+    shared.refresh(force=True)
+    assert shared.is_approved("power_agent", "shutdown") is False
+    assert shared._offset > offset
+
+
+def test_auto_compaction_and_crash_between_snapshot_and_log(tmp_path):
+    p = tmp_path / "approvals.jsonl"
+    store = ApprovalStore(path=str(p), compact_min_records=10, compact_ratio=0.5)
+    store.grant("keep_agent", None, ttl_seconds=3600)
+    for i in range(6):
+        store.grant("tmp_agent", f"a{i}", ttl_seconds=3600)
+        store.revoke("tmp_agent", f"a{i}")
+    # compaction ran: only a short delta log is left behind the snapshot
+    assert len(p.read_text().splitlines()) < 10
+    assert (tmp_path / "approvals.snapshot.json").exists()
+    assert ApprovalStore(path=str(p)).list_active().keys() == {"keep_agent:*"}
+
+    # a crash after the snapshot rename leaves the old log: replaying it gives the same state
+    store.grant("late_agent", "x", ttl_seconds=3600)
+    old_log = p.read_bytes()
+    store.compact()
+    p.write_bytes(old_log)
+    assert ApprovalStore(path=str(p)).list_active().keys() == {"keep_agent:*", "late_agent:x"}
+
+
+def test_concurrent_processes_keep_every_grant():
+    from benchmarks.bench_approvals import run
+
+    res = run(procs=3, grants=80, lookups=100)
+    assert res["torn_lines"] == 0
+    assert res["active"] == res["expected_active"]
+
+
+def test_reading_creates_no_files(tmp_path):
+    base = tmp_path / "data"
+    store = ApprovalStore(path=str(base / "approvals.jsonl"))
+    assert not store.is_approved("power_agent", "shutdown")
+    store.refresh(force=True)
+    assert not base.exists()
+    store.grant("power_agent", "shutdown", ttl_seconds=60)
+    assert sorted(p.name for p in base.iterdir()) == ["approvals.jsonl", "approvals.lock"]
+    # a second reader uses the writer's lock file
+    assert ApprovalStore(path=str(base / "approvals.jsonl")).is_approved("power_agent", "shutdown")
+
+
+def test_stores_hold_no_lock_file_open_and_readers_do_not_compact(tmp_path):
+    p = tmp_path / "approvals.jsonl"
+    writer = ApprovalStore(path=str(p), compact_min_records=1000)
+    for i in range(12):
+        writer.grant("tmp_agent", f"a{i}", ttl_seconds=3600)
+        writer.revoke("tmp_agent", f"a{i}")
+    assert writer._lock_fh is None
+    before = p.read_bytes()
+
+    # mostly dead records, but opening a store to read it leaves the files alone
+    reader = ApprovalStore(path=str(p), compact_min_records=10, compact_ratio=0.5)
+    assert reader.list_active() == {}
+    assert p.read_bytes() == before
+    assert not (tmp_path / "approvals.snapshot.json").exists()
+    assert reader._lock_fh is None
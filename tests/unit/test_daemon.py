@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from orchestrator.daemon import Client, make_server
+
+
+def _start(handle, path):
+    server = make_server(handle, path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread
+
+
+def test_daemon_round_trip_with_prompt(tmp_path):
+    calls = []
+
+    def handle(text, out, ask):
+        calls.append(text)
+        out("->", text.upper())
+        if ask("sure?") == "y":
+            out("confirmed")
+
+    path = str(tmp_path / "j.sock")
+    server, thread = _start(handle, path)
+    with Client(path, timeout=5) as c:
+        assert list(c.command("open chrome", ask=lambda q: "y")) == ["-> OPEN CHROME", "confirmed"]
+        # the same connection serves further commands
+        assert list(c.command("again", ask=lambda q: "n")) == ["-> AGAIN"]
+        assert list(c.request({"op": "ping"}))[-1]["pong"] is True
+    assert calls == ["open chrome", "again"]
+
+    # a second daemon on the same socket is refused
+    with pytest.raises(RuntimeError):
+        make_server(handle, path)
+
+    with Client(path, timeout=5) as c:
+        list(c.request({"op": "shutdown"}))
+    thread.join(5)
+    server.server_close()
+    # a stale socket file is replaced
+    make_server(handle, path).server_close()
+
+    # anything else at the socket path is left alone
+    regular = tmp_path / "notes.txt"
+    regular.write_text("important")
+    with pytest.raises(RuntimeError, match="not a socket"):
+        make_server(handle, str(regular))
+    assert regular.read_text() == "important"
+
+
+def test_main_setup_handles_commands(tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.chdir(tmp_path)
+    handle = main.setup()
+    lines = []
+    handle("wifi toggle", out=lambda *a: lines.append(" ".join(map(str, a))), ask=lambda q: "n")
+    assert lines and all(line.startswith("->") for line in lines)
+    assert "'success': True" in lines[0]
+    lines.clear()
+    handle("shutdown now", out=lambda *a: lines.append(" ".join(map(str, a))), ask=lambda q: "n")
+    assert lines[-1] == "User denied action."
@@ -1,4 +1,5 @@
 import json
+import os
 
 from core.orchestrator.event_bus import EventBus
 
@@ -34,3 +35,31 @@ def test_validation_and_tail(tmp_path):
     last2 = eb.tail(2)
     assert len(last2) == 2
     assert last2[-1]["event"]["type"] == "e4"
+
+
+def test_group_commit_batches_fsyncs(tmp_path, monkeypatch):
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: fsyncs.append(fd) or real_fsync(fd))
+
+    eb = EventBus(path=str(tmp_path / "events.jsonl"), group_commit=True, durability="buffered", flush_interval=0.05)
+    handles = [eb.submit_event({"type": "e", "i": i}) for i in range(20)]
+    assert handles[-1].wait(timeout=2) is True
+    assert all(h.done() for h in handles)
+    assert len(fsyncs) < 20
+
+    events = list(eb.read_events())
+    assert [e["event"]["i"] for e in events] == list(range(20))
+    eb.close()
+
+
+def test_group_commit_durable_append_blocks_until_written(tmp_path):
+    path = tmp_path / "events.jsonl"
+    eb = EventBus(path=str(path), group_commit=True, flush_interval=0.01)
+    env = eb.append_event({"type": "durable"})
+    assert env["id"] in path.read_text()
+
+    eb.append_event({"type": "later"}, durability="buffered")
+    assert eb.flush(timeout=2) is True
+    assert eb.tail(1)[0]["event"]["type"] == "later"
+    eb.close()
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from core.orchestrator.event_bus import EventBus
+from core.orchestrator.event_codec import BINARY, convert_log, detect_codec
+from shadow_learning.observer.export_dataset import export_dataset
+
+
+def test_binary_codec_roundtrip_is_compact():
+    env = {"id": "0190a6b2-7c3e-7000-8000-0123456789ab", "timestamp": 1700000000.25, "version": "v1", "event": {"type": "task.end", "result": {"success": True}}}
+    record = BINARY.encode(env)
+    assert BINARY.decode(record) == env
+    assert len(record) < len(json.dumps(env))
+    assert BINARY.decode(record[:-1]) is None
+
+    # the longest version still round-trips; 255 bytes would collide with the "no version" marker
+    longest = dict(env, version="v" * 254)
+    assert BINARY.decode(BINARY.encode(longest)) == longest
+    with pytest.raises(ValueError, match="version"):
+        BINARY.encode(dict(env, version="v" * 255))
+    assert BINARY.decode(BINARY.encode(dict(env, version=None)))["version"] is None
+
+
+def test_binary_event_bus_read_tail_and_seek(tmp_path):
+    eb = EventBus(path=str(tmp_path / "events.bin"), codec="binary", segment_max_bytes=500, index_interval=150)
+    envs = [eb.append_event({"type": "e", "i": i}) for i in range(30)]
+    assert detect_codec(str(tmp_path / "events.bin")) is BINARY
+
+    assert [e["event"]["i"] for e in eb.read_events()] == list(range(30))
+    assert [e["event"]["i"] for e in eb.tail(7)] == list(range(23, 30))
+    assert [e["event"]["i"] for e in eb.read_events(from_id=envs[17]["id"])] == list(range(17, 30))
+
+
+def test_convert_and_export_read_either_format(tmp_path):
+    src = tmp_path / "events.jsonl"
+    eb = EventBus(path=str(src))
+    for i in range(5):
+        eb.append_event({"type": "e", "i": i, "email": "me@example.com"})
+
+    dst = tmp_path / "events.bin"
+    assert convert_log(str(src), str(dst), "binary") == 5
+    assert dst.stat().st_size < src.stat().st_size
+
+    converted = EventBus(path=str(dst), codec="binary")
+    assert list(converted.read_events()) == list(eb.read_events())
+
+    out = tmp_path / "out" / "dataset.jsonl"
+    assert export_dataset(str(dst), str(out)) == 5
+    assert "me@example.com" not in out.read_text()
+
+
+def test_switching_codec_starts_new_segment(tmp_path):
+    path = str(tmp_path / "events.log")
+    EventBus(path=path, segment_max_bytes=10_000).append_event({"type": "old"})
+    eb = EventBus(path=path, codec="binary", segment_max_bytes=10_000)
+    eb.append_event({"type": "new"})
+    assert [e["event"]["type"] for e in eb.read_events()] == ["old", "new"]
+    assert [e["event"]["type"] for e in eb.tail(2)] == ["old", "new"]
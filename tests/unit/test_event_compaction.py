@@ -0,0 +1,126 @@
+import time
+
+from core.agents.registry import AgentRegistry
+from core.agents.safe.noop_agent import NoopAgent
+from core.orchestrator.event_bus import EventBus
+from core.orchestrator.event_compaction import DAY, compact_events, parse_duration
+from core.orchestrator.event_segments import RETIRE_GRACE
+from orchestrator.execution_manager import ExecutionManager
+from permissions.policy_engine import PolicyEngine
+
+
+def _run_tasks(eb, n):
+    registry = AgentRegistry()
+    noop = NoopAgent()
+    registry.register(noop.name, noop)
+    manager = ExecutionManager(registry, eb, policy_engine=PolicyEngine())
+    for i in range(n):
+        manager.execute_task({"agent": "noop_agent", "action": "test", "args": {"i": i}}, context={"time_hour": 12})
+
+
+def test_compaction_summarizes_old_tasks_in_place(tmp_path):
+    eb = EventBus(path=str(tmp_path / "events.jsonl"))
+    _run_tasks(eb, 3)
+    eb.append_event({"type": "note"})
+    before = list(eb.read_events())
+    assert len(before) == 10
+
+    stats = eb.compact(retention={}, summarize_after=0, now=before[-1]["timestamp"] + 1)
+    assert stats["summarized"] == 3
+    after = list(eb.read_events())
+    assert [e["event"]["type"] for e in after] == ["task.summary"] * 3 + ["note"]
+    summary = after[0]["event"]
+    assert summary["allowed"] is True and summary["result"]["success"] is True
+    assert summary["task"]["args"] == {"i": 0}
+    assert after[0]["id"] == before[2]["id"]
+
+    # appends keep working after the rewrite
+    eb.append_event({"type": "later"})
+    assert eb.tail(1)[0]["event"]["type"] == "later"
+
+
+def test_retention_rules_and_legacy_pairing():
+    now = 100 * DAY
+    old, recent = now - 10 * DAY, now - DAY
+    task = {"agent": "power_agent", "action": "shutdown"}
+    envs = [
+        {"id": "1", "timestamp": old, "event": {"type": "task.start", "task": task}},
+        {"id": "2", "timestamp": old, "event": {"type": "task.policy", "task": task, "allowed": False, "reason": "x"}},
+        {"id": "3", "timestamp": old, "event": {"type": "task.end", "task": task, "result": {}}},
+        {"id": "4", "timestamp": recent, "event": {"type": "task.policy", "task": task}},
+        {"id": "5", "timestamp": old, "event": {"type": "debug.trace"}},
+    ]
+    kept, stats = compact_events(envs, retention={"task.policy": 7 * DAY, "debug.*": DAY}, now=now)
+    assert [e["id"] for e in kept] == ["1", "3", "4"]
+    assert stats["dropped"] == 2
+
+    kept, stats = compact_events(envs, retention={}, summarize_after=7 * DAY, now=now)
+    assert [e["id"] for e in kept] == ["3", "4", "5"]
+    assert kept[0]["event"]["reason"] == "x" and kept[0]["event"]["task_id"] is None
+
+
+def test_segment_compaction_swaps_generation_files(tmp_path):
+    eb = EventBus(path=str(tmp_path / "events.jsonl"), segment_max_bytes=2000, index_interval=200)
+    _run_tasks(eb, 12)
+    eb.roll()
+    total = len(list(eb.read_events()))
+
+    stats = eb.compact(retention={"task.policy": 0}, now=eb.tail(1)[0]["timestamp"] + 1)
+    assert stats["dropped"] == 12 and stats["segments"] >= 1
+    events = list(eb.read_events())
+    assert len(events) == total - 12
+    assert not any(e["event"]["type"] == "task.policy" for e in events)
+    assert list(tmp_path.glob("*.c1.jsonl"))
+    _run_tasks(eb, 1)
+    assert len(list(eb.read_events())) == total - 12 + 3
+
+
+def test_readers_in_progress_survive_compaction(tmp_path):
+    eb = EventBus(path=str(tmp_path / "events.jsonl"), segment_max_bytes=2000, index_interval=200)
+    _run_tasks(eb, 12)
+    eb.roll()
+    total = len(list(eb.read_events()))
+    old_files = sorted(p.name for p in tmp_path.glob("events.0*"))
+
+    reader = eb.read_events()
+    first = next(reader)
+    eb.compact(retention={"task.policy": 0}, now=eb.tail(1)[0]["timestamp"] + 1)
+    # the reader keeps its view from before the compaction
+    assert 1 + len(list(reader)) == total
+    assert first["id"] == next(eb.read_events())["id"]
+    retired = [name for entry in eb.log.load_manifest()["retired"] for name in entry["files"]]
+    assert retired and set(retired) <= set(old_files)
+    assert all((tmp_path / name).exists() for name in retired)
+
+    # replaced files are deleted once the grace period is over
+    assert eb.log.purge_retired(now=time.time() + RETIRE_GRACE + 1) == len(retired)
+    assert not any((tmp_path / name).exists() for name in retired)
+    assert eb.log.load_manifest()["retired"] == []
+    assert len(list(eb.read_events())) == total - 12
+    _run_tasks(eb, 1)
+    assert len(list(eb.read_events())) == total - 12 + 3
+
+
+def test_tasks_spanning_a_roll_are_summarized(tmp_path):
+    eb = EventBus(path=str(tmp_path / "events.jsonl"), segment_max_bytes=2000, index_interval=200)
+    task = {"agent": "noop_agent", "action": "test", "args": {}}
+    eb.append_event({"type": "task.start", "task_id": "t1", "task": task, "context": {"time_hour": 12}})
+    eb.append_event({"type": "task.policy", "task_id": "t1", "task": task, "allowed": True, "reason": "ok"})
+    eb.roll()
+    eb.append_event({"type": "note"})
+    end = eb.append_event({"type": "task.end", "task_id": "t1", "task": task, "result": {"success": True}})
+    eb.roll()
+
+    stats = eb.compact(retention={}, summarize_after=0, now=end["timestamp"] + 1)
+    assert stats["summarized"] == 1 and stats["segments"] == 2
+    events = list(eb.read_events())
+    assert [e["event"]["type"] for e in events] == ["note", "task.summary"]
+    summary = events[1]["event"]
+    assert summary["context"] == {"time_hour": 12} and summary["reason"] == "ok"
+    assert events[1]["id"] == end["id"]
+
+
+def test_parse_duration():
+    assert parse_duration("7d") == 7 * DAY
+    assert parse_duration("90") == 90
+    assert parse_duration("forever") is None
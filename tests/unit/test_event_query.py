@@ -0,0 +1,42 @@
+import os
+
+from core.orchestrator.event_bus import EventBus
+from core.orchestrator.event_query import QueryIndex
+
+
+def _end(agent, action, success):
+    return {"type": "task.end", "task": {"agent": agent, "action": action}, "result": {"success": success}}
+
+
+def test_query_filters_by_indexed_fields(tmp_path):
+    eb = EventBus(path=str(tmp_path / "events.jsonl"), query_index=True, segment_max_bytes=600)
+    for i in range(20):
+        eb.append_event(_end("power_agent" if i % 2 else "system_agent", "shutdown", i % 4 != 1))
+        eb.append_event({"type": "note", "i": i})
+
+    failed = eb.query(type="task.end", agent="power_agent", success=False)
+    assert len(failed) == 5
+    assert all(e["event"]["task"]["agent"] == "power_agent" for e in failed)
+    assert [e["timestamp"] for e in failed] == sorted(e["timestamp"] for e in failed)
+    assert len(eb.query(type="note")) == 20
+    assert len(eb.query(type="note", limit=3)) == 3
+
+    cutoff = eb.tail(4)[0]["timestamp"]
+    assert [e["id"] for e in eb.query(since=cutoff)] == [e["id"] for e in eb.tail(4)]
+    assert os.path.exists(tmp_path / "events.qidx" / "meta.json")
+
+
+def test_query_catches_up_and_rebuilds_after_compaction(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    writer = EventBus(path=path, codec="binary")
+    writer.append_event(_end("power_agent", "shutdown", False))
+    qi = QueryIndex(path)
+    assert len(qi.query(success=False)) == 1
+
+    # records written by another process are indexed on the next query
+    writer.append_event(_end("power_agent", "restart", False))
+    assert [e["event"]["task"]["action"] for e in qi.query(agent="power_agent")] == ["shutdown", "restart"]
+
+    writer.compact(retention={"task.end": 0}, now=writer.tail(1)[0]["timestamp"] + 10)
+    writer.append_event(_end("power_agent", "lock", True))
+    assert [e["event"]["task"]["action"] for e in qi.query(agent="power_agent")] == ["lock"]
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+from core.orchestrator.event_bus import EventBus
+
+
+def test_subscribe_filters_and_delivers_in_order(tmp_path):
+    eb = EventBus(path=str(tmp_path / "events.jsonl"))
+    sub = eb.subscribe("task.*")
+    seen = []
+    cb_sub = eb.subscribe({"type": "task.end"}, callback=seen.append)
+
+    eb.append_event({"type": "task.start", "i": 1})
+    eb.append_event({"type": "other"})
+    eb.append_event({"type": "task.end", "i": 2})
+
+    assert [sub.get(timeout=1)["event"]["i"] for _ in range(2)] == [1, 2]
+    assert sub.get(timeout=0.05) is None
+    cb_sub.close()
+    cb_sub._dispatcher.join(timeout=1)
+    assert [e["event"]["i"] for e in seen] == [2]
+
+    sub.close()
+    eb.append_event({"type": "task.start"})
+    assert len(eb._subscribers) == 0
+
+
+def test_bounded_queue_drops_when_full(tmp_path):
+    eb = EventBus(path=str(tmp_path / "events.jsonl"))
+    newest = eb.subscribe(maxsize=2, overflow="drop_oldest")
+    blocking = eb.subscribe(maxsize=1, put_timeout=0.01)
+    for i in range(4):
+        eb.append_event({"type": "e", "i": i})
+    assert newest.dropped == 2
+    assert [newest.get(timeout=1)["event"]["i"] for _ in range(2)] == [2, 3]
+    assert blocking.dropped == 3
+
+
+def test_stalled_subscriber_does_not_stall_appends_and_close_ends_iteration(tmp_path):
+    eb = EventBus(path=str(tmp_path / "events.jsonl"))
+    stalled = eb.subscribe(maxsize=2)
+    t0 = time.monotonic()
+    for i in range(20):
+        eb.append_event({"type": "e", "i": i})
+    # one default put_timeout, then drops without waiting
+    assert time.monotonic() - t0 < 3
+    assert stalled.dropped == 18
+
+    stalled.close()
+    assert [env["event"]["i"] for env in stalled] == [1]
+    assert stalled.dropped == 19
+
+
+def test_async_callback_consumer(tmp_path):
+    eb = EventBus(path=str(tmp_path / "events.jsonl"))
+
+    async def run():
+        got = asyncio.Queue()
+
+        async def consumer(env):
+            await got.put(env["event"]["type"])
+
+        sub = eb.subscribe(callback=consumer)
+        await asyncio.get_running_loop().run_in_executor(None, eb.append_event, {"type": "async.e"})
+        value = await asyncio.wait_for(got.get(), timeout=2)
+        sub.close()
+        return value
+
+    assert asyncio.run(run()) == "async.e"
+
+
+def test_follow_picks_up_appends_and_rolls(tmp_path):
+    path = tmp_path / "events.jsonl"
+    eb = EventBus(path=str(path), segment_max_bytes=10_000)
+    eb.append_event({"type": "before"})
+    stop = threading.Event()
+    follower = eb.follow(poll_interval=0.01, stop=stop)
+    got = []
+
+    def consume():
+        for env in follower:
+            got.append(env["event"]["type"])
+            if len(got) == 2:
+                stop.set()
+
+    t = threading.Thread(target=consume)
+    t.start()
+    time.sleep(0.05)
+    eb.append_event({"type": "one"})
+    time.sleep(0.05)
+    eb.roll()
+    eb.append_event({"type": "two"})
+    t.join(timeout=3)
+    stop.set()
+    assert got == ["one", "two"]
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.agents.base.agent import BaseAgent
+from core.agents.registry import AgentRegistry
+from core.orchestrator.event_bus import EventBus
+from orchestrator.execution_manager import ExecutionManager, plan_dependencies
+
+
+class SlowAgent(BaseAgent):
+    def __init__(self, name):
+        super().__init__(name)
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def execute(self, action, args):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.calls.append(args.get("i"))
+        time.sleep(args.get("sleep", 0.1))
+        with self._lock:
+            self.active -= 1
+        return {"i": args.get("i")}
+
+
+def _manager(tmp_path, **kwargs):
+    registry = AgentRegistry()
+    agents = {name: SlowAgent(name) for name in ("a", "b", "c")}
+    for name, agent in agents.items():
+        registry.register(name, agent)
+    eb = EventBus(path=str(tmp_path / "events.jsonl"))
+    return ExecutionManager(registry, eb, **kwargs), agents, eb
+
+
+def _plan():
+    return [
+        {"agent": "a", "action": "x", "args": {"i": 0}},
+        {"agent": "b", "action": "x", "args": {"i": 1}},
+        {"agent": "c", "action": "x", "args": {"i": 2}, "depends_on": [0, 1]},
+    ]
+
+
+def test_execute_plan_runs_independent_steps_concurrently(tmp_path):
+    mgr, agents, eb = _manager(tmp_path)
+    start = time.monotonic()
+    results = mgr.execute_plan(_plan())
+    elapsed = time.monotonic() - start
+    assert [r["result"]["i"] for r in results] == [0, 1, 2]
+    assert elapsed < 0.28
+
+    events = list(eb.read_events())
+    c_start = next(i for i, e in enumerate(events) if e["event"]["type"] == "task.start" and e["event"]["task"]["agent"] == "c")
+    assert sum(1 for e in events[:c_start] if e["event"]["type"] == "task.end") == 2
+    assert [e["event"]["type"] for e in events].count("task.end") == 3
+
+
+def test_execute_plan_async_limits_and_timeouts(tmp_path):
+    mgr, agents, _ = _manager(tmp_path, agent_limits={"a": 2})
+    plan = [{"agent": "a", "action": "x", "args": {"i": i}} for i in range(4)]
+    plan.append({"agent": "b", "action": "x", "args": {"i": 9, "sleep": 0.5}, "timeout": 0.05})
+    results = asyncio.run(mgr.execute_plan_async(plan))
+    assert [r["result"]["i"] for r in results[:4]] == [0, 1, 2, 3]
+    assert agents["a"].peak == 2
+    assert results[4] == {"success": False, "error": "timeout", "still_running": True}
+
+
+def test_plan_dependencies_validation():
+    assert plan_dependencies([{"id": "open"}, {"depends_on": "open"}]) == [[], [0]]
+    with pytest.raises(ValueError):
+        plan_dependencies([{"depends_on": [1]}, {"depends_on": [0]}])
+    with pytest.raises(ValueError):
+        plan_dependencies([{"depends_on": [5]}])
+
+
+class HangingAgent(BaseAgent):
+    def __init__(self, name="hang", coroutine=False):
+        super().__init__(name)
+        self.cancelled = False
+        if coroutine:
+            self.execute = self._execute_async
+
+    def execute(self, action, args):
+        time.sleep(1.0)
+        return {"late": True}
+
+    async def _execute_async(self, action, args):
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+def test_task_timeout_abandons_thread_and_logs_event(tmp_path):
+    mgr, _, eb = _manager(tmp_path)
+    hang = HangingAgent()
+    hang.timeout = 0.05
+    mgr.registry.register(hang.name, hang)
+    start = time.monotonic()
+    res = mgr.execute_task({"agent": "hang", "action": "x"})
+    assert res == {"success": False, "error": "timeout", "still_running": True}
+    assert time.monotonic() - start < 0.5
+    events = [e["event"] for e in eb.read_events()]
+    assert [e["type"] for e in events] == ["task.start", "task.timeout", "task.end"]
+    assert events[1]["still_running"] is True
+
+    # a plan deadline caps every step's budget
+    results = mgr.execute_plan([{"agent": "a", "action": "x", "args": {"i": 0, "sleep": 1.0}}], context={"deadline": time.time() + 0.05})
+    assert results[0]["error"] == "timeout"
+
+
+def test_default_budget_only_bounds_cancellable_agents(tmp_path):
+    mgr, agents, _ = _manager(tmp_path, task_timeout=0.05)
+    # a synchronous agent cannot be stopped, so it is not abandoned on the manager default
+    res = mgr.execute_task({"agent": "a", "action": "x", "args": {"i": 0, "sleep": 0.2}})
+    assert res == {"success": True, "result": {"i": 0}}
+    assert mgr.budget_for({}, agents["a"]) is None
+
+    hang = HangingAgent(name="ahang", coroutine=True)
+    mgr.registry.register(hang.name, hang)
+    assert mgr.budget_for({}, hang) == 0.05
+    res = mgr.execute_task({"agent": "ahang", "action": "x"})
+    assert res == {"success": False, "error": "timeout"}
+    assert hang.cancelled
+
+
+def test_async_agent_is_cancelled_at_deadline(tmp_path):
+    mgr, _, _ = _manager(tmp_path)
+    hang = HangingAgent(name="ahang", coroutine=True)
+    mgr.registry.register(hang.name, hang)
+    res = asyncio.run(mgr.execute_task_async({"agent": "ahang", "action": "x"}, context={"timeout": 0.05}))
+    assert res["error"] == "timeout"
+    assert hang.cancelled
+
+
+def test_agent_timeout_errors_are_not_manager_timeouts(tmp_path):
+    mgr, _, eb = _manager(tmp_path)
+
+    class Failing(BaseAgent):
+        def execute(self, action, args):
+            raise RuntimeError("timeout")
+
+    mgr.registry.register("failing", Failing("failing"))
+    res = mgr.execute_task({"agent": "failing", "action": "x"})
+    assert res == {"success": False, "error": "timeout"}
+    assert "task.timeout" not in [e["event"]["type"] for e in eb.read_events()]
+
+
+def test_sync_api_runs_coroutine_agents_inside_a_running_loop(tmp_path):
+    mgr, _, _ = _manager(tmp_path)
+
+    class Async(BaseAgent):
+        async def execute(self, action, args):
+            await asyncio.sleep(0.01)
+            return {"ok": True}
+
+    mgr.registry.register("async", Async("async"))
+
+    async def main():
+        return mgr.execute_plan([{"agent": "async", "action": "x"}]), mgr.execute_task({"agent": "async", "action": "x"}, timeout=1.0)
+
+    plan_results, task_result = asyncio.run(main())
+    assert plan_results == [{"success": True, "result": {"ok": True}}]
+    assert task_result == {"success": True, "result": {"ok": True}}
@@ -21,3 +21,78 @@ def test_unknown_intent():
     parsed = p.parse({"text": "foobar something", "confidence": 0.5})
     assert parsed["intent"] == "unknown"
     assert parsed["confidence"] == 0.5
+
+
+def _legacy_parse(text):
+    # the regex/substring implementation the grammar replaced
+    import re
+
+    keyword_map = {"shutdown": "shutdown_system", "reboot": "reboot_system", "wifi": "manage_wifi", "open": "open_app", "search": "search_web", "play": "play_music", "music": "play_music"}
+    lower = text.lower()
+    intent = next((v for k, v in keyword_map.items() if k in lower), "unknown")
+    entities = {}
+    m = re.search(r"open\s+(?P<app>[a-z0-9_\-]+)", text, re.I)
+    if m:
+        entities["app"] = m.group("app")
+    m = re.search(r"play\s+(?P<query>.+)$", text, re.I)
+    if m:
+        entities["query"] = m.group("query").strip()
+    m = re.search(r"(wifi|bluetooth|screen|volume|battery)", text, re.I)
+    if m:
+        entities["device"] = m.group(1).lower()
+    m = re.search(r"(?P<num>\d+)", text)
+    if m:
+        entities["number"] = int(m.group("num"))
+    return intent, entities
+
+
+def test_grammar_matches_legacy_semantics():
+    p = IntentParser()
+    texts = [
+        "play some music then shutdown",
+        "Open  my-app_2 and search cats",
+        "turn the Volume to 30 and the screen to 5",
+        "openplay", "play", "open ", "reboot wifi 12 34", "replay the song", "BLUETOOTH and WiFi",
+        "play\tJazz vibes 2", "open\nterminal", "volumes of 007", "nothing here",
+    ]
+    for text in texts:
+        parsed = p.parse({"text": text})
+        assert (parsed["intent"], parsed["entities"]) == _legacy_parse(text.strip()), text
+
+
+def test_grammar_overlap_rules_and_large_vocabulary():
+    from orchestrator.keyword_matcher import CompiledGrammar
+
+    intents = [("turn off", "power_off"), ("off", "generic_off"), ("turn", "generic_turn")]
+    longest = CompiledGrammar(intents[::-1], [], overlap="longest")
+    assert longest.match("please turn off the lights")[0] == "power_off"
+    priority = CompiledGrammar(intents[::-1], [], overlap="priority")
+    assert priority.match("please turn off the lights")[0] == "generic_turn"
+
+    vocab = [(f"keyword{i:04d}", f"intent_{i}") for i in range(1000)] + intents
+    big = CompiledGrammar(vocab, [{"name": "number", "capture": "digits"}])
+    assert big.match("say keyword0420 now") == ("intent_420", {"number": 420})
+
+
+def test_parse_batch_and_iter_match_parse():
+    p = IntentParser()
+    events = [{"type": "VOICE_COMMAND", "text": t, "confidence": 0.8} for t in ("wifi toggle", "Open Chrome", "play jazz 5", "hello")]
+    expected = [p.parse(e) for e in events]
+    assert p.parse_batch(events) == expected
+    assert list(p.parse_iter((e["text"], 0.8) for e in events)) == expected
+    assert p.parse_batch(events, processes=2, chunksize=3) == expected
+    assert p.parse_batch(["shutdown"])[0]["intent"] == "shutdown_system"
+
+
+def test_pool_workers_use_the_parsers_grammar_and_classifier():
+    from orchestrator.keyword_matcher import CompiledGrammar
+    from orchestrator.semantic_intent import SemanticIntentClassifier
+
+    grammar = CompiledGrammar([("lights", "toggle_lights"), ("wifi", "manage_wifi")], [{"name": "number", "capture": "digits"}])
+    semantic = SemanticIntentClassifier()
+    semantic.add_example("make it brighter in here", "toggle_lights")
+    p = IntentParser(grammar=grammar, semantic=semantic)
+    texts = ["lights 3", "wifi toggle", "make it brighter in here", "open chrome"]
+    expected = p.parse_batch(texts)
+    assert [r["intent"] for r in expected] == ["toggle_lights", "manage_wifi", "toggle_lights", "unknown"]
+    assert p.parse_batch(texts, processes=2, chunksize=2) == expected
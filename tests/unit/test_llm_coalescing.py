@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import llm_runtime.manager as mgr
+
+
+class SlowAdapter(mgr.BaseAdapter):
+    model_name = "slow"
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, max_tokens=128, temperature=0.0, **kwargs):
+        with self.lock:
+            self.calls.append(prompt)
+        time.sleep(0.2)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return f"answer to {prompt}"
+
+
+def test_concurrent_identical_requests_share_one_call():
+    inner = SlowAdapter()
+    a = mgr.CoalescingAdapter(inner)
+    with ThreadPoolExecutor(6) as pool:
+        same = [pool.submit(a.generate, "q") for _ in range(4)]
+        same.append(pool.submit(a.generate, "q", max_tokens=128))
+        other = pool.submit(a.generate, "q", max_tokens=5)
+        results = [f.result() for f in same]
+    assert results == ["answer to q"] * 5 and other.result() == "answer to q"
+    assert sorted(inner.calls) == ["q", "q"]
+    assert (a.calls, a.coalesced) == (2, 4)
+    # nothing is cached once the call is done
+    a.generate("q")
+    assert len(inner.calls) == 3
+
+
+def test_errors_are_shared():
+    a = mgr.CoalescingAdapter(SlowAdapter(fail=True))
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(a.generate, "q") for _ in range(3)]
+        for f in futures:
+            with pytest.raises(RuntimeError, match="backend down"):
+                f.result()
+    assert a.calls == 1
+
+
+def test_async_coalescing_and_cancelled_waiter():
+    inner = SlowAdapter()
+    a = mgr.CoalescingAdapter(inner)
+
+    async def main():
+        waiter = asyncio.ensure_future(a.agenerate("q"))
+        await asyncio.sleep(0.01)
+        results = asyncio.gather(*(a.agenerate("q") for _ in range(3)))
+        waiter.cancel()
+        return await results
+
+    assert asyncio.run(main()) == ["answer to q"] * 3
+    assert inner.calls == ["q"]
+    assert a.coalesced == 3
+
+
+def test_subprocess_adapter_agenerate(tmp_path):
+    script = tmp_path / "echo.sh"
+    script.write_text("#!/bin/sh\ncat -")
+    script.chmod(0o755)
+    a = mgr.LocalSubprocessAdapter(cmd=[str(script)])
+
+    async def main():
+        return await asyncio.gather(a.agenerate(" ping "), a.agenerate("pong"))
+
+    assert asyncio.run(main()) == ["ping", "pong"]
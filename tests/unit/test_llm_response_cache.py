@@ -0,0 +1,103 @@
+import asyncio
+
+import llm_runtime.manager as mgr
+from llm_runtime.response_cache import CachingAdapter
+
+
+class CountingAdapter(mgr.BaseAdapter):
+    model_name = "m"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, max_tokens=128, temperature=0.0, **kwargs):
+        self.calls += 1
+        return f"{prompt}/{max_tokens}"
+
+
+def test_memory_and_disk_tiers_survive_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    inner = CountingAdapter()
+    a = CachingAdapter(inner, path=path)
+    assert a.generate("hi") == "hi/128"
+    assert a.generate("hi", max_tokens=128) == "hi/128"
+    assert a.generate("hi", max_tokens=5) == "hi/5"
+    # non-deterministic requests bypass the cache
+    a.generate("hi", temperature=0.7)
+    a.generate("hi", temperature=0.7)
+    assert inner.calls == 4
+    st = a.stats()
+    assert (st["hits_memory"], st["misses"], st["bypassed"]) == (1, 2, 2)
+    assert st["hit_rate"] == round(1 / 3, 4) and st["saved_ms"] >= 0
+    a.close()
+
+    inner2 = CountingAdapter()
+    b = CachingAdapter(inner2, path=path)
+    assert b.generate("hi") == "hi/128"
+    assert asyncio.run(b.agenerate("hi", max_tokens=5)) == "hi/5"
+    assert list(b.generate_stream("hi")) == ["hi/128"]
+    assert inner2.calls == 0
+    assert b.stats()["hits_disk"] == 2 and b.stats()["hits_memory"] == 1
+
+
+def test_ttl_lru_and_near_duplicates(tmp_path):
+    now = [1000.0]
+    inner = CountingAdapter()
+    a = CachingAdapter(inner, path=str(tmp_path / "c.sqlite"), ttl=60, maxsize=2, near_duplicates=True, clock=lambda: now[0])
+    a.generate("What time is it?")
+    assert a.generate("  what TIME is   it") == "What time is it?/128"
+    assert a.stats()["hits_near"] == 1 and inner.calls == 1
+
+    a.generate("b")
+    a.generate("c")
+    assert len(a._memory) == 2
+    # evicted from memory, still on disk
+    a.generate("What time is it?")
+    assert inner.calls == 3 and a.stats()["hits_disk"] == 1
+
+    now[0] += 61
+    a.generate("What time is it?")
+    assert inner.calls == 4
+    now[0] += 61
+    assert a.purge_expired() == 3
+
+
+def test_stream_miss_is_stored():
+    class Streaming(CountingAdapter):
+        def generate_stream(self, prompt, **kwargs):
+            self.calls += 1
+            yield from ["a", "b"]
+
+    inner = Streaming()
+    a = CachingAdapter(inner)
+    assert list(a.generate_stream("p")) == ["a", "b"]
+    assert a.generate("p") == "ab" and inner.calls == 1
+
+
+def test_entries_are_scoped_to_the_backend(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+
+    class Endpoint(CountingAdapter):
+        def __init__(self, base_url):
+            super().__init__()
+            self.provider = "openai"
+            self.base_url = base_url
+
+    first, second = Endpoint("http://a"), Endpoint("http://b")
+    CachingAdapter(first, path=path).generate("q")
+    CachingAdapter(second, path=path).generate("q")
+    # the same backend in a new process shares the entries
+    again = Endpoint("http://a")
+    CachingAdapter(again, path=path).generate("q")
+    assert (first.calls, second.calls, again.calls) == (1, 1, 0)
+
+
+def test_llm_agent_cache_is_in_memory_by_default(tmp_path, monkeypatch):
+    from core.agents.safe.llm_agent import LLMAgent
+
+    monkeypatch.chdir(tmp_path)
+    agent = LLMAgent()
+    for adapter in (agent.selector.local, agent.selector.remote):
+        assert adapter.path is None and adapter.ttl == 300.0
+    agent.execute("ask", {"prompt": "hi", "prefer": "local"})
+    assert list(tmp_path.iterdir()) == []
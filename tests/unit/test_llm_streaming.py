@@ -0,0 +1,161 @@
+import json
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import llm_runtime.manager as mgr
+from core.agents.safe.llm_agent import LLMAgent
+from voice.speaker import Speaker
+from voice.tts_engine import BaseTTSEngine
+
+
+def _serve(reply):
+    """Stub server answering every POST with reply(handler, payload)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            reply(self, payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _chunked(handler, content_type, pieces):
+    handler.send_response(200)
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Transfer-Encoding", "chunked")
+    handler.end_headers()
+    for piece in pieces:
+        data = piece.encode("utf-8")
+        handler.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        handler.wfile.flush()
+    handler.wfile.write(b"0\r\n\r\n")
+
+
+def test_non_streaming_adapter_yields_one_chunk():
+    assert list(mgr.LocalAdapter("m").generate_stream("hi")) == ["[local:m] hi"]
+
+
+def test_subprocess_adapter_streams_stdout(tmp_path):
+    script = tmp_path / "slow.sh"
+    script.write_text("#!/bin/sh\ncat - >/dev/null\necho '  first'\nsleep 0.5\necho 'second  '\n")
+    script.chmod(0o755)
+    a = mgr.LocalSubprocessAdapter(cmd=[str(script)])
+    t0 = time.monotonic()
+    stream = a.generate_stream("ping")
+    assert next(stream) == "first"
+    assert time.monotonic() - t0 < 0.45
+    assert "first" + "".join(stream) == a.generate("ping") == "first\nsecond"
+
+    bad = tmp_path / "bad.sh"
+    bad.write_text("#!/bin/sh\necho oops >&2\nexit 3\n")
+    bad.chmod(0o755)
+    with pytest.raises(RuntimeError, match="oops"):
+        list(mgr.LocalSubprocessAdapter(cmd=[str(bad)]).generate_stream("x"))
+
+
+def test_subprocess_adapter_feeds_large_prompts_while_reading(tmp_path):
+    # the runner echoes as it reads, so its output pipe fills long before the input is consumed
+    script = tmp_path / "echo.py"
+    script.write_text(
+        "import sys\n"
+        "while True:\n"
+        "    data = sys.stdin.buffer.read1(65536)\n"
+        "    if not data:\n"
+        "        break\n"
+        "    sys.stdout.buffer.write(data)\n"
+        "    sys.stdout.buffer.flush()\n"
+    )
+    prompt = "".join(f"line {i}\n" for i in range(60000))
+    assert len(prompt) > 500_000
+    a = mgr.LocalSubprocessAdapter(cmd=[sys.executable, str(script)])
+    assert "".join(a.generate_stream(prompt, timeout=20)) == prompt.strip()
+
+    hung = tmp_path / "hung.py"
+    hung.write_text("import time\ntime.sleep(30)\n")
+    t0 = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(mgr.LocalSubprocessAdapter(cmd=[sys.executable, str(hung)]).generate_stream(prompt, timeout=0.5))
+    assert time.monotonic() - t0 < 5
+
+
+def test_openai_sse_stream():
+    pytest.importorskip("requests")
+    seen = {}
+
+    def reply(handler, payload):
+        seen.update(payload)
+        events = [{"choices": [{"delta": {"role": "assistant"}}]}, {"choices": [{"delta": {"content": "Hel"}}]}, {"choices": [{"delta": {"content": "lo"}}]}]
+        _chunked(handler, "text/event-stream", [f"data: {json.dumps(e)}\n\n" for e in events] + ["data: [DONE]\n\n"])
+
+    server, base = _serve(reply)
+    try:
+        a = mgr.RemoteAdapter(model_name="gpt-test", provider="openai", api_key="k", base_url=base)
+        assert list(a.generate_stream("hi")) == ["Hel", "lo"]
+        assert seen["stream"] is True and seen["messages"][0]["content"] == "hi"
+    finally:
+        server.shutdown()
+
+
+def test_local_http_stream_shapes():
+    pytest.importorskip("requests")
+
+    def reply(handler, payload):
+        if handler.path == "/sse":
+            tokens = [{"token": {"text": "a"}}, {"token": {"text": "</s>", "special": True}}, {"token": {"text": "b"}, "generated_text": "ab"}]
+            _chunked(handler, "text/event-stream", [f"data:{json.dumps(t)}\n\n" for t in tokens])
+        elif handler.path == "/text":
+            _chunked(handler, "text/plain; charset=utf-8", ["one ", "two"])
+        else:
+            body = json.dumps({"generated_text": "whole"}).encode()
+            handler.send_response(200)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+
+    server, base = _serve(reply)
+    try:
+        assert list(mgr.LocalHTTPAdapter(url=base + "/sse").generate_stream("q")) == ["a", "b"]
+        assert "".join(mgr.LocalHTTPAdapter(url=base + "/text").generate_stream("q")) == "one two"
+        assert list(mgr.LocalHTTPAdapter(url=base + "/json").generate_stream("q")) == ["whole"]
+    finally:
+        server.shutdown()
+
+
+def test_llm_agent_forwards_chunks_and_speaker_speaks_sentences():
+    class Streaming(mgr.BaseAdapter):
+        def generate_stream(self, prompt, **kwargs):
+            yield from ["Hi there. How", " are you?", " Fine"]
+
+    class Selector:
+        def select(self, **kwargs):
+            return Streaming()
+
+    got = []
+    r = LLMAgent(selector=Selector(), on_chunk=got.append).execute("ask", {"prompt": "q"})
+    assert r["response"] == "Hi there. How are you? Fine"
+    assert got == ["Hi there. How", " are you?", " Fine"]
+    assert r["ttft_ms"] >= 0
+
+    spoken = []
+
+    class Engine(BaseTTSEngine):
+        def speak(self, text, block=False):
+            spoken.append(text)
+
+    text = Speaker(engine=Engine()).speak_stream(LLMAgent(selector=Selector()).stream("q"))
+    assert spoken == ["Hi there.", "How are you?", "Fine"]
+    assert text == r["response"]
@@ -1,5 +1,7 @@
 import types
 
+import pytest
+
 import llm_runtime.manager as mgr
 
 
@@ -39,3 +41,104 @@ def test_local_subprocess_adapter(tmp_path):
     a = mgr.LocalSubprocessAdapter(cmd=[str(script)])
     res = a.generate("ping")
     assert res == "ping"
+
+
+def test_pooled_http_retries_with_backoff(monkeypatch):
+    calls = []
+
+    class Flaky(DummyResponse):
+        status_code = 503
+
+    def fake_post(url, json=None, timeout=None):
+        calls.append(url)
+        if len(calls) == 1:
+            raise ConnectionError("refused")
+        if len(calls) == 2:
+            return Flaky({})
+        return DummyResponse({"generated_text": "third time"})
+
+    monkeypatch.setattr(mgr, "requests", types.SimpleNamespace(post=fake_post))
+    sleeps = []
+    monkeypatch.setattr(mgr.time, "sleep", sleeps.append)
+
+    a = mgr.LocalHTTPAdapter(url="http://localhost:8080/generate", retries=2, backoff=0.1)
+    assert a.generate("hello") == "third time"
+    assert sleeps == [0.1, 0.2]
+
+    calls.clear()
+    a = mgr.LocalHTTPAdapter(url="http://localhost:8080/generate", retries=0)
+    with pytest.raises(ConnectionError):
+        a.generate("hello")
+
+
+def test_pooled_http_does_not_resend_possibly_started_generations(monkeypatch):
+    calls = []
+    outcome = {}
+
+    class ServerError(DummyResponse):
+        status_code = 500
+
+    def fake_post(url, json=None, timeout=None):
+        calls.append(timeout)
+        if isinstance(outcome["value"], Exception):
+            raise outcome["value"]
+        return outcome["value"]
+
+    monkeypatch.setattr(mgr, "requests", types.SimpleNamespace(post=fake_post))
+    sleeps = []
+    monkeypatch.setattr(mgr.time, "sleep", sleeps.append)
+    http = mgr.PooledHTTP(retries=5, backoff=1.0)
+
+    # a read timeout or a 500 may follow a generation the server already ran
+    outcome["value"] = TimeoutError("read timed out")
+    with pytest.raises(TimeoutError):
+        http.post("http://x", json={}, timeout=30)
+    outcome["value"] = ServerError({})
+    assert http.post("http://x", json={}, timeout=30).status_code == 500
+    assert len(calls) == 2 and sleeps == []
+
+    # retries and backoff stay within the call's timeout
+    calls.clear()
+    outcome["value"] = ConnectionError("refused")
+    with pytest.raises(ConnectionError):
+        http.post("http://x", json={}, timeout=1.5)
+    assert sleeps == [1.0] and len(calls) == 2
+    assert all(t <= 1.5 for t in calls)
+
+
+def test_local_http_adapter_reuses_connections():
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    pytest.importorskip("requests")
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            connections.append(1)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = json.dumps({"generated_text": "pooled"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        a = mgr.LocalHTTPAdapter(url=f"http://127.0.0.1:{server.server_address[1]}/generate")
+        assert [a.generate("hi") for _ in range(5)] == ["pooled"] * 5
+        assert len(connections) == 1
+        a.http.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,142 @@
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import llm_runtime.local.stub_worker as stub_worker
+import llm_runtime.manager as mgr
+from llm_runtime.local.worker_pool import PoolBusy, WorkerCrashed, WorkerPool
+
+STUB = [sys.executable, stub_worker.__file__]
+
+
+def _wait_for(cond, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.02)
+
+
+def test_workers_stay_resident_across_requests():
+    with WorkerPool(STUB, workers=2) as pool:
+        pids = set(pool.stats()["pids"])
+        assert len(pids) == 2
+        assert [pool.generate(f"q{i}", max_tokens=8) for i in range(5)] == [f"echo: q{i}" for i in range(5)]
+        assert list(pool.generate_stream("a b")) == ["echo:", " a", " b"]
+        assert set(pool.stats()["pids"]) == pids
+        assert pool.check_health() == {"checked": 2, "healthy": 2, "replaced": 0}
+        assert pool.stats()["requests"] == 6
+    assert pool.stats()["workers"] == 0
+
+
+def test_crash_is_retried_and_worker_restarted():
+    with WorkerPool(STUB, workers=1, queue_timeout=10) as pool:
+        first = pool.stats()["pids"][0]
+        # the retry lands on the restarted worker, which crashes too
+        with pytest.raises(WorkerCrashed):
+            pool.generate("__crash__")
+        _wait_for(lambda: pool.stats()["idle"] == 1)
+        assert pool.generate("back") == "echo: back"
+        stats = pool.stats()
+        assert stats["crashes"] == 2 and stats["restarts"] == 2
+        assert stats["pids"][0] != first
+
+
+def test_timeout_kills_hung_worker_and_health_check_replaces_dead_one():
+    with WorkerPool(STUB, workers=1, queue_timeout=10) as pool:
+        with pytest.raises(subprocess.TimeoutExpired):
+            pool.generate("__hang__", timeout=0.3)
+        _wait_for(lambda: pool.stats()["idle"] == 1)
+        assert pool.stats()["timeouts"] == 1
+
+        pool._workers[0].proc.kill()
+        pool._workers[0].proc.wait()
+        assert pool.check_health()["replaced"] == 1
+        _wait_for(lambda: pool.stats()["idle"] == 1)
+        assert pool.generate("ok") == "echo: ok"
+
+
+def test_backpressure_rejects_beyond_queue():
+    errors = {}
+
+    def call(name, prompt, **kwargs):
+        try:
+            pool.generate(prompt, **kwargs)
+        except Exception as e:
+            errors[name] = e
+
+    with WorkerPool(STUB, workers=1, max_queue=1, queue_timeout=0.3) as pool:
+        busy = threading.Thread(target=call, args=("busy", "__hang__"), kwargs={"timeout": 1.0})
+        busy.start()
+        _wait_for(lambda: pool.stats()["idle"] == 0)
+        # one caller may wait for the worker (and gives up after queue_timeout) ...
+        waiter = threading.Thread(target=call, args=("waiter", "queued"))
+        waiter.start()
+        time.sleep(0.05)
+        # ... a second concurrent caller is rejected immediately
+        with pytest.raises(PoolBusy, match="queue is full"):
+            pool.generate("rejected")
+        waiter.join()
+        busy.join()
+    assert isinstance(errors["busy"], subprocess.TimeoutExpired)
+    assert isinstance(errors["waiter"], PoolBusy)
+    assert pool.stats()["rejected"] == 1
+
+
+def test_subprocess_adapter_worker_mode():
+    a = mgr.LocalSubprocessAdapter(cmd=STUB, workers=1, health_interval=None)
+    try:
+        assert a.generate("hi\n") == "echo: hi"
+        assert "".join(a.generate_stream("there\n")) == "echo: there"
+        assert asyncio.run(a.agenerate("x")) == "echo: x"
+        assert a.pool.stats()["requests"] == 3 and len(a.pool.stats()["pids"]) == 1
+    finally:
+        a.close()
+
+
+def test_failed_restarts_are_reported_and_retried(tmp_path):
+    broken = tmp_path / "broken"
+    runner = tmp_path / "runner.py"
+    runner.write_text(
+        "import os, sys\n"
+        f"if os.path.exists({str(broken)!r}):\n"
+        "    sys.stderr.write('weights missing\\n')\n"
+        "    sys.exit(1)\n"
+        f"os.execv(sys.executable, [sys.executable, {stub_worker.__file__!r}])\n"
+    )
+    cmd = [sys.executable, str(runner)]
+    with WorkerPool(cmd, workers=1, queue_timeout=1.0, restart_attempts=2, max_restart_backoff=0.1) as pool:
+        broken.touch()
+        with pytest.raises((WorkerCrashed, PoolBusy)):
+            pool.generate("__crash__")
+        _wait_for(lambda: pool.stats()["lost"] == 1)
+        stats = pool.stats()
+        assert stats["workers"] == 0 and stats["size"] == 1 and "weights missing" in stats["last_start_error"]
+        # every worker is lost: callers learn why at once instead of after queue_timeout
+        start = time.monotonic()
+        with pytest.raises(PoolBusy, match="weights missing"):
+            pool.generate("hi")
+        assert time.monotonic() - start < 0.5
+
+        # restarts keep being retried, so the pool recovers once the runner can start again
+        broken.unlink()
+        _wait_for(lambda: pool.stats()["idle"] == 1)
+        assert pool.generate("back") == "echo: back"
+        stats = pool.stats()
+        assert stats["lost"] == 0 and stats["last_start_error"] is None
+
+
+def test_abandoned_stream_is_drained_before_reuse():
+    with WorkerPool(STUB, workers=1, queue_timeout=10) as pool:
+        pid = pool.stats()["pids"][0]
+        stream = pool.generate_stream("a b c d e", chunk_delay=0.15)
+        assert next(stream) == "echo:"
+        stream.close()
+        # the runner is still producing the abandoned reply; the next request waits for it
+        # rather than timing out behind it
+        assert pool.generate("next", timeout=0.5) == "echo: next"
+        stats = pool.stats()
+        assert stats["drained"] == 1 and stats["timeouts"] == 0 and stats["pids"] == [pid]
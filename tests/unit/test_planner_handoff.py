@@ -7,7 +7,7 @@ from permissions.approvals import ApprovalStore
 
 def test_planner_handoff_enable_wifi(tmp_path):
     registry = AgentRegistry()
-    approval = ApprovalStore(confirmer=lambda m: True)
+    approval = ApprovalStore(path=str(tmp_path / "approvals.jsonl"), confirmer=lambda m: True)
     system = SystemAgent(approval_store=approval, sys_runner=lambda c: None)
     music = MusicAgent(music_dir=str(tmp_path / "empty"))
     registry.register(system.name, system)
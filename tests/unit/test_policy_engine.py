@@ -1,3 +1,5 @@
+import pytest
+
 from permissions.policy_engine import PolicyEngine
 
 
@@ -30,3 +32,61 @@ def test_allow_with_confirmation():
     task = {"agent": "power_agent", "action": "shutdown"}
     ok, reason = engine.evaluate(task, {"user_confidence": 0.5, "agent_risk": "high", "user_confirmed": True})
     assert ok is True
+
+
+def test_default_rule_files_are_loaded():
+    pytest.importorskip("yaml")
+    from policy_engine.evaluator import load_rules
+
+    ids = [r["id"] for r in load_rules()]
+    assert {"quiet_hours", "low_battery_power_action", "high_risk_needs_confident_user"} <= set(ids)
+
+
+def test_unknown_rule_parameters_name_the_rule():
+    rule = {"id": "curfew", "when": {"time_hour": {"gte": "$curfew_start"}}, "effect": "deny"}
+    with pytest.raises(ValueError, match=r"curfew.*\$curfew_start"):
+        PolicyEngine(rules=[rule]).evaluate({"agent": "a", "action": "x"}, {"time_hour": 23})
+
+
+def test_dispatch_table_and_matrix_rules(tmp_path):
+    pytest.importorskip("yaml")
+    from policy_engine.evaluator import load_rules
+
+    matrix = tmp_path / "matrix.yaml"
+    matrix.write_text("matrix:\n  file_agent:\n    delete: confirm\n    read: deny\n")
+    many = [{"id": f"r{i}", "match": {"agent": f"agent_{i}"}, "effect": "deny"} for i in range(500)]
+    engine = PolicyEngine(rules=many + load_rules([str(matrix)]))
+    rules, _ = engine.policy.candidates("file_agent", "delete", "low")
+    assert [r.id for r in rules] == ["matrix:file_agent:delete"]
+
+    assert engine.evaluate({"agent": "file_agent", "action": "delete"}, {}) == (False, "confirmation_required")
+    assert engine.evaluate({"agent": "file_agent", "action": "delete"}, {"user_confirmed": True}) == (True, "ok")
+    assert engine.evaluate({"agent": "file_agent", "action": "read"}, {})[1] == "denied_by_permission_matrix"
+    assert engine.evaluate({"agent": "agent_7", "action": "x"}, {}) == (False, "r7")
+
+
+def test_rule_files_without_pyyaml_are_not_ignored_silently(tmp_path, monkeypatch):
+    import policy_engine.evaluator as evaluator
+
+    monkeypatch.setattr(evaluator, "yaml", None)
+    rules = tmp_path / "rules.yaml"
+    rules.write_text("rules: []\n")
+    with pytest.raises(RuntimeError, match="PyYAML"):
+        evaluator.load_rules([str(rules)])
+    with pytest.raises(RuntimeError, match="PyYAML"):
+        evaluator.load_rules()
+    assert evaluator.load_rules([str(tmp_path / "missing.yaml")]) == []
+
+
+def test_decisions_are_cached_until_ttl():
+    now = [0.0]
+    engine = PolicyEngine()
+    engine.cache._clock = lambda: now[0]
+    task = {"agent": "power_agent", "action": "shutdown"}
+    ctx = {"battery": 0.01, "agent_risk": "high", "unrelated": object()}
+    assert engine.evaluate(task, ctx) == (False, "battery_too_low")
+    assert engine.evaluate(task, dict(ctx, unrelated=1)) == (False, "battery_too_low")
+    assert engine.cache.hits == 1
+    now[0] = 10.0
+    engine.evaluate(task, ctx)
+    assert engine.cache.hits == 1
@@ -35,3 +35,52 @@ def test_router_handles_unknown():
 
     res = router.route(parsed, context={})
     assert res["status"] == "no_plan"
+
+
+def test_router_plan_cache_hits_and_invalidation(tmp_path, monkeypatch):
+    from core.agents.registry import AgentRegistry
+    from core.agents.safe.wifi_agent import WifiAgent
+    from permissions.approvals import ApprovalStore
+
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    class CountingPlanner(TaskPlanner):
+        def plan(self, parsed_intent):
+            calls.append(parsed_intent["intent"])
+            return super().plan(parsed_intent)
+
+    registry = AgentRegistry()
+    router = Router(planner=CountingPlanner(), registry=registry)
+    wifi = {"intent": "manage_wifi", "confidence": 0.9, "text": "wifi", "entities": {"device": "wifi"}}
+    first = router.route(wifi, context={})
+    first["plan"].append({"agent": "mutated"})
+    first["plan"][0]["args"]["text"] = "mutated"
+    assert router.route(wifi, context={}) == router.route(wifi, context={"time_hour": 3})
+    assert len(router.route(wifi, context={})["plan"]) == 2
+    assert router.route(wifi, context={})["plan"][0]["args"] == {"text": "wifi"}
+    assert calls == ["manage_wifi"]
+    assert router.cache_stats()["hits"] == 4
+
+    # inputs differing in surrounding whitespace keep their own text
+    padded = router.route(dict(wifi, text=" wifi "), context={})
+    assert padded["plan"][0]["args"]["text"] == " wifi "
+    assert router.route(wifi, context={})["plan"][0]["args"]["text"] == "wifi"
+    assert calls == ["manage_wifi"] * 2
+
+    # different routing context is a different entry
+    router.route(wifi, context={"prefer_agent": "network_agent"})
+    assert len(calls) == 3
+
+    # registry changes invalidate
+    registry.register("wifi_agent", WifiAgent())
+    router.route(wifi, context={})
+    assert len(calls) == 4
+
+    # approvals change the outcome for high-risk plans
+    shutdown = {"intent": "shutdown_system", "confidence": 0.4, "text": "shutdown"}
+    assert router.route(shutdown, context={})["status"] == "require_confirmation"
+    assert router.route(shutdown, context={})["needed"]["confidence"] == 0.4
+    ApprovalStore.shared().grant("power_agent", "shutdown", ttl_seconds=60)
+    assert router.route(shutdown, context={})["status"] == "ok"
+    assert router.cache_stats()["misses"] == 6
@@ -47,3 +47,27 @@ def test_prefer_agent_moves_it_first():
     res = router.route(parsed, context={"prefer_agent": "network_agent"})
     assert res["status"] == "ok"
     assert res["plan"][0]["agent"] == "network_agent"
+
+
+def test_reordered_plan_keeps_its_dependencies(tmp_path):
+    from core.orchestrator.event_bus import EventBus
+    from orchestrator.execution_manager import ExecutionManager
+
+    registry = AgentRegistry()
+    for agent in (WifiAgent(), NetworkAgent()):
+        registry.register(agent.name, agent)
+    parsed = IntentParser().parse({"text": "wifi toggle", "confidence": 0.95})
+
+    res = Router(registry=registry).route(parsed, context={"prefer_agent": "network_agent"})
+    assert [t["agent"] for t in res["plan"]] == ["network_agent", "wifi_agent"]
+    results = ExecutionManager(registry, EventBus(path=str(tmp_path / "events.jsonl"))).execute_plan(res["plan"])
+    assert all(r["success"] for r in results)
+
+    # index references are renumbered when the Router reorders steps
+    class IndexPlanner(TaskPlanner):
+        def plan(self, parsed_intent):
+            return [{"agent": "wifi_agent", "action": "toggle", "args": {}}, {"agent": "network_agent", "action": "status", "args": {}, "depends_on": [0]}]
+
+    res = Router(planner=IndexPlanner(), registry=registry).route(parsed, context={"prefer_agent": "network_agent"})
+    assert res["plan"][0]["depends_on"] == [1]
+    assert "depends_on" not in res["plan"][1]
@@ -0,0 +1,77 @@
+from memory.semantic.embeddings import HashingEmbedder, normalize
+from memory.vector_store.faiss_store import VectorIndex
+from orchestrator.intent_parser import IntentParser
+from orchestrator.semantic_intent import SemanticIntentClassifier
+
+
+def test_hashing_embedder_is_normalized_and_stable():
+    e = HashingEmbedder()
+    v = e.embed("Turn OFF the internet!")
+    assert v == e.embed("turn off the internet")
+    assert abs(sum(w * w for w in v.values()) - 1.0) < 1e-9
+    assert e.embed("") == {}
+    assert normalize("  Hi,  Jarvis! ") == "hi jarvis"
+
+
+def test_vector_index_returns_nearest_first():
+    e = HashingEmbedder()
+    idx = VectorIndex()
+    idx.add(e.embed("turn off the wifi"), "wifi")
+    idx.add(e.embed("play some jazz"), "music")
+    hits = idx.search(e.embed("switch the wifi off"), k=2)
+    assert hits[0][1] == "wifi"
+    assert hits[0][0] > (hits[1][0] if len(hits) > 1 else 0)
+
+
+def test_classifier_resolves_paraphrases_and_caches():
+    c = SemanticIntentClassifier()
+    assert c.classify("Turn off the internet")[0] == "manage_wifi"
+    assert c.classify("please disconnect me from the internet")[0] == "manage_wifi"
+    assert c.classify("foobar something")[0] is None
+    c.classify("turn off the internet.")
+    assert c.hits == 1
+
+
+def test_classifier_cache_is_shared_safely_between_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    c = SemanticIntentClassifier(cache_size=4)
+    texts = [f"turn off the internet {i % 16}" for i in range(2000)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(c.classify, texts))
+    assert {intent for intent, _ in results} == {"manage_wifi"}
+    assert c.hits + c.misses == len(texts) and len(c._cache) <= 4
+
+
+def test_parser_uses_semantic_fallback_only_without_keyword_match():
+    p = IntentParser(semantic=SemanticIntentClassifier())
+    parsed = p.parse({"text": "turn off the internet", "confidence": 0.9})
+    assert parsed["intent"] == "manage_wifi"
+    assert parsed["confidence"] <= 0.9
+    # keyword matches are unchanged
+    assert p.parse({"text": "open chrome"}) == IntentParser().parse({"text": "open chrome"})
+    assert IntentParser().parse({"text": "turn off the internet"})["intent"] == "unknown"
+
+
+def test_destructive_intents_are_never_guessed():
+    c = SemanticIntentClassifier()
+    for text in ("turn off the lights", "switch off the tv", "turn off the alarm", "power off the speaker", "restart the song", "please power the computer off"):
+        assert c.classify(text)[0] is None, text
+    # explicit keywords still work
+    assert IntentParser(semantic=c).parse({"text": "shutdown now"})["intent"] == "shutdown_system"
+
+
+def test_router_confirms_high_risk_semantic_matches(tmp_path, monkeypatch):
+    from orchestrator.router import Router
+    from permissions.approvals import ApprovalStore
+
+    monkeypatch.chdir(tmp_path)
+    ApprovalStore.shared().grant("power_agent", "shutdown", ttl_seconds=60)
+    c = SemanticIntentClassifier(exclude=())
+    parsed = IntentParser(semantic=c).parse({"text": "please power the computer off", "confidence": 1.0})
+    assert (parsed["intent"], parsed["source"]) == ("shutdown_system", "semantic")
+    res = Router().route(parsed)
+    assert (res["status"], res["reason"]) == ("require_confirmation", "semantic_match_for_high_risk")
+    assert Router().route(parsed, context={"user_confirmed": True})["status"] == "ok"
+    # the same intent from a keyword uses the standing approval
+    assert Router().route(dict(parsed, source=None))["status"] == "ok"
@@ -2,14 +2,14 @@ from permissions.approvals import ApprovalStore
 from core.agents.safe.system_agent import SystemAgent
 
 
-def test_system_agent_enable_wifi_approved(monkeypatch):
+def test_system_agent_enable_wifi_approved(tmp_path):
     called = []
 
     def fake_confirmer(msg):
         called.append(msg)
         return True
 
-    approval = ApprovalStore(confirmer=fake_confirmer)
+    approval = ApprovalStore(path=str(tmp_path / "approvals.jsonl"), confirmer=fake_confirmer)
     ran = []
 
     def fake_runner(cmd):
@@ -22,11 +22,11 @@ def test_system_agent_enable_wifi_approved(monkeypatch):
     assert called
 
 
-def test_system_agent_enable_wifi_denied(monkeypatch):
+def test_system_agent_enable_wifi_denied(tmp_path):
     def fake_confirmer(msg):
         return False
 
-    approval = ApprovalStore(confirmer=fake_confirmer)
+    approval = ApprovalStore(path=str(tmp_path / "approvals.jsonl"), confirmer=fake_confirmer)
     sa = SystemAgent(approval_store=approval, sys_runner=lambda c: None)
     res = sa.perform({"action": "enable_wifi"})
     assert res["ok"] is False
@@ -1,21 +1,46 @@
-from typing import Optional
+import re
+import threading
+from typing import Iterable, Optional
 
 from voice.tts_engine import BaseTTSEngine, DummyTTSEngine
 
 
 class Speaker:
+    """Speaks text through a TTS engine.
+
+    Without an explicit `engine` the best available one is chosen on first use (`engine`
+    or `speak`), so constructing a Speaker does not import or initialise TTS backends.
+
+    `speak_stream` speaks streamed text (e.g. LLM chunks) sentence by sentence as each one completes.
+    """
+
+    # end of a sentence: terminal punctuation followed by whitespace, or a line break
+    _SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
     def __init__(self, engine: Optional[BaseTTSEngine] = None):
-        if engine is not None:
-            self.engine = engine
-            return
+        self._engine = engine
+        self._engine_lock = threading.Lock()
 
+    @property
+    def engine(self) -> BaseTTSEngine:
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = self._select_engine()
+        return self._engine
+
+    @engine.setter
+    def engine(self, engine: BaseTTSEngine) -> None:
+        self._engine = engine
+
+    @staticmethod
+    def _select_engine() -> BaseTTSEngine:
         # Try preferred engines in order: EdgeTTSEngine, Pyttsx3TTSEngine, Dummy
         try:
             from voice.tts_engine import EdgeTTSEngine
 
             try:
-                self.engine = EdgeTTSEngine()
-                return
+                return EdgeTTSEngine()
             except Exception:
                 pass
         except Exception:
@@ -25,14 +50,29 @@ class Speaker:
             from voice.tts_engine import Pyttsx3TTSEngine
 
             try:
-                self.engine = Pyttsx3TTSEngine()
-                return
+                return Pyttsx3TTSEngine()
             except Exception:
                 pass
         except Exception:
             pass
 
-        self.engine = DummyTTSEngine()
+        return DummyTTSEngine()
 
     def speak(self, text: str, block: bool = False) -> None:
         self.engine.speak(text, block=block)
+
+    def speak_stream(self, chunks: Iterable[str], block: bool = False) -> str:
+        """Speak each complete sentence as soon as it has arrived; returns the whole text."""
+        parts = []
+        buf = ""
+        for chunk in chunks:
+            parts.append(chunk)
+            buf += chunk
+            pieces = self._SENTENCE_END.split(buf)
+            buf = pieces.pop()
+            for sentence in pieces:
+                if sentence.strip():
+                    self.speak(sentence.strip(), block=block)
+        if buf.strip():
+            self.speak(buf.strip(), block=block)
+        return "".join(parts)